@@ -0,0 +1,108 @@
+"""Compare ApiClient body compression: bytes on the wire and latency.
+
+Runs against the local merchant simulator, so it needs no network:
+
+    python benchmarks/bench_compression.py --requests 50 --bandwidth 20
+
+Typical payloads: a 500-item bulk card-switch POST (request body) and a
+2000-record /merchant/data catalogue (response body). Local latency shows
+the CPU cost of compressing; "link ms" adds the modelled transfer time of
+the measured bytes at --bandwidth Mbit/s, as on an egress-metered link.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from cart.client.api_client import ApiClient  # noqa: E402
+from cart.client.compression import CompressionPolicy, available_encodings  # noqa: E402
+from cart.simulator.server import MerchantSimulator  # noqa: E402
+
+
+def bulk_payload(items: int) -> dict:
+    return {
+        "items": [
+            {"idempotencyKey": f"migration-{i:08d}", "cardId": f"{4111000000000000 + i}", "expiry": "12/29"}
+            for i in range(items)
+        ]
+    }
+
+
+def catalogue(records: int) -> dict:
+    return {
+        "merchantId": "123",
+        "status": "active",
+        "transactions": [
+            {"id": f"tx-{i:08d}", "amount": round(i * 1.37, 2), "currency": "USD", "status": "settled"}
+            for i in range(records)
+        ],
+    }
+
+
+def run(base_url: str, encoding: Optional[str], requests: int, bandwidth: float) -> dict:
+    policy = CompressionPolicy(encoding=encoding, min_size=1024) if encoding else None
+    payload = bulk_payload(500)
+    plain_request = len(json.dumps(payload).encode("utf-8"))
+
+    with ApiClient(base_url, compression=policy, timeout=30) as client:
+        client.get("/merchant/data")  # warm the connection pool
+        started = time.perf_counter()
+        for i in range(requests):
+            # Fresh keys per call so the simulator does not replay.
+            payload["items"][0]["idempotencyKey"] = f"run-{encoding}-{i}"
+            client.post("/card-switch/bulk", json=payload)
+        post_ms = (time.perf_counter() - started) * 1000 / requests
+
+        # requests asks for gzip by default; the baseline opts out.
+        headers = None if policy else {"Accept-Encoding": "identity"}
+        started = time.perf_counter()
+        for _ in range(requests):
+            resp = client.get("/merchant/data", headers=headers)
+        get_ms = (time.perf_counter() - started) * 1000 / requests
+
+    request_bytes = policy.bytes_out // max(1, policy.compressed) if policy and policy.compressed else plain_request
+    response_bytes = int(resp.headers.get("Content-Length") or len(resp.content))
+    bytes_per_ms = bandwidth * 1e6 / 8 / 1000
+    return {
+        "encoding": encoding or "none",
+        "request_bytes": request_bytes,
+        "response_bytes": response_bytes,
+        "post_ms": post_ms,
+        "get_ms": get_ms,
+        "post_link_ms": post_ms + request_bytes / bytes_per_ms,
+        "get_link_ms": get_ms + response_bytes / bytes_per_ms,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--bandwidth", type=float, default=20.0, help="modelled link speed in Mbit/s")
+    args = parser.parse_args()
+
+    with MerchantSimulator(seed=0) as sim:
+        sim.route("/merchant/data").update(body=catalogue(2000), compress_responses=True)
+        rows = [run(sim.url, None, args.requests, args.bandwidth)]
+        for encoding in available_encodings():
+            rows.append(run(sim.url, encoding, args.requests, args.bandwidth))
+
+    print(
+        f"{'encoding':<9} {'req bytes':>10} {'resp bytes':>11} {'POST ms':>8} {'GET ms':>8} "
+        f"{'POST link ms':>13} {'GET link ms':>12}"
+    )
+    for row in rows:
+        print(
+            f"{row['encoding']:<9} {row['request_bytes']:>10} {row['response_bytes']:>11} "
+            f"{row['post_ms']:>8.2f} {row['get_ms']:>8.2f} {row['post_link_ms']:>13.2f} {row['get_link_ms']:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare ApiClient transports: import cost and requests per second.
+
+Runs entirely against a local 127.0.0.1 server, so it needs no network:
+
+    python benchmarks/bench_transport.py --requests 2000 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC_PATH))
+
+from cart.client.api_client import ApiClient  # noqa: E402
+
+BACKENDS = ("requests", "urllib3")
+
+_BODY = json.dumps({"status": "ok"}).encode("utf-8")
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; without NODELAY the
+        # benchmark would measure delayed-ACK stalls, not the client.
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def measure_import(backend: str, runs: int) -> float:
+    # Fresh interpreter per run: time to import the client and build
+    # its transport (which triggers the deferred HTTP library import).
+    code = (
+        "import time; t = time.perf_counter(); "
+        "from cart.client.api_client import ApiClient; "
+        f"ApiClient('http://127.0.0.1:1', transport={backend!r}); "
+        "print(time.perf_counter() - t)"
+    )
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={"PYTHONPATH": str(SRC_PATH)},
+        )
+        samples.append(float(out.stdout.strip()))
+    return min(samples)
+
+
+def measure_rps(backend: str, base_url: str, total: int, workers: int) -> float:
+    with ApiClient(base_url=base_url, transport=backend, pool_maxsize=max(10, workers)) as client:
+        client.get("/merchant/status")  # warm the connection pool
+        started = time.perf_counter()
+        if workers <= 1:
+            for _ in range(total):
+                client.get("/merchant/status")
+        else:
+            client.map(["/merchant/status"] * total, max_workers=workers)
+        return total / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--import-runs", type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StatusHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{'backend':<10} {'import+init ms':>15} {'req/s':>10}")
+    try:
+        for backend in BACKENDS:
+            import_ms = measure_import(backend, args.import_runs) * 1000
+            rps = measure_rps(backend, base_url, args.requests, args.workers)
+            print(f"{backend:<10} {import_ms:>15.1f} {rps:>10.0f}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
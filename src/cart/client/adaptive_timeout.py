@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Optional
+
+from cart.client.http_utils import host_key
+from cart.client.instrumentation import endpoint_template
+from cart.metrics.histogram import LatencyHistogram
+
+
+class _Estimate:
+    # Streaming latency estimate of one endpoint: an EWMA plus a quantile
+    # sketch over the last one to two windows of samples. The sketch
+    # rotates every `window` samples so the estimate follows shifts in
+    # latency instead of averaging over the whole process lifetime.
+
+    __slots__ = (
+        "ewma",
+        "samples",
+        "current",
+        "previous",
+        "in_window",
+        "since_refresh",
+        "timeout",
+        "max_value",
+    )
+
+    def __init__(self, max_value: float) -> None:
+        self.ewma: Optional[float] = None
+        self.samples = 0
+        self.max_value = max_value
+        self.current = LatencyHistogram(significant_digits=2, max_value=max_value)
+        self.previous: Optional[LatencyHistogram] = None
+        self.in_window = 0
+        self.since_refresh = 0
+        self.timeout: Optional[float] = None
+
+
+class AdaptiveTimeout:
+    # Per-attempt timeouts derived from each endpoint's observed latency.
+    #
+    # Endpoints are keyed by method, host and path template, so one
+    # instance can be shared by clients of different merchants. Once
+    # `min_samples` attempts have been seen, an attempt's timeout is
+    #
+    #     clamp(max(p(quantile), ewma) * multiplier, floor, ceiling)
+    #
+    # and until then the client's static timeout applies (warm-up).
+    # Attempts that time out are recorded as lasting their full timeout,
+    # so a merchant that slows down pushes its own estimate up rather than
+    # timing out forever. The timeout is recomputed every
+    # `refresh_every` samples, so lookups are O(1).
+
+    def __init__(
+        self,
+        quantile: float = 99.0,
+        multiplier: float = 3.0,
+        floor: float = 0.05,
+        ceiling: float = 30.0,
+        min_samples: int = 20,
+        window: int = 500,
+        alpha: float = 0.1,
+        refresh_every: int = 8,
+    ) -> None:
+        if not 0 < quantile < 100:
+            raise ValueError("quantile must be between 0 and 100")
+        if floor <= 0 or ceiling < floor:
+            raise ValueError("need 0 < floor <= ceiling")
+        self.quantile = quantile
+        self.multiplier = multiplier
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.window = window
+        self.alpha = alpha
+        self.refresh_every = refresh_every
+
+        self._lock = threading.Lock()
+        self._estimates: Dict[str, _Estimate] = {}
+
+    def key_for(self, method: str, url: str) -> str:
+        return f"{method} {host_key(url)}{endpoint_template(url)}"
+
+    def timeout_for(self, key: str, default: float) -> float:
+        estimate = self._estimates.get(key)
+        if estimate is None or estimate.timeout is None:
+            return default
+        return estimate.timeout
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            estimate = self._estimates.get(key)
+            if estimate is None:
+                estimate = self._estimates[key] = _Estimate(self.ceiling)
+
+            estimate.samples += 1
+            if estimate.ewma is None:
+                estimate.ewma = seconds
+            else:
+                estimate.ewma += self.alpha * (seconds - estimate.ewma)
+
+            if estimate.in_window >= self.window:
+                estimate.previous = estimate.current
+                estimate.current = LatencyHistogram(significant_digits=2, max_value=estimate.max_value)
+                estimate.in_window = 0
+            estimate.current.record(seconds)
+            estimate.in_window += 1
+
+            estimate.since_refresh += 1
+            if estimate.samples >= self.min_samples and (
+                estimate.timeout is None or estimate.since_refresh >= self.refresh_every
+            ):
+                estimate.timeout = self._compute(estimate)
+                estimate.since_refresh = 0
+
+    def _compute(self, estimate: _Estimate) -> float:
+        sketch = estimate.current
+        if estimate.previous is not None:
+            sketch = LatencyHistogram(significant_digits=2, max_value=estimate.max_value)
+            sketch.merge(estimate.previous)
+            sketch.merge(estimate.current)
+        observed = max(sketch.percentile(self.quantile), estimate.ewma or 0.0)
+        return min(self.ceiling, max(self.floor, observed * self.multiplier))
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            items = list(self._estimates.items())
+        return {
+            key: {
+                "samples": estimate.samples,
+                "ewma": estimate.ewma or 0.0,
+                "timeout": estimate.timeout or 0.0,
+            }
+            for key, estimate in items
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._estimates.clear()
@@ -2,15 +2,86 @@ from __future__ import annotations
 
 import json as json_lib
 import time
-from typing import Any, Dict, Optional
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-import requests
-from requests.models import Response
+from cart.client.adaptive_timeout import AdaptiveTimeout
+from cart.client.batch import RequestSpec, SpecLike, iter_completed, run_ordered
+from cart.client.cache import ResponseCache
+from cart.client.circuit_breaker import CircuitBreaker
+from cart.client.compression import CompressionPolicy
+from cart.client.deadline import Deadline
+from cart.client.hedging import HedgingPolicy
+from cart.client.http_utils import header_value, host_key
+from cart.client.idempotency import IDEMPOTENCY_HEADER, IdempotencyStore, body_fingerprint
+from cart.client.instrumentation import DEFAULT_INSTRUMENTATION, CallTrace, Instrumentation
+from cart.client.rate_limiter import RateLimiter
+from cart.client.response import ApiResponse, StreamedResponse, error_response, timeout_response
+from cart.client.retry_policy import ConstantBackoff, RetryPolicy, parse_retry_after
+from cart.client.single_flight import SingleFlight
+from cart.client.transport import FatalTransportError, Transport, create_transport
+
+if TYPE_CHECKING:
+    from cart.client.pool import ConnectionPool
 
 
 class ApiClient:
     # Minimal HTTP client for API tests.
     # Handles retries and converts timeouts into controlled 504 responses.
+    #
+    # HTTP goes through a pluggable Transport: "requests" (default, a
+    # keep-alive ConnectionPool; pass `pool` to share one between clients)
+    # or "urllib3" (lean, fewer layers per call). A client only closes a
+    # transport or pool it created itself.
+    #
+    # Retries follow `retry_policy`; by default it is built from `retries`
+    # and `retry_backoff_sec` (fixed pause, Retry-After ignored).
+    #
+    # With a `circuit_breaker`, attempts against a merchant whose circuit
+    # is open return a 504 {"error": "circuit_open"} without network I/O.
+    #
+    # With an `idempotency_store`, requests carrying an Idempotency-Key
+    # are replayed locally once completed (see IdempotencyStore).
+    #
+    # `timeout` bounds a single attempt. A Deadline (per call, or
+    # `deadline_sec` per client) bounds the whole call: each attempt's
+    # timeout shrinks to the remaining budget and no retry is started
+    # with less than `min_attempt_timeout` left.
+    #
+    # With a `response_cache`, GETs follow Cache-Control and are
+    # revalidated with ETag / Last-Modified (see ResponseCache).
+    #
+    # With `single_flight`, identical concurrent GETs share one upstream
+    # request and its result (see SingleFlight).
+    #
+    # With `hedging`, slow attempts of GETs and Idempotency-Key POSTs are
+    # raced against a second attempt (see HedgingPolicy).
+    #
+    # With a `rate_limiter`, every attempt takes a token from the
+    # merchant's bucket; calls over quota get a local 429
+    # {"error": "rate_limited"} (see RateLimiter).
+    #
+    # With `adaptive_timeout`, each attempt's timeout comes from the
+    # endpoint's observed latency (see AdaptiveTimeout); `timeout` is
+    # used during warm-up.
+    #
+    # With `compression`, large request bodies are compressed and
+    # Accept-Encoding is advertised; a 415 resends the body uncompressed
+    # (see CompressionPolicy). post(compression=...) overrides it per call:
+    # False disables it, True uses the client's policy or a default one.
+    #
+    # get(stream=True) and post(stream=True) return a StreamedResponse as
+    # soon as the headers arrive; retries and the 504 fallback apply up to
+    # that point, and a stall while reading the body raises
+    # StreamInterrupted carrying the 504. Streamed calls bypass the
+    # response cache, single flight, idempotency store and hedging, which
+    # all need a complete body.
+    #
+    # Every upstream call emits request, attempt, retry, fallback and
+    # response events to `instrumentation`, or to the process-wide
+    # DEFAULT_INSTRUMENTATION bus (see Instrumentation; RequestMetrics
+    # aggregates them). With no listener attached the hot path only
+    # checks one flag.
 
     def __init__(
         self,
@@ -18,21 +89,110 @@ class ApiClient:
         timeout: float = 5.0,
         retries: int = 0,
         retry_backoff_sec: float = 0.0,
+        pool: Optional["ConnectionPool"] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_connections: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        idempotency_store: Optional[IdempotencyStore] = None,
+        deadline_sec: Optional[float] = None,
+        min_attempt_timeout: float = 0.05,
+        response_cache: Optional[ResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        transport: Union[Transport, str, None] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        adaptive_timeout: Optional[AdaptiveTimeout] = None,
+        compression: Optional[CompressionPolicy] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.retries = retries
         self.retry_backoff_sec = retry_backoff_sec
+        self.retry_policy = retry_policy or RetryPolicy(
+            retries=retries,
+            backoff=ConstantBackoff(retry_backoff_sec),
+            respect_retry_after=False,
+        )
+        self.circuit_breaker = circuit_breaker
+        self._circuit_key = circuit_breaker.key_for(self.base_url) if circuit_breaker else ""
+        self.idempotency_store = idempotency_store
+        self.deadline_sec = deadline_sec
+        self.min_attempt_timeout = min_attempt_timeout
+        self.response_cache = response_cache
+        self.single_flight = single_flight
+        self.hedging = hedging
+        self.rate_limiter = rate_limiter
+        self._limiter_key = rate_limiter.key_for(self.base_url) if rate_limiter else ""
+        self.instrumentation = instrumentation if instrumentation is not None else DEFAULT_INSTRUMENTATION
+        self.adaptive_timeout = adaptive_timeout
+        self.compression = compression
+        self._compression_key = host_key(self.base_url)
+
+        self._owns_transport = not isinstance(transport, Transport)
+        if isinstance(transport, Transport):
+            self.transport = transport
+        else:
+            self.transport = create_transport(
+                transport or "requests",
+                pool=pool,
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                max_connections=max_connections,
+                idle_timeout=idle_timeout,
+            )
+
+    def close(self) -> None:
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self) -> "ApiClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     def _url(self, path: str) -> str:
         return f"{self.base_url}/{path.lstrip('/')}"
 
-    def _timeout_response(self) -> Response:
-        resp = Response()
-        resp.status_code = 504
-        resp._content = json_lib.dumps({"error": "timeout"}).encode("utf-8")
-        resp.headers["Content-Type"] = "application/json"
-        return resp
+    def _timeout_response(self) -> ApiResponse:
+        return timeout_response()
+
+    def _circuit_open_response(self) -> ApiResponse:
+        return error_response(504, "circuit_open")
+
+    def _rate_limited_response(self) -> ApiResponse:
+        return error_response(429, "rate_limited")
+
+    def _deadline_response(self) -> ApiResponse:
+        return error_response(504, "deadline_exceeded")
+
+    def _compression_policy(
+        self, compression: Union[CompressionPolicy, bool, None]
+    ) -> Optional[CompressionPolicy]:
+        if compression is None:
+            return self.compression
+        if compression is True:
+            return self.compression or _DEFAULT_COMPRESSION
+        if compression is False:
+            return None
+        return compression
+
+    def _fallback(self, trace: Optional[CallTrace], resp: ApiResponse, reason: str) -> ApiResponse:
+        return trace.fallback(resp, reason) if trace is not None else resp
+
+    def _deadline(self, deadline: Optional[Deadline]) -> Optional[Deadline]:
+        if self.deadline_sec is None:
+            return deadline
+        return Deadline.earliest(deadline, Deadline.after(self.deadline_sec))
+
+    def _refresh_deadline(self) -> Deadline:
+        # Budget for a background cache refresh: the client's own
+        # deadline, or one attempt's timeout.
+        return Deadline.after(self.deadline_sec if self.deadline_sec is not None else self.timeout)
 
     def _request(
         self,
@@ -41,42 +201,229 @@ class ApiClient:
         headers: Optional[Dict[str, str]] = None,
         payload: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
-    ) -> Response:
+        deadline: Optional[Deadline] = None,
+        compression: Union[CompressionPolicy, bool, None] = None,
+        stream: bool = False,
+    ) -> ApiResponse:
         body = json if json is not None else payload
         url = self._url(path)
+        deadline = self._deadline(deadline)
+
+        if stream:
+            return self._send(method, url, headers, body, deadline, compression, stream=True)
+
+        if method == "GET" and self.response_cache is not None:
+            return self.response_cache.execute(
+                url,
+                headers,
+                lambda send_headers: self._get(url, send_headers, deadline),
+                # A background refresh outlives the caller's deadline.
+                lambda send_headers: self._get(url, send_headers, self._refresh_deadline()),
+            )
+        if method == "GET":
+            return self._get(url, headers, deadline)
+
+        if self.idempotency_store is not None and headers:
+            key = header_value(headers, IDEMPOTENCY_HEADER)
+            if key:
+                return self.idempotency_store.execute(
+                    f"{method} {url}",
+                    key,
+                    body_fingerprint(method, body),
+                    lambda: self._send(method, url, headers, body, deadline, compression),
+                )
+
+        return self._send(method, url, headers, body, deadline, compression)
+
+    def _get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        deadline: Optional[Deadline],
+    ) -> ApiResponse:
+        flight = self.single_flight
+        if flight is None:
+            return self._send("GET", url, headers, None, deadline)
+
+        resp = flight.execute(
+            flight.key_for("GET", url, headers),
+            lambda: self._send("GET", url, headers, None, deadline),
+            timeout=deadline.remaining() if deadline is not None else None,
+        )
+        if resp is not None:
+            return resp
+        inst = self.instrumentation
+        if inst.active:
+            # A follower gave up waiting for the leader's call.
+            trace = CallTrace(inst, "GET", url)
+            return trace.finish(trace.fallback(self._deadline_response(), "deadline_exceeded"))
+        return self._deadline_response()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[Dict[str, Any]],
+        deadline: Optional[Deadline] = None,
+        compression: Union[CompressionPolicy, bool, None] = None,
+        stream: bool = False,
+    ) -> ApiResponse:
+        inst = self.instrumentation
+        if not inst.active:
+            return self._attempts(method, url, headers, body, deadline, None, compression, stream)
+        trace = CallTrace(inst, method, url)
+        return trace.finish(self._attempts(method, url, headers, body, deadline, trace, compression, stream))
+
+    def _attempts(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[Dict[str, Any]],
+        deadline: Optional[Deadline],
+        trace: Optional[CallTrace],
+        compression: Union[CompressionPolicy, bool, None] = None,
+        stream: bool = False,
+    ) -> ApiResponse:
+        policy = self.retry_policy
+        policy.on_request()
+        breaker = self.circuit_breaker
+        limiter = self.rate_limiter
+        send_headers, data = _encode_body(headers, body)
+        codec = self._compression_policy(compression)
+        encoding: Optional[str] = None
+        plain_data = data
+        if codec is not None:
+            send_headers, data, encoding = codec.prepare(self._compression_key, send_headers, data)
+        hedging = self.hedging
+        if hedging is not None and (
+            stream or not (method == "GET" or (headers and header_value(headers, IDEMPOTENCY_HEADER)))
+        ):
+            hedging = None
+        hedge_admit = None
+        if hedging is not None and limiter is not None:
+            # A hedge is an attempt too: it needs a token, without waiting.
+            hedge_admit = partial(_take_token, limiter, self._limiter_key)
+        transport_send = self.transport.stream if stream else self.transport.send
+        adaptive = self.adaptive_timeout
+        adaptive_key = adaptive.key_for(method, url) if adaptive is not None else ""
+        attempt = 0
+        delay = 0.0
+
+        while True:
+            base_timeout = self.timeout
+            if adaptive is not None:
+                base_timeout = adaptive.timeout_for(adaptive_key, self.timeout)
+            timeout = base_timeout
+            if deadline is not None:
+                timeout = deadline.cap(base_timeout)
+                if timeout < self.min_attempt_timeout:
+                    return self._fallback(trace, self._deadline_response(), "deadline_exceeded")
 
-        attempts = 1 + max(0, int(self.retries))
-        last_response: Optional[Response] = None
+            if limiter is not None:
+                wait = limiter.reserve(
+                    self._limiter_key,
+                    max_wait=deadline.remaining() - self.min_attempt_timeout if deadline is not None else None,
+                )
+                if wait is None:
+                    return self._fallback(trace, self._rate_limited_response(), "rate_limited")
+                if wait > 0:
+                    time.sleep(wait)
+                    if deadline is not None:
+                        timeout = deadline.cap(base_timeout)
+
+            if breaker is not None and not breaker.allow(self._circuit_key):
+                return self._fallback(trace, self._circuit_open_response(), "circuit_open")
 
-        for attempt in range(attempts):
+            resp: Optional[ApiResponse] = None
+            send = partial(transport_send, method, url, send_headers, data, timeout)
+            timed = trace is not None or adaptive is not None
+            started = time.perf_counter() if timed else 0.0
             try:
-                resp = requests.request(
-                    method=method,
-                    url=url,
-                    headers=headers,
-                    json=body,
-                    timeout=self.timeout,
+                if hedging is not None:
+                    resp = hedging.execute(
+                        f"{method} {url.split('?', 1)[0]}",
+                        send,
+                        lambda r: not policy.is_retryable(r),
+                        admit=hedge_admit,
+                    )
+                else:
+                    resp = send()
+            except FatalTransportError:
+                # Never reached the merchant: hand back the token and any
+                # half-open probe slot instead of recording an outcome.
+                if limiter is not None:
+                    limiter.release(self._limiter_key)
+                if breaker is not None:
+                    breaker.release(self._circuit_key)
+                raise
+            except Exception:
+                pass
+            if isinstance(resp, StreamedResponse):
+                resp.deadline = deadline
+            if timed:
+                elapsed = time.perf_counter() - started
+                if adaptive is not None:
+                    # A timed-out attempt lasted at least its timeout.
+                    adaptive.record(adaptive_key, elapsed if resp is not None else max(elapsed, timeout))
+                if trace is not None:
+                    trace.attempt(attempt, resp, elapsed)
+
+            if encoding is not None and resp is not None and resp.status_code == 415:
+                # Merchant rejects compressed bodies: resend this attempt
+                # plain (not counted as a retry) and stop compressing.
+                codec.reject(self._compression_key)
+                if breaker is not None:
+                    # The merchant answered: settle the attempt (and a
+                    # half-open probe slot) before resending.
+                    breaker.record(self._circuit_key, status_code=resp.status_code)
+                resp.close()
+                send_headers = {k: v for k, v in send_headers.items() if k != "Content-Encoding"}
+                data = plain_data
+                encoding = None
+                continue
+
+            if limiter is not None and resp is not None:
+                limiter.on_response(
+                    self._limiter_key,
+                    resp.status_code,
+                    parse_retry_after(resp.headers.get("Retry-After")),
                 )
-                last_response = resp
 
-                if resp.status_code in (429, 500, 502, 503, 504) and attempt < attempts - 1:
-                    if self.retry_backoff_sec > 0:
-                        time.sleep(self.retry_backoff_sec)
-                    continue
+            if breaker is not None:
+                breaker.record(
+                    self._circuit_key,
+                    status_code=resp.status_code if resp is not None else 0,
+                    error=resp is None,
+                )
 
+            if resp is not None and not policy.is_retryable(resp):
                 return resp
 
-            except Exception:
-                if attempt < attempts - 1:
-                    if self.retry_backoff_sec > 0:
-                        time.sleep(self.retry_backoff_sec)
-                    continue
-                return self._timeout_response()
+            if not policy.should_retry(attempt, resp):
+                return resp if resp is not None else self._fallback(trace, self._timeout_response(), "timeout")
 
-        return last_response if last_response is not None else self._timeout_response()
+            delay = policy.next_delay(attempt, resp, delay)
+            if deadline is not None and deadline.remaining() - delay < self.min_attempt_timeout:
+                # No useful time would be left for the next attempt.
+                return resp if resp is not None else self._fallback(trace, self._timeout_response(), "timeout")
+            if trace is not None:
+                trace.retry(attempt, resp, delay)
+            if resp is not None:
+                resp.close()
+            if delay > 0:
+                time.sleep(delay)
+            attempt += 1
 
-    def get(self, path: str, headers: Optional[Dict[str, str]] = None) -> Response:
-        return self._request("GET", path, headers=headers)
+    def get(
+        self,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        deadline: Optional[Deadline] = None,
+        stream: bool = False,
+    ) -> ApiResponse:
+        return self._request("GET", path, headers=headers, deadline=deadline, stream=stream)
 
     def post(
         self,
@@ -84,5 +431,65 @@ class ApiClient:
         headers: Optional[Dict[str, str]] = None,
         payload: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
-    ) -> Response:
-        return self._request("POST", path, headers=headers, payload=payload, json=json)
+        deadline: Optional[Deadline] = None,
+        compression: Union[CompressionPolicy, bool, None] = None,
+        stream: bool = False,
+    ) -> ApiResponse:
+        return self._request(
+            "POST",
+            path,
+            headers=headers,
+            payload=payload,
+            json=json,
+            deadline=deadline,
+            compression=compression,
+            stream=stream,
+        )
+
+    def map(
+        self,
+        specs: Iterable[SpecLike],
+        max_workers: int = 8,
+        deadline: Optional[Deadline] = None,
+    ) -> List[ApiResponse]:
+        # Runs many calls with at most max_workers in flight and returns
+        # responses in input order. Each call keeps its own retry and
+        # timeout-to-504 handling, so a slow merchant only delays its own
+        # slot. Keep pool_maxsize >= max_workers to reuse every connection.
+        # A shared `deadline` bounds the batch as a whole.
+        return run_ordered(partial(self._send_spec, deadline=deadline), specs, max_workers)
+
+    def as_completed(
+        self,
+        specs: Iterable[SpecLike],
+        max_workers: int = 8,
+        deadline: Optional[Deadline] = None,
+    ) -> Iterator[Tuple[int, ApiResponse]]:
+        # Streaming variant of map(): yields (index, response) pairs as
+        # soon as each call finishes.
+        return iter_completed(partial(self._send_spec, deadline=deadline), specs, max_workers)
+
+    def _send_spec(self, spec: RequestSpec, deadline: Optional[Deadline] = None) -> ApiResponse:
+        return self._request(
+            spec.method, spec.path, headers=spec.headers, json=spec.json, deadline=deadline
+        )
+
+
+# Used by post(compression=True) on a client without its own policy.
+_DEFAULT_COMPRESSION = CompressionPolicy()
+
+
+def _take_token(limiter: RateLimiter, key: str) -> bool:
+    return limiter.reserve(key, max_wait=0.0) is not None
+
+
+def _encode_body(
+    headers: Optional[Dict[str, str]], body: Optional[Dict[str, Any]]
+) -> Tuple[Optional[Dict[str, str]], Optional[bytes]]:
+    # JSON is encoded once per call, not once per attempt.
+    if body is None:
+        return headers, None
+    send_headers = dict(headers or {})
+    if header_value(send_headers, "Content-Type") is None:
+        send_headers["Content-Type"] = "application/json"
+    return send_headers, json_lib.dumps(body).encode("utf-8")
@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import asyncio
+import json as json_lib
+import ssl
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from cart.client.response import ApiResponse, Headers, timeout_response
+from cart.client.retry_policy import ConstantBackoff, RetryPolicy
+
+
+def build_response(
+    status_code: int,
+    headers: Optional[Dict[str, str]] = None,
+    content: bytes = b"",
+    url: Optional[str] = None,
+) -> ApiResponse:
+    # Async transports return the same ApiResponse as ApiClient so
+    # assertions and contract validators work on both clients.
+    return ApiResponse(status_code, Headers(headers), content, url=url)
+
+
+class AsyncTransport:
+    # Sends one HTTP exchange. Retries and timeouts are owned by the client.
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[bytes],
+    ) -> ApiResponse:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        pass
+
+
+class AsyncHttpTransport(AsyncTransport):
+    # Minimal HTTP/1.1 client on asyncio streams with keep-alive reuse.
+    #
+    # Idle connections are kept per (scheme, host, port) and at most
+    # max_connections_per_host exchanges run against one host at a time.
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 10,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        self.max_connections_per_host = max_connections_per_host
+        self._ssl_context = ssl_context
+        self._idle: Dict[Tuple[str, str, int], List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]] = {}
+        self._limits: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[bytes],
+    ) -> ApiResponse:
+        scheme, host, port, target = _split_url(url)
+        key = (scheme, host, port)
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = self._limits[key] = asyncio.Semaphore(self.max_connections_per_host)
+
+        async with limit:
+            idle = self._idle.setdefault(key, [])
+            reused = bool(idle)
+            conn = idle.pop() if reused else await self._connect(scheme, host, port)
+
+            try:
+                status, resp_headers, content, keep_alive = await _exchange(
+                    conn, method, host, port, target, headers, body
+                )
+            except (ConnectionError, asyncio.IncompleteReadError):
+                conn[1].close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; the
+                # request never reached it, so one fresh attempt is safe.
+                conn = await self._connect(scheme, host, port)
+                try:
+                    status, resp_headers, content, keep_alive = await _exchange(
+                        conn, method, host, port, target, headers, body
+                    )
+                except BaseException:
+                    conn[1].close()
+                    raise
+            except BaseException:
+                conn[1].close()
+                raise
+
+            if keep_alive:
+                idle.append(conn)
+            else:
+                conn[1].close()
+
+        return build_response(status, resp_headers, content, url=url)
+
+    async def aclose(self) -> None:
+        for conns in self._idle.values():
+            for _, writer in conns:
+                writer.close()
+        self._idle.clear()
+
+    async def _connect(
+        self, scheme: str, host: str, port: int
+    ) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        ssl_arg: Union[bool, ssl.SSLContext, None] = None
+        if scheme == "https":
+            ssl_arg = self._ssl_context or ssl.create_default_context()
+        return await asyncio.open_connection(host, port, ssl=ssl_arg)
+
+
+class MockAsyncTransport(AsyncTransport):
+    # Local test transport for AsyncApiClient, the async counterpart of
+    # requests_mock. No sockets are opened.
+    #
+    # Each registered route takes a list of response dicts that are
+    # returned in order (the last one repeats), mirroring requests_mock:
+    #   {"status_code": 200, "json": {...}, "headers": {...}}
+    #   {"exc": TimeoutError}
+    #   {"status_code": 200, "delay": 0.5}
+
+    def __init__(self) -> None:
+        self._routes: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._served: Dict[Tuple[str, str], int] = {}
+        self.request_history: List[Tuple[str, str, Dict[str, str], Optional[bytes]]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def register(
+        self,
+        method: str,
+        url: str,
+        responses: Union[Dict[str, Any], List[Dict[str, Any]], None] = None,
+        **response: Any,
+    ) -> None:
+        if responses is None:
+            responses = [response]
+        elif isinstance(responses, dict):
+            responses = [responses]
+        self._routes[(method.upper(), url)] = list(responses)
+        self._served[(method.upper(), url)] = 0
+
+    def get(self, url: str, responses: Any = None, **response: Any) -> None:
+        self.register("GET", url, responses, **response)
+
+    def post(self, url: str, responses: Any = None, **response: Any) -> None:
+        self.register("POST", url, responses, **response)
+
+    @property
+    def call_count(self) -> int:
+        return len(self.request_history)
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[bytes],
+    ) -> ApiResponse:
+        key = (method.upper(), url)
+        self.request_history.append((method.upper(), url, dict(headers), body))
+        if key not in self._routes:
+            raise LookupError(f"no mock registered for {method} {url}")
+
+        responses = self._routes[key]
+        index = min(self._served[key], len(responses) - 1)
+        self._served[key] += 1
+        spec = responses[index]
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if spec.get("delay"):
+                await asyncio.sleep(spec["delay"])
+            if "exc" in spec:
+                exc = spec["exc"]
+                raise exc() if isinstance(exc, type) else exc
+        finally:
+            self.in_flight -= 1
+
+        resp_headers = dict(spec.get("headers") or {})
+        if "json" in spec:
+            content = json_lib.dumps(spec["json"]).encode("utf-8")
+            resp_headers.setdefault("Content-Type", "application/json")
+        else:
+            content = spec.get("content", spec.get("text", "").encode("utf-8"))
+        return build_response(spec.get("status_code", 200), resp_headers, content, url=url)
+
+
+class AsyncApiClient:
+    # asyncio counterpart of ApiClient.
+    #
+    # Same rules as the sync client: 1 + retries attempts, a fixed
+    # retry_backoff_sec between attempts (or a shared `retry_policy`),
+    # retries on RETRYABLE_STATUSES, and any transport error or timeout
+    # becomes the controlled 504.
+    # At most max_concurrency calls are in flight at once per client.
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 5.0,
+        retries: int = 0,
+        retry_backoff_sec: float = 0.0,
+        max_concurrency: int = 100,
+        transport: Optional[AsyncTransport] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_backoff_sec = retry_backoff_sec
+        self.retry_policy = retry_policy or RetryPolicy(
+            retries=retries,
+            backoff=ConstantBackoff(retry_backoff_sec),
+            respect_retry_after=False,
+        )
+        self.max_concurrency = max_concurrency
+        self.transport = transport or AsyncHttpTransport()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def _timeout_response(self) -> ApiResponse:
+        return timeout_response()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> ApiResponse:
+        body = json if json is not None else payload
+        url = self._url(path)
+
+        send_headers = dict(headers or {})
+        data: Optional[bytes] = None
+        if body is not None:
+            data = json_lib.dumps(body).encode("utf-8")
+            send_headers.setdefault("Content-Type", "application/json")
+
+        # Created lazily so the semaphore binds to the running event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            policy = self.retry_policy
+            policy.on_request()
+            attempt = 0
+            delay = 0.0
+
+            while True:
+                resp: Optional[ApiResponse] = None
+                try:
+                    resp = await asyncio.wait_for(
+                        self.transport.send(method, url, send_headers, data),
+                        timeout=self.timeout,
+                    )
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    pass
+
+                if resp is not None and not policy.is_retryable(resp):
+                    return resp
+
+                if not policy.should_retry(attempt, resp):
+                    return resp if resp is not None else self._timeout_response()
+
+                delay = policy.next_delay(attempt, resp, delay)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                attempt += 1
+
+    async def get(self, path: str, headers: Optional[Dict[str, str]] = None) -> ApiResponse:
+        return await self._request("GET", path, headers=headers)
+
+    async def post(
+        self,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        payload: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+    ) -> ApiResponse:
+        return await self._request("POST", path, headers=headers, payload=payload, json=json)
+
+
+def _split_url(url: str) -> Tuple[str, str, int, str]:
+    scheme, _, rest = url.partition("://")
+    scheme = scheme.lower()
+    netloc, slash, target = rest.partition("/")
+    target = slash + target if slash else "/"
+    if "?" in netloc:
+        netloc, _, query = netloc.partition("?")
+        target = "/?" + query
+    host, sep, port = netloc.rpartition(":")
+    if not sep or not port.isdigit():
+        return scheme, netloc.strip("[]"), 443 if scheme == "https" else 80, target
+    return scheme, host.strip("[]"), int(port), target
+
+
+async def _exchange(
+    conn: Tuple[asyncio.StreamReader, asyncio.StreamWriter],
+    method: str,
+    host: str,
+    port: int,
+    target: str,
+    headers: Dict[str, str],
+    body: Optional[bytes],
+) -> Tuple[int, Dict[str, str], bytes, bool]:
+    reader, writer = conn
+
+    lines = [f"{method} {target} HTTP/1.1", f"Host: {host}:{port}"]
+    lower = {k.lower() for k in headers}
+    for name, value in headers.items():
+        lines.append(f"{name}: {value}")
+    if "accept-encoding" not in lower:
+        lines.append("Accept-Encoding: identity")
+    if body is not None or method in ("POST", "PUT", "PATCH"):
+        lines.append(f"Content-Length: {len(body or b'')}")
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+    await writer.drain()
+
+    status_line = await reader.readuntil(b"\r\n")
+    parts = status_line.decode("latin-1").split(" ", 2)
+    version, status = parts[0], int(parts[1])
+
+    resp_headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        if line == b"\r\n":
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        resp_headers[name.strip()] = value.strip()
+
+    lookup = {k.lower(): v for k, v in resp_headers.items()}
+    connection = lookup.get("connection", "").lower()
+    keep_alive = connection != "close" and (version == "HTTP/1.1" or connection == "keep-alive")
+
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        content = b""
+    elif lookup.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size_line = await reader.readuntil(b"\r\n")
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+            if size == 0:
+                # Trailers end with an empty line.
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+        content = b"".join(chunks)
+    elif "content-length" in lookup:
+        content = await reader.readexactly(int(lookup["content-length"]))
+    else:
+        content = await reader.read()
+        keep_alive = False
+
+    return status, resp_headers, content, keep_alive
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+
+class RequestSpec(NamedTuple):
+    # One call in a batch. Plain path strings and (method, path) tuples
+    # are accepted wherever a RequestSpec is expected.
+    method: str
+    path: str
+    headers: Optional[Dict[str, str]] = None
+    json: Optional[Dict[str, Any]] = None
+
+
+SpecLike = Union[RequestSpec, str, Tuple[Any, ...], Dict[str, Any]]
+
+
+def as_spec(spec: SpecLike) -> RequestSpec:
+    if isinstance(spec, RequestSpec):
+        return spec
+    if isinstance(spec, str):
+        return RequestSpec("GET", spec)
+    if isinstance(spec, dict):
+        return RequestSpec(
+            spec.get("method", "GET").upper(),
+            spec["path"],
+            spec.get("headers"),
+            spec.get("json", spec.get("payload")),
+        )
+    return RequestSpec(spec[0].upper(), *spec[1:])
+
+
+def iter_completed(
+    send: Callable[[RequestSpec], Any],
+    specs: Iterable[SpecLike],
+    max_workers: int,
+) -> Iterator[Tuple[int, Any]]:
+    # Runs send() for every spec on a thread pool and yields
+    # (index, result) as soon as each call finishes.
+    #
+    # Only about 2 * max_workers calls are queued at any time, so very
+    # large (or lazy) spec iterables do not materialise all futures.
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+
+    window = 2 * max_workers
+    source = enumerate(as_spec(s) for s in specs)
+    pending: Set[Future] = set()
+    index_of: Dict[Future, int] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api-batch") as executor:
+
+        def refill() -> None:
+            for index, spec in source:
+                future = executor.submit(send, spec)
+                index_of[future] = index
+                pending.add(future)
+                if len(pending) >= window:
+                    return
+
+        refill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                yield index_of.pop(future), future.result()
+            refill()
+
+
+def run_ordered(
+    send: Callable[[RequestSpec], Any],
+    specs: Iterable[SpecLike],
+    max_workers: int,
+) -> List[Any]:
+    results: Dict[int, Any] = {}
+    for index, result in iter_completed(send, specs, max_workers):
+        results[index] = result
+    return [results[i] for i in range(len(results))]
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from cart.client.http_utils import header_value
+from cart.client.response import ApiResponse, clone_response
+
+# Headers a 304 may carry that refresh the stored response.
+_REFRESHED_HEADERS = ("Cache-Control", "Date", "ETag", "Expires", "Last-Modified", "Vary")
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        name, sep, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if sep else None
+    return directives
+
+
+def _seconds(directives: Dict[str, Optional[str]], name: str) -> float:
+    value = directives.get(name)
+    try:
+        return max(0.0, float(value)) if value is not None else 0.0
+    except ValueError:
+        return 0.0
+
+
+class _Entry:
+    __slots__ = (
+        "response",
+        "size",
+        "stored_at",
+        "max_age",
+        "stale_while_revalidate",
+        "stale_if_error",
+        "vary",
+        "revalidating",
+    )
+
+    def __init__(self, response: ApiResponse, vary: Tuple[Tuple[str, str], ...], now: float) -> None:
+        self.response = response
+        self.size = len(response.content or b"") + sum(len(k) + len(v) for k, v in response.headers.items())
+        self.vary = vary
+        self.revalidating = False
+        self.refresh(now)
+
+    def refresh(self, now: float) -> None:
+        directives = parse_cache_control(self.response.headers.get("Cache-Control"))
+        self.stored_at = now
+        self.max_age = 0.0 if "no-cache" in directives else _seconds(directives, "max-age")
+        self.stale_while_revalidate = _seconds(directives, "stale-while-revalidate")
+        self.stale_if_error = _seconds(directives, "stale-if-error")
+
+    def age(self, now: float) -> float:
+        return now - self.stored_at
+
+
+class ResponseCache:
+    # Client-side HTTP cache for GET responses.
+    #
+    # - Fresh entries (Cache-Control max-age) are served without I/O.
+    # - Stale entries with a validator (ETag / Last-Modified) are
+    #   revalidated with If-None-Match / If-Modified-Since; a 304 refreshes
+    #   the stored response instead of re-downloading it.
+    # - stale-while-revalidate: a slightly stale entry is served at once
+    #   and refreshed in the background (through `revalidate`, if given,
+    #   so the refresh is not bound to the caller's deadline). A failed
+    #   refresh keeps the stale entry and counts in `refresh_errors`.
+    # - stale-if-error: when the merchant fails (5xx or the local 504
+    #   fallback), a stale entry is served instead of the error.
+    #
+    # Bounded by entry count and by total body + header bytes (LRU).
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        max_bytes: int = 16 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.stale_served = 0
+        self.refresh_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "stale_served": self.stale_served,
+            "refresh_errors": self.refresh_errors,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def execute(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        send: Callable[[Dict[str, str]], ApiResponse],
+        revalidate: Optional[Callable[[Dict[str, str]], ApiResponse]] = None,
+    ) -> ApiResponse:
+        # `send` performs the upstream GET (with the client's retries and
+        # 504 fallback) using the headers it is given; `revalidate` does
+        # the same for background refreshes and defaults to `send`.
+        headers = dict(headers or {})
+        request_directives = parse_cache_control(header_value(headers, "Cache-Control"))
+        now = self._clock()
+
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None and entry.vary != _vary_values(entry.response, headers):
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(url)
+                age = entry.age(now)
+                if age < entry.max_age and "no-cache" not in request_directives:
+                    self.hits += 1
+                    return clone_response(entry.response)
+                if age < entry.max_age + entry.stale_while_revalidate:
+                    self.stale_served += 1
+                    if not entry.revalidating:
+                        entry.revalidating = True
+                        threading.Thread(
+                            target=self._revalidate,
+                            args=(url, headers, entry, revalidate or send),
+                            daemon=True,
+                        ).start()
+                    return clone_response(entry.response)
+            else:
+                self.misses += 1
+
+        return self._fetch(url, headers, entry, send)
+
+    def _revalidate(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        entry: _Entry,
+        send: Callable[[Dict[str, str]], ApiResponse],
+    ) -> None:
+        try:
+            self._fetch(url, headers, entry, send)
+        except Exception:
+            # Nobody waits on a background refresh: keep serving the
+            # stale entry until it expires or a later refresh succeeds.
+            with self._lock:
+                self.refresh_errors += 1
+        finally:
+            entry.revalidating = False
+
+    def _fetch(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        entry: Optional[_Entry],
+        send: Callable[[Dict[str, str]], ApiResponse],
+    ) -> ApiResponse:
+        send_headers = headers
+        if entry is not None:
+            send_headers = dict(headers)
+            etag = entry.response.headers.get("ETag")
+            last_modified = entry.response.headers.get("Last-Modified")
+            if etag:
+                send_headers["If-None-Match"] = etag
+            if last_modified:
+                send_headers["If-Modified-Since"] = last_modified
+
+        resp = send(send_headers)
+        now = self._clock()
+
+        if resp.status_code == 304 and entry is not None:
+            with self._lock:
+                self.revalidations += 1
+                for name in _REFRESHED_HEADERS:
+                    if name in resp.headers:
+                        entry.response.headers[name] = resp.headers[name]
+                entry.refresh(now)
+                return clone_response(entry.response)
+
+        if (resp.status_code >= 500 or resp.status_code == 429) and entry is not None:
+            if entry.age(now) < entry.max_age + entry.stale_if_error:
+                with self._lock:
+                    self.stale_served += 1
+                return clone_response(entry.response)
+
+        self._store(url, headers, resp, now)
+        return resp
+
+    def _store(self, url: str, headers: Dict[str, str], resp: ApiResponse, now: float) -> None:
+        if resp.status_code != 200:
+            return
+        directives = parse_cache_control(resp.headers.get("Cache-Control"))
+        if "no-store" in directives or resp.headers.get("Vary", "").strip() == "*":
+            return
+        has_validator = "ETag" in resp.headers or "Last-Modified" in resp.headers
+        if "max-age" not in directives and not has_validator:
+            return
+
+        entry = _Entry(clone_response(resp), _vary_values(resp, headers), now)
+        if entry.size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[url] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+
+def _vary_values(resp: ApiResponse, headers: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    vary = resp.headers.get("Vary")
+    if not vary:
+        return ()
+    names = sorted(n.strip().lower() for n in vary.split(",") if n.strip())
+    return tuple((n, header_value(headers, n) or "") for n in names)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from cart.client.http_utils import header_value
+from cart.client.idempotency import IDEMPOTENCY_HEADER
+from cart.client.response import ApiResponse, Headers
+from cart.client.transport import FatalTransportError, Transport
+
+# Cassette layout (append-only):
+#
+#   <path>      MAGIC, then one record per exchange:
+#               [meta_len u32][body_len u32][meta JSON][response body]
+#   <path>.idx  one fixed-size entry per record: [match key 16B][offset u64]
+#
+# The index is only an accelerator. A missing or short index is rebuilt
+# by scanning record headers, so a recorder killed mid-run still leaves a
+# usable cassette (a torn final record is ignored).
+
+MAGIC = b"CARTCAS1"
+_RECORD = struct.Struct(">II")
+_INDEX = struct.Struct(">16sQ")
+
+
+class CassetteMiss(FatalTransportError, LookupError):
+    # Fails the call loudly: an unmatched request must not replay as the
+    # 504 fallback a missing recording would otherwise look like.
+    pass
+
+
+class RecordedTransportError(ConnectionError):
+    # Replayed in place of the network error seen while recording, so the
+    # client falls back to its controlled 504 exactly as it did live.
+    pass
+
+
+def match_key(method: str, url: str, body: Optional[bytes], idempotency_key: Optional[str]) -> bytes:
+    body_hash = hashlib.sha256(body).hexdigest() if body else ""
+    raw = f"{method.upper()}\n{url}\n{body_hash}\n{idempotency_key or ''}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+
+
+class CassetteWriter:
+    # Appends exchanges to a cassette. Thread-safe; writes are buffered
+    # and flushed on flush()/close().
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._data = open(path, "ab")
+        self._index = open(path + ".idx", "ab")
+        self._lock = threading.Lock()
+        if new:
+            self._data.write(MAGIC)
+        self._offset = self._data.tell()
+        self.records = 0
+
+    def append(self, key: bytes, meta: Dict[str, Any], body: bytes) -> None:
+        encoded = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            offset = self._offset
+            self._data.write(_RECORD.pack(len(encoded), len(body)))
+            self._data.write(encoded)
+            self._data.write(body)
+            self._index.write(_INDEX.pack(key, offset))
+            self._offset += _RECORD.size + len(encoded) + len(body)
+            self.records += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            self._data.flush()
+            self._index.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._data.closed:
+                self._data.close()
+                self._index.close()
+
+
+class RecordingTransport(Transport):
+    # Wraps a real transport and appends every exchange to a cassette:
+    #
+    #   recorder = RecordingTransport(create_transport("requests"), "merchant.cas")
+    #   client = ApiClient(base_url, transport=recorder)
+    #
+    # Network errors are recorded too and re-raised, so replays reproduce
+    # timeouts and resets as well as responses.
+
+    name = "recording"
+
+    def __init__(self, inner: Transport, path: str) -> None:
+        self.inner = inner
+        self.writer = CassetteWriter(path)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[bytes],
+        timeout: float,
+    ) -> ApiResponse:
+        key = match_key(method, url, body, header_value(headers, IDEMPOTENCY_HEADER))
+        meta: Dict[str, Any] = {"key": key.hex(), "method": method.upper(), "url": url}
+        start = time.perf_counter()
+        try:
+            resp = self.inner.send(method, url, headers, body, timeout)
+        except Exception as exc:
+            meta["latency"] = time.perf_counter() - start
+            meta["error"] = type(exc).__name__
+            self.writer.append(key, meta, b"")
+            raise
+
+        meta["latency"] = time.perf_counter() - start
+        meta["status"] = resp.status_code
+        meta["reason"] = resp.reason
+        meta["headers"] = list(resp.headers.items())
+        self.writer.append(key, meta, resp.content or b"")
+        return resp
+
+    def close(self) -> None:
+        self.writer.close()
+        self.inner.close()
+
+
+class CassetteTransport(Transport):
+    # Replays a cassette without touching the network.
+    #
+    # The data file is memory-mapped and only the fixed-size index is held
+    # in memory; each response is decoded from its own slice on demand.
+    # Requests match on method, URL, body hash and Idempotency-Key. When
+    # one request was recorded several times (e.g. 503 then 200 across
+    # retries) the recordings are served in order and the last repeats.
+    #
+    # - realtime: sleep for each recorded latency instead of replaying at
+    #   full speed (useful with timeouts, hedging and deadlines)
+    # - unmatched requests raise CassetteMiss, which ApiClient passes on
+    #   to the caller, and are listed in `misses`
+
+    name = "cassette"
+
+    def __init__(self, path: str, realtime: bool = False) -> None:
+        self.path = path
+        self.realtime = realtime
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a cassette")
+
+        self._offsets: Dict[bytes, List[int]] = {}
+        self._served: Dict[bytes, int] = {}
+        self._lock = threading.Lock()
+        self.misses: List[Tuple[str, str]] = []
+        self.replayed = 0
+        self._load_index()
+
+    def __len__(self) -> int:
+        return sum(len(offsets) for offsets in self._offsets.values())
+
+    def _load_index(self) -> None:
+        size = len(self._map)
+        scan_from = len(MAGIC)
+        try:
+            with open(self.path + ".idx", "rb") as fh:
+                raw = fh.read()
+        except FileNotFoundError:
+            raw = b""
+
+        for i in range(len(raw) // _INDEX.size):
+            key, offset = _INDEX.unpack_from(raw, i * _INDEX.size)
+            end = self._record_end(offset, size)
+            if end is None:
+                break
+            self._offsets.setdefault(key, []).append(offset)
+            scan_from = end
+
+        # Records appended after the last index entry (or no index at all).
+        offset = scan_from
+        while True:
+            end = self._record_end(offset, size)
+            if end is None:
+                break
+            meta, _ = self._read(offset)
+            self._offsets.setdefault(bytes.fromhex(meta["key"]), []).append(offset)
+            offset = end
+
+    def _record_end(self, offset: int, size: int) -> Optional[int]:
+        if offset + _RECORD.size > size:
+            return None
+        meta_len, body_len = _RECORD.unpack_from(self._map, offset)
+        end = offset + _RECORD.size + meta_len + body_len
+        return end if end <= size else None
+
+    def _read(self, offset: int) -> Tuple[Dict[str, Any], bytes]:
+        meta_len, body_len = _RECORD.unpack_from(self._map, offset)
+        start = offset + _RECORD.size
+        meta = json.loads(self._map[start : start + meta_len])
+        body = self._map[start + meta_len : start + meta_len + body_len]
+        return meta, body
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[bytes],
+        timeout: float,
+    ) -> ApiResponse:
+        key = match_key(method, url, body, header_value(headers, IDEMPOTENCY_HEADER))
+        with self._lock:
+            offsets = self._offsets.get(key)
+            if not offsets:
+                self.misses.append((method.upper(), url))
+                raise CassetteMiss(f"no recording for {method.upper()} {url}")
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            self.replayed += 1
+        meta, content = self._read(offsets[min(index, len(offsets) - 1)])
+
+        if self.realtime and meta.get("latency"):
+            if meta["latency"] > timeout:
+                time.sleep(timeout)
+                raise RecordedTransportError(f"replayed timeout for {method.upper()} {url}")
+            time.sleep(meta["latency"])
+        if "error" in meta:
+            raise RecordedTransportError(f"replayed {meta['error']} for {method.upper()} {url}")
+
+        return ApiResponse(meta["status"], Headers(dict(meta["headers"])), content, url=url, reason=meta.get("reason"))
+
+    def rewind(self) -> None:
+        with self._lock:
+            self._served.clear()
+
+    def close(self) -> None:
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict
+
+from cart.client.http_utils import host_key
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Upstream statuses that count as a merchant failure. 429 and other 4xx
+# mean the merchant is up and answering, so they do not trip the breaker.
+FAILURE_STATUSES = frozenset((500, 502, 503, 504))
+
+
+class _Circuit:
+    __slots__ = ("state", "window", "consecutive", "opened_at", "probes", "probe_started")
+
+    def __init__(self, window_size: int) -> None:
+        self.state = CLOSED
+        self.window: Deque[bool] = deque(maxlen=window_size)
+        self.consecutive = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_started = 0.0
+
+
+class CircuitBreaker:
+    # Per-merchant circuit breaker shared by any number of ApiClients.
+    #
+    # Circuits are keyed by host (scheme://host:port) or by the full base
+    # URL. A closed circuit opens when either:
+    # - `consecutive_failures` attempts in a row fail, or
+    # - at least `min_calls` of the last `window_size` attempts were seen
+    #   and the failure share reaches `failure_rate`.
+    # After `reset_timeout` seconds an open circuit goes half-open and lets
+    # `half_open_max_calls` probes through; a successful probe closes it,
+    # a failed one opens it again. A probe whose outcome is never recorded
+    # counts as failed once `reset_timeout` has passed, and release()
+    # gives back the slot of a probe that never reached the merchant.
+
+    def __init__(
+        self,
+        consecutive_failures: int = 5,
+        failure_rate: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        key: str = "host",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if key not in ("host", "base_url"):
+            raise ValueError("key must be 'host' or 'base_url'")
+        self.consecutive_failures = consecutive_failures
+        self.failure_rate = failure_rate
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.key = key
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._circuits: Dict[str, _Circuit] = {}
+        self.rejected = 0
+
+    def key_for(self, base_url: str) -> str:
+        if self.key == "base_url":
+            return base_url
+        return host_key(base_url)
+
+    def state(self, key: str) -> str:
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return CLOSED
+            self._maybe_half_open(circuit)
+            return circuit.state
+
+    def allow(self, key: str) -> bool:
+        with self._lock:
+            circuit = self._circuit(key)
+            self._maybe_half_open(circuit)
+
+            if circuit.state == CLOSED:
+                return True
+            if circuit.state == HALF_OPEN and circuit.probes < self.half_open_max_calls:
+                if not circuit.probes:
+                    circuit.probe_started = self._clock()
+                circuit.probes += 1
+                return True
+
+            self.rejected += 1
+            return False
+
+    def release(self, key: str) -> None:
+        # Returns a slot granted by allow() for an attempt that ended
+        # without an outcome to record.
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is not None and circuit.state == HALF_OPEN and circuit.probes:
+                circuit.probes -= 1
+
+    def record_success(self, key: str) -> None:
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == HALF_OPEN:
+                self._close(circuit)
+                return
+            circuit.consecutive = 0
+            circuit.window.append(True)
+
+    def record_failure(self, key: str) -> None:
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == HALF_OPEN:
+                self._open(circuit)
+                return
+
+            circuit.consecutive += 1
+            circuit.window.append(False)
+            if circuit.state == CLOSED and self._should_trip(circuit):
+                self._open(circuit)
+
+    def record(self, key: str, status_code: int = 0, error: bool = False) -> None:
+        if error or status_code in FAILURE_STATUSES:
+            self.record_failure(key)
+        else:
+            self.record_success(key)
+
+    def snapshot(self) -> Dict[str, str]:
+        with self._lock:
+            for circuit in self._circuits.values():
+                self._maybe_half_open(circuit)
+            return {key: c.state for key, c in self._circuits.items()}
+
+    def _circuit(self, key: str) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit(self.window_size)
+        return circuit
+
+    def _should_trip(self, circuit: _Circuit) -> bool:
+        if circuit.consecutive >= self.consecutive_failures:
+            return True
+        calls = len(circuit.window)
+        if calls < self.min_calls:
+            return False
+        failures = calls - sum(circuit.window)
+        return failures / calls >= self.failure_rate
+
+    def _maybe_half_open(self, circuit: _Circuit) -> None:
+        now = self._clock()
+        if (
+            circuit.state == HALF_OPEN
+            and circuit.probes
+            and now - circuit.probe_started >= self.reset_timeout
+        ):
+            # The probes never reported back: reopen as of when they
+            # expired, so the next half-open window is not pushed back.
+            circuit.state = OPEN
+            circuit.opened_at = circuit.probe_started + self.reset_timeout
+            circuit.probes = 0
+        if circuit.state == OPEN and now - circuit.opened_at >= self.reset_timeout:
+            circuit.state = HALF_OPEN
+            circuit.probes = 0
+
+    def _open(self, circuit: _Circuit) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = self._clock()
+        circuit.probes = 0
+
+    def _close(self, circuit: _Circuit) -> None:
+        circuit.state = CLOSED
+        circuit.window.clear()
+        circuit.consecutive = 0
+        circuit.probes = 0
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import gzip
+import threading
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from cart.client.http_utils import header_value
+
+# Body compression for ApiClient.
+#
+# gzip is always available; zstd and br are used when the optional
+# `zstandard` / `brotli` packages are installed. They are looked up on
+# first use, not at import, so `import cart.client.api_client` stays
+# cheap. Responses are decompressed by the transport (urllib3's streaming
+# decoders handle gzip, deflate and, with the same optional packages, br
+# and zstd), so Accept-Encoding only advertises what can be decoded.
+
+# Preference order when a policy asks for "auto".
+PREFERRED = ("zstd", "br", "gzip")
+
+Codec = Tuple[Callable[[bytes, int], bytes], Callable[[bytes], bytes]]
+
+_codecs: Optional[Dict[str, Codec]] = None
+_codecs_lock = threading.Lock()
+
+
+def _load_codecs() -> Dict[str, Codec]:
+    global _codecs
+    if _codecs is not None:
+        return _codecs
+    with _codecs_lock:
+        if _codecs is not None:
+            return _codecs
+        codecs: Dict[str, Codec] = {
+            # mtime=0: the same body always compresses to the same bytes,
+            # so cassette matching on the sent body keeps working.
+            "gzip": (lambda data, level: gzip.compress(data, compresslevel=level, mtime=0), gzip.decompress),
+        }
+        try:
+            import zstandard
+
+            codecs["zstd"] = (
+                lambda data, level: zstandard.ZstdCompressor(level=level).compress(data),
+                lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+            )
+        except ImportError:
+            pass
+        try:
+            import brotli
+
+            codecs["br"] = (
+                lambda data, level: brotli.compress(data, quality=min(level, 11)),
+                brotli.decompress,
+            )
+        except ImportError:
+            pass
+        _codecs = codecs
+    return codecs
+
+
+def available_encodings() -> Tuple[str, ...]:
+    codecs = _load_codecs()
+    return tuple(name for name in PREFERRED if name in codecs)
+
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    codecs = _load_codecs()
+    if encoding not in codecs:
+        raise ValueError(f"encoding {encoding!r} is not available; have {available_encodings()}")
+    return codecs[encoding][0](data, level)
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    codecs = _load_codecs()
+    if encoding not in codecs:
+        raise ValueError(f"encoding {encoding!r} is not available; have {available_encodings()}")
+    return codecs[encoding][1](data)
+
+
+class CompressionPolicy:
+    # When and how ApiClient compresses request bodies.
+    #
+    # - Bodies of at least `min_size` bytes are sent with
+    #   Content-Encoding: `encoding` ("auto" picks zstd, br, then gzip,
+    #   whichever is installed). Smaller bodies go out as plain JSON.
+    # - Every request advertises Accept-Encoding for the decodable
+    #   encodings (unless the caller set the header), so merchants can
+    #   compress large responses.
+    # - A merchant that answers 415 to a compressed body gets the same
+    #   attempt resent uncompressed, and its host is remembered so later
+    #   calls skip compression. The policy can be shared between clients.
+
+    def __init__(
+        self,
+        encoding: str = "gzip",
+        min_size: int = 1024,
+        level: int = 6,
+        accept_encoding: bool = True,
+    ) -> None:
+        if encoding != "auto" and encoding not in PREFERRED:
+            raise ValueError(f"encoding must be 'auto' or one of {PREFERRED}")
+        self.encoding = encoding
+        self.min_size = min_size
+        self.level = level
+        self.accept_encoding = accept_encoding
+        self._lock = threading.Lock()
+        self._rejected: Set[str] = set()
+
+        self.compressed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.fallbacks = 0
+
+    def resolve(self) -> Optional[str]:
+        available = available_encodings()
+        if self.encoding == "auto":
+            return available[0] if available else None
+        return self.encoding if self.encoding in available else None
+
+    def rejects(self, key: str) -> bool:
+        return key in self._rejected
+
+    def reject(self, key: str) -> None:
+        with self._lock:
+            self._rejected.add(key)
+            self.fallbacks += 1
+
+    def prepare(
+        self,
+        key: str,
+        headers: Optional[Dict[str, str]],
+        data: Optional[bytes],
+    ) -> Tuple[Optional[Dict[str, str]], Optional[bytes], Optional[str]]:
+        # Returns (headers, body, content encoding or None). Never mutates
+        # the caller's headers.
+        send_headers = headers
+        if self.accept_encoding and header_value(headers, "Accept-Encoding") is None:
+            send_headers = dict(headers or {})
+            send_headers["Accept-Encoding"] = ", ".join(available_encodings())
+
+        encoding = self.resolve()
+        if (
+            data is None
+            or encoding is None
+            or len(data) < self.min_size
+            or key in self._rejected
+            or header_value(headers, "Content-Encoding") is not None
+        ):
+            return send_headers, data, None
+
+        packed = compress(data, encoding, self.level)
+        if len(packed) >= len(data):
+            return send_headers, data, None
+        send_headers = dict(send_headers or {})
+        send_headers["Content-Encoding"] = encoding
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(packed)
+        return send_headers, packed, encoding
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "compressed": self.compressed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "fallbacks": self.fallbacks,
+        }
+
+
+def encodings_from(header: Optional[str]) -> Iterable[str]:
+    # "gzip, br;q=0.8" -> ["gzip", "br"]
+    if not header:
+        return []
+    return [part.split(";", 1)[0].strip().lower() for part in header.split(",") if part.strip()]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+
+class Deadline:
+    # Absolute point in time by which a whole operation must finish.
+    #
+    # Unlike a per-attempt timeout, a Deadline is shared by every attempt,
+    # backoff pause and nested call made on behalf of one user action:
+    #
+    #     deadline = Deadline.after(2.0)
+    #     client.post("/merchant/connect", payload=..., deadline=deadline)
+    #     client.get("/merchant/status", deadline=deadline)
+    #
+    # Nested calls can reserve time for the caller with `shrink()`.
+
+    __slots__ = ("expires_at", "_clock")
+
+    def __init__(self, expires_at: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.expires_at = expires_at
+        self._clock = clock
+
+    @classmethod
+    def after(cls, seconds: float, clock: Callable[[], float] = time.monotonic) -> "Deadline":
+        return cls(clock() + seconds, clock)
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - self._clock())
+
+    def cap(self, timeout: float) -> float:
+        # Shrinks a timeout so it does not outlive the deadline.
+        return min(timeout, self.remaining())
+
+    def shrink(self, reserve: float) -> "Deadline":
+        # Child deadline that leaves `reserve` seconds for the caller.
+        return Deadline(self.expires_at - reserve, self._clock)
+
+    @staticmethod
+    def earliest(*deadlines: Optional["Deadline"]) -> Optional["Deadline"]:
+        present = [d for d in deadlines if d is not None]
+        if not present:
+            return None
+        return min(present, key=lambda d: d.expires_at)
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f}s)"
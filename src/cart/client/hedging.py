@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Optional
+
+from cart.client.response import ApiResponse
+from cart.client.retry_policy import RetryBudget
+
+
+class _LatencyWindow:
+    # Recent latencies of one endpoint. Small windows are re-sorted on
+    # every sample; larger ones every `refresh_every` samples.
+
+    __slots__ = ("samples", "percentile", "cached", "since_refresh", "refresh_every")
+
+    def __init__(self, size: int, percentile: float, refresh_every: int = 16) -> None:
+        self.samples: Deque[float] = deque(maxlen=size)
+        self.percentile = percentile
+        self.cached: Optional[float] = None
+        self.since_refresh = 0
+        self.refresh_every = refresh_every
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.since_refresh += 1
+        if len(self.samples) <= 4 * self.refresh_every or self.since_refresh >= self.refresh_every:
+            ordered = sorted(self.samples)
+            self.cached = ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+            self.since_refresh = 0
+
+
+class HedgingPolicy:
+    # Opt-in request hedging for idempotent calls (GETs and POSTs that
+    # carry an Idempotency-Key).
+    #
+    # If an attempt has not answered after the hedge delay, a second
+    # identical attempt is sent and the first good response wins; the
+    # other one is dropped when it arrives. The delay is either fixed
+    # (`delay`) or the endpoint's observed `percentile` latency once
+    # `min_samples` calls have been seen.
+    #
+    # Hedges draw from a token bucket refilled by `budget_ratio` per call,
+    # so at most that share of extra load is ever added.
+    #
+    # Primaries and hedges run on two pools of `max_workers` threads each,
+    # so the thread count stays bounded under load. Neither ever queues:
+    # when the primary pool is full the attempt runs on the caller's
+    # thread without a hedge, and when the hedge pool is full the hedge is
+    # denied. The hedge delay thus counts from when the primary goes out.
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        window: int = 200,
+        budget_ratio: float = 0.1,
+        budget_min_tokens: float = 5.0,
+        max_workers: int = 32,
+    ) -> None:
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.budget = RetryBudget(ratio=budget_ratio, min_tokens=budget_min_tokens)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api-hedge")
+        self._primaries = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api-hedge-primary")
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, _LatencyWindow] = {}
+        self._hedges_running = 0
+        self._primaries_running = 0
+
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self.hedges_denied = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "hedges_denied": self.hedges_denied,
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self._primaries.shutdown(wait=False)
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        if self.delay is not None:
+            return self.delay
+        window = self._latencies.get(endpoint)
+        if window is None or len(window.samples) < self.min_samples:
+            return None
+        return window.cached
+
+    def record_latency(self, endpoint: str, seconds: float) -> None:
+        with self._lock:
+            window = self._latencies.get(endpoint)
+            if window is None:
+                window = self._latencies[endpoint] = _LatencyWindow(self.window, self.percentile)
+            window.add(seconds)
+
+    def execute(
+        self,
+        endpoint: str,
+        send: Callable[[], ApiResponse],
+        is_good: Callable[[ApiResponse], bool],
+        admit: Optional[Callable[[], bool]] = None,
+    ) -> ApiResponse:
+        # `send` performs one attempt and raises on network errors.
+        # `admit` is asked last before a hedge goes out (ApiClient takes a
+        # rate-limiter token there); False denies the hedge.
+        self.budget.deposit()
+        delay = self.hedge_delay(endpoint)
+        started = time.monotonic()
+
+        if delay is None or not self._reserve_primary():
+            resp = send()
+            self.record_latency(endpoint, time.monotonic() - started)
+            return resp
+
+        primary = self._primaries.submit(self._run_primary, send)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._admit_hedge(admit):
+            resp = primary.result()
+            self.record_latency(endpoint, time.monotonic() - started)
+            return resp
+
+        hedge = self._executor.submit(self._run_hedge, send)
+
+        pending = {primary, hedge}
+        fallback: Optional[Future] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and is_good(future.result()):
+                    if future is hedge:
+                        with self._lock:
+                            self.hedges_won += 1
+                    self.record_latency(endpoint, time.monotonic() - started)
+                    for loser in pending:
+                        loser.add_done_callback(_discard)
+                    return future.result()
+                if fallback is None:
+                    fallback = future
+
+        return fallback.result()
+
+    def _reserve_primary(self) -> bool:
+        with self._lock:
+            if self._primaries_running >= self.max_workers:
+                return False
+            self._primaries_running += 1
+            return True
+
+    def _run_primary(self, send: Callable[[], ApiResponse]) -> ApiResponse:
+        try:
+            return send()
+        finally:
+            with self._lock:
+                self._primaries_running -= 1
+
+    def _admit_hedge(self, admit: Optional[Callable[[], bool]]) -> bool:
+        with self._lock:
+            if self._hedges_running >= self.max_workers or not self.budget.withdraw():
+                self.hedges_denied += 1
+                return False
+            self._hedges_running += 1
+        if admit is not None and not admit():
+            with self._lock:
+                self._hedges_running -= 1
+                self.hedges_denied += 1
+            return False
+        with self._lock:
+            self.hedges_sent += 1
+        return True
+
+    def _run_hedge(self, send: Callable[[], ApiResponse]) -> ApiResponse:
+        try:
+            return send()
+        finally:
+            with self._lock:
+                self._hedges_running -= 1
+
+
+def _discard(future: Future) -> None:
+    # Release the connection of an attempt that lost the race.
+    if future.exception() is None:
+        future.result().close()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from typing import Mapping, Optional
+
+# Small URL and header helpers shared by the client, its policies and the
+# probe scheduler. Kept free of imports so that every module can use them.
+
+
+def host_key(url: str) -> str:
+    # scheme://host[:port] of a URL or base URL, as used to key per-merchant
+    # state (circuits, buckets, compression support, probe hosts).
+    scheme, _, rest = url.partition("://")
+    return f"{scheme}://{rest.split('/', 1)[0]}"
+
+
+def header_value(headers: Optional[Mapping[str, str]], name: str) -> Optional[str]:
+    # Case-insensitive lookup in a plain dict of headers; the exact
+    # spelling is tried first since callers mostly use canonical names.
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is not None:
+        return value
+    lower = name.lower()
+    for key, value in headers.items():
+        if key.lower() == lower:
+            return value
+    return None
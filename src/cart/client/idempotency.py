@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import hashlib
+import json as json_lib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from cart.client.response import ApiResponse, clone_response, error_response
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def body_fingerprint(method: str, body: Any) -> str:
+    # Stable hash of the request; key order in JSON bodies does not matter.
+    canonical = json_lib.dumps(body, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{method.upper()}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "response", "expires_at", "done")
+
+    def __init__(self, fingerprint: str, expires_at: float) -> None:
+        self.fingerprint = fingerprint
+        self.response: Optional[ApiResponse] = None
+        self.expires_at = expires_at
+        self.done = threading.Event()
+
+
+class IdempotencyStore:
+    # In-process replay cache for requests carrying an Idempotency-Key.
+    #
+    # - A completed response is replayed locally for `ttl` seconds.
+    # - A concurrent duplicate waits for the in-flight original and gets
+    #   its result instead of sending a second request.
+    # - Reusing a key with a different body returns a controlled 422
+    #   {"error": "idempotency_key_reused"} without touching the network.
+    #
+    # Only final answers are kept: 5xx, 429 and the local 504 fallback
+    # are handed to waiting duplicates but then forgotten, so a later
+    # retry with the same key still reaches the merchant.
+    # At most `max_entries` keys are kept (least recently used evicted).
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+
+        self.replays = 0
+        self.coalesced = 0
+        self.conflicts = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def execute(
+        self,
+        scope: str,
+        key: str,
+        fingerprint: str,
+        send: Callable[[], ApiResponse],
+    ) -> ApiResponse:
+        cache_key = (scope, key)
+        now = self._clock()
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry.done.is_set() and entry.expires_at <= now:
+                del self._entries[cache_key]
+                entry = None
+
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                if entry.fingerprint != fingerprint:
+                    self.conflicts += 1
+                    return error_response(422, "idempotency_key_reused")
+                if entry.done.is_set():
+                    self.replays += 1
+                    return clone_response(entry.response)
+                self.coalesced += 1
+                leader = False
+            else:
+                entry = _Entry(fingerprint, now + self.ttl)
+                self._entries[cache_key] = entry
+                self._evict()
+                leader = True
+
+        if not leader:
+            entry.done.wait()
+            return clone_response(entry.response)
+
+        try:
+            response = send()
+        except BaseException:
+            with self._lock:
+                self._forget(cache_key, entry)
+            entry.response = error_response(504, "timeout")
+            entry.done.set()
+            raise
+
+        entry.response = response
+        if not _is_final(response):
+            with self._lock:
+                self._forget(cache_key, entry)
+        entry.expires_at = self._clock() + self.ttl
+        entry.done.set()
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _forget(self, cache_key: Tuple[str, str], entry: _Entry) -> None:
+        if self._entries.get(cache_key) is entry:
+            del self._entries[cache_key]
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _is_final(response: ApiResponse) -> bool:
+    return response.status_code < 500 and response.status_code != 429
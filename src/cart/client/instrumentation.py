@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from cart.client.response import ApiResponse
+
+# Events emitted by ApiClient for every upstream call (one _send, i.e.
+# cache hits and idempotency replays are not upstream calls):
+# - request:  the call starts
+# - attempt:  one transport attempt finished (or raised)
+# - retry:    another attempt follows after `delay` seconds
+# - fallback: a controlled response was synthesized locally
+#             (`reason`: timeout, circuit_open, rate_limited, deadline_exceeded)
+# - response: the call returns to the caller
+REQUEST = "request"
+ATTEMPT = "attempt"
+RETRY = "retry"
+FALLBACK = "fallback"
+RESPONSE = "response"
+EVENTS = (REQUEST, ATTEMPT, RETRY, FALLBACK, RESPONSE)
+
+Listener = Callable[["RequestEvent"], None]
+
+
+class RequestEvent:
+    # One instrumentation event. Only built when a listener is attached.
+    #
+    # - attempt: zero-based attempt index (attempts made, on "response")
+    # - status_code: 0 when the attempt raised instead of answering
+    # - elapsed: seconds for the attempt ("attempt") or the whole call
+    #   ("response", "fallback")
+    # - ttfb: time to the response headers, when the transport measured it
+    # - delay: backoff before the next attempt ("retry")
+    # - reason: fallback reason; also set on the "response" it produced
+
+    __slots__ = (
+        "name",
+        "method",
+        "url",
+        "endpoint",
+        "attempt",
+        "status_code",
+        "elapsed",
+        "ttfb",
+        "delay",
+        "reason",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        endpoint: str,
+        attempt: int = 0,
+        status_code: int = 0,
+        elapsed: Optional[float] = None,
+        ttfb: Optional[float] = None,
+        delay: float = 0.0,
+        reason: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        self.attempt = attempt
+        self.status_code = status_code
+        self.elapsed = elapsed
+        self.ttfb = ttfb
+        self.delay = delay
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"<RequestEvent {self.name} {self.method} {self.endpoint} [{self.status_code}]>"
+
+
+class Instrumentation:
+    # Event bus for ApiClient hooks. One bus can be shared by many clients
+    # and threads.
+    #
+    # ApiClient checks `active` once per call; with no listener attached
+    # no event objects are built and no clocks are read. Listeners run
+    # synchronously on the calling thread, so keep them cheap. A listener
+    # that raises is counted in `listener_errors` and never breaks the
+    # request.
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._listeners: Dict[str, Tuple[Listener, ...]] = {name: () for name in EVENTS}
+        self.active = False
+        self.listener_errors = 0
+
+    def subscribe(self, listener: Listener, events: Optional[Iterable[str]] = None) -> Listener:
+        names = tuple(events) if events is not None else EVENTS
+        unknown = set(names) - set(EVENTS)
+        if unknown:
+            raise ValueError(f"unknown events: {sorted(unknown)}")
+        with self._lock:
+            for name in names:
+                if listener not in self._listeners[name]:
+                    self._listeners[name] += (listener,)
+            self.active = any(self._listeners.values())
+        return listener
+
+    def unsubscribe(self, listener: Listener) -> None:
+        with self._lock:
+            for name, listeners in self._listeners.items():
+                self._listeners[name] = tuple(fn for fn in listeners if fn is not listener)
+            self.active = any(self._listeners.values())
+
+    def emit(self, event: RequestEvent) -> None:
+        for listener in self._listeners[event.name]:
+            try:
+                listener(event)
+            except Exception:
+                self.listener_errors += 1
+
+
+class CallTrace:
+    # Emits the events of one upstream call; ApiClient only builds one
+    # when the bus has listeners.
+
+    __slots__ = ("bus", "method", "url", "endpoint", "started", "attempts", "reason")
+
+    def __init__(self, bus: Instrumentation, method: str, url: str) -> None:
+        self.bus = bus
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_template(url)
+        self.started = time.perf_counter()
+        self.attempts = 0
+        self.reason: Optional[str] = None
+        bus.emit(RequestEvent(REQUEST, method, url, self.endpoint))
+
+    def attempt(self, attempt: int, resp: Optional["ApiResponse"], elapsed: float) -> None:
+        self.attempts = attempt + 1
+        self.bus.emit(
+            RequestEvent(
+                ATTEMPT,
+                self.method,
+                self.url,
+                self.endpoint,
+                attempt=attempt,
+                status_code=resp.status_code if resp is not None else 0,
+                elapsed=elapsed,
+                ttfb=resp.elapsed if resp is not None else None,
+                reason=None if resp is not None else "error",
+            )
+        )
+
+    def retry(self, attempt: int, resp: Optional["ApiResponse"], delay: float) -> None:
+        self.bus.emit(
+            RequestEvent(
+                RETRY,
+                self.method,
+                self.url,
+                self.endpoint,
+                attempt=attempt,
+                status_code=resp.status_code if resp is not None else 0,
+                delay=delay,
+            )
+        )
+
+    def fallback(self, resp: "ApiResponse", reason: str) -> "ApiResponse":
+        self.reason = reason
+        self.bus.emit(
+            RequestEvent(
+                FALLBACK,
+                self.method,
+                self.url,
+                self.endpoint,
+                attempt=self.attempts,
+                status_code=resp.status_code,
+                elapsed=time.perf_counter() - self.started,
+                reason=reason,
+            )
+        )
+        return resp
+
+    def finish(self, resp: "ApiResponse") -> "ApiResponse":
+        self.bus.emit(
+            RequestEvent(
+                RESPONSE,
+                self.method,
+                self.url,
+                self.endpoint,
+                attempt=self.attempts,
+                status_code=resp.status_code,
+                elapsed=time.perf_counter() - self.started,
+                ttfb=resp.elapsed,
+                reason=self.reason,
+            )
+        )
+        return resp
+
+
+# Process-wide bus used by every ApiClient created without its own
+# `instrumentation` (test plugins and ad-hoc probes subscribe here).
+DEFAULT_INSTRUMENTATION = Instrumentation()
+
+
+# Path segments that identify one resource rather than an endpoint.
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,})$")
+
+
+def endpoint_template(url: str) -> str:
+    # "/merchant/123/status?x=1" -> "/merchant/{id}/status", so metrics
+    # stay bounded per endpoint rather than growing per resource.
+    path = urlsplit(url).path or "/"
+    return "/".join("{id}" if _ID_SEGMENT.match(part) else part for part in path.split("/"))
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import json as json_lib
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from cart.client.idempotency import IDEMPOTENCY_HEADER
+from cart.client.response import ApiResponse, Headers, clone_response, error_response
+
+if TYPE_CHECKING:
+    from cart.client.api_client import ApiClient
+
+# Bulk wire format (the local simulator implements it on /card-switch/bulk):
+#   request   {"items": [{"idempotencyKey": "k1", "cardId": "..."}, ...]}
+#   response  {"results": [{"idempotencyKey": "k1", "status": 200, "body": {...}}, ...]}
+ITEM_KEY_FIELD = "idempotencyKey"
+
+
+class _Item:
+    __slots__ = ("key", "payload", "future")
+
+    def __init__(self, key: str, payload: Dict[str, Any], future: "Future[ApiResponse]") -> None:
+        self.key = key
+        self.payload = payload
+        self.future = future
+
+
+class MicroBatcher:
+    # Coalesces single-item POSTs (card switches) into bulk requests.
+    #
+    # submit() queues one item under its own Idempotency-Key and returns a
+    # Future that resolves to that item's ApiResponse. A batch is sent
+    # when `max_batch_size` items are queued or the oldest has waited
+    # `max_delay` seconds; at most `max_in_flight` batches run at once.
+    #
+    # Each batch is one ApiClient.post, so retries, deadlines, breakers
+    # and the 504 fallback apply per batch. The batch Idempotency-Key is
+    # derived from its item keys, so a retried batch is a replay, not a
+    # second switch. Per-item results are split back out: a batch that
+    # fails as a whole (504, 429, 5xx) resolves every item with a copy of
+    # that response; an item missing from a bulk reply gets a local 502
+    # {"error": "missing_bulk_result"}.
+    #
+    # Submitting a key that is already queued returns the queued Future.
+    # At most `max_pending` items wait at once; submit() blocks beyond
+    # that so bulk migrations cannot queue unbounded memory.
+
+    def __init__(
+        self,
+        client: "ApiClient",
+        path: str = "/card-switch/bulk",
+        max_batch_size: int = 100,
+        max_delay: float = 0.05,
+        max_in_flight: int = 4,
+        max_pending: int = 10000,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.client = client
+        self.path = path
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.headers = dict(headers or {})
+
+        self._cond = threading.Condition()
+        self._queue: List[_Item] = []
+        self._queued: Dict[str, _Item] = {}
+        self._oldest = 0.0
+        self._closed = False
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="api-batch")
+        self._flusher = threading.Thread(target=self._run, name="api-batch-flusher", daemon=True)
+        self._flusher.start()
+
+        self.batches = 0
+        self.items = 0
+        self.item_failures = 0
+
+    def submit(self, payload: Dict[str, Any], idempotency_key: Optional[str] = None) -> "Future[ApiResponse]":
+        key = idempotency_key or str(uuid.uuid4())
+        with self._cond:
+            queued = self._queued.get(key)
+            if queued is not None:
+                return queued.future
+        self._pending.acquire()
+        with self._cond:
+            if self._closed:
+                self._pending.release()
+                raise RuntimeError("batcher is closed")
+            queued = self._queued.get(key)
+            if queued is not None:
+                self._pending.release()
+                return queued.future
+            item = _Item(key, payload, Future())
+            first = not self._queue
+            if first:
+                self._oldest = time.monotonic()
+            self._queue.append(item)
+            self._queued[key] = item
+            if first or len(self._queue) >= self.max_batch_size:
+                self._cond.notify()
+        return item.future
+
+    def flush(self) -> None:
+        # Sends everything queued now, without waiting for the results.
+        with self._cond:
+            batches = self._take(force=True)
+        for batch in batches:
+            self._dispatch(batch)
+
+    def close(self) -> None:
+        # Sends what is queued and waits for every batch to finish.
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._flusher.join()
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "MicroBatcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _take(self, force: bool = False) -> List[List[_Item]]:
+        # Caller holds the condition.
+        batches = []
+        while len(self._queue) >= self.max_batch_size:
+            batches.append(self._queue[: self.max_batch_size])
+            del self._queue[: self.max_batch_size]
+        if self._queue and (force or time.monotonic() - self._oldest >= self.max_delay):
+            batches.append(self._queue)
+            self._queue = []
+        for batch in batches:
+            for item in batch:
+                del self._queued[item.key]
+        if self._queue and batches:
+            self._oldest = time.monotonic()
+        return batches
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                if self._queue and len(self._queue) < self.max_batch_size:
+                    self._cond.wait(max(0.0, self._oldest + self.max_delay - time.monotonic()))
+                elif not self._queue:
+                    self._cond.wait()
+                batches = self._take()
+            for batch in batches:
+                self._dispatch(batch)
+
+    def _dispatch(self, batch: List[_Item]) -> None:
+        self._executor.submit(self._send, batch)
+
+    def _send(self, batch: List[_Item]) -> None:
+        try:
+            headers = dict(self.headers)
+            headers[IDEMPOTENCY_HEADER] = batch_key(item.key for item in batch)
+            body = {"items": [{ITEM_KEY_FIELD: item.key, **item.payload} for item in batch]}
+            resp = self.client.post(self.path, headers=headers, json=body)
+            results = split_results(resp, [item.key for item in batch])
+            failures = 0
+            for item, result in zip(batch, results):
+                if result.status_code >= 400:
+                    failures += 1
+                item.future.set_result(result)
+            with self._cond:
+                self.batches += 1
+                self.items += len(batch)
+                self.item_failures += failures
+        except BaseException as exc:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+        finally:
+            for _ in batch:
+                self._pending.release()
+
+
+def batch_key(item_keys: Any) -> str:
+    # Same items -> same batch key, so retries of a batch are replays.
+    digest = hashlib.sha256("\n".join(item_keys).encode("utf-8")).hexdigest()
+    return f"batch-{digest[:32]}"
+
+
+def split_results(resp: ApiResponse, keys: List[str]) -> List[ApiResponse]:
+    # One ApiResponse per item key, in `keys` order.
+    if resp.status_code >= 300:
+        return [clone_response(resp) for _ in keys]
+    try:
+        results = resp.json().get("results")
+    except (ValueError, AttributeError):
+        results = None
+    if not isinstance(results, list):
+        return [error_response(502, "invalid_bulk_response") for _ in keys]
+
+    by_key: Dict[str, Tuple[int, Any]] = {}
+    for result in results:
+        if isinstance(result, dict) and ITEM_KEY_FIELD in result:
+            by_key[result[ITEM_KEY_FIELD]] = (int(result.get("status", 200)), result.get("body"))
+
+    responses = []
+    for key in keys:
+        found = by_key.get(key)
+        if found is None:
+            responses.append(error_response(502, "missing_bulk_result"))
+            continue
+        status, body = found
+        responses.append(
+            ApiResponse(
+                status,
+                Headers({"Content-Type": "application/json", IDEMPOTENCY_HEADER: key}),
+                json_lib.dumps(body).encode("utf-8"),
+                url=resp.url,
+                elapsed=resp.elapsed,
+            )
+        )
+    return responses
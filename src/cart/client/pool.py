@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+
+
+class ConnectionPool:
+    # Keep-alive connection pool shared by every call of an ApiClient.
+    #
+    # Wraps a requests.Session so that TCP connections and TLS sessions
+    # to a merchant host are reused across calls and retries instead of
+    # being re-established for every attempt.
+    #
+    # - pool_connections: number of per-host pools kept (least recently used
+    #   host pools are closed once the limit is reached)
+    # - pool_maxsize: keep-alive connections kept per host
+    # - max_connections: cap on connections in use at once across all hosts
+    # - idle_timeout: host pools unused for this many seconds are closed
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_connections: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        pool_block: bool = False,
+    ) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+
+        self._adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+
+        self._slots = threading.BoundedSemaphore(max_connections) if max_connections else None
+        self._lock = threading.Lock()
+        self._last_used: Dict[Tuple[str, str, int], float] = {}
+        self._last_sweep = time.monotonic()
+        self._closed = False
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def request(self, method: str, url: str, **kwargs: Any) -> Response:
+        if self._closed:
+            raise RuntimeError("connection pool is closed")
+
+        self._touch(_pool_key(url))
+
+        if self._slots is None:
+            return self._session.request(method=method, url=url, **kwargs)
+
+        with self._slots:
+            return self._session.request(method=method, url=url, **kwargs)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        # Close keep-alive connections of hosts that have been idle for
+        # longer than idle_timeout. Returns the number of hosts evicted.
+        if not self.idle_timeout:
+            return 0
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._last_sweep = now
+            idle = {k for k, ts in self._last_used.items() if now - ts > self.idle_timeout}
+            for key in idle:
+                del self._last_used[key]
+
+        if not idle:
+            return 0
+
+        # Removing a pool from the manager's container closes its sockets.
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            scheme = key.key_scheme
+            port = key.key_port or _DEFAULT_PORTS.get(scheme, 0)
+            if (scheme, key.key_host, port) in idle:
+                try:
+                    del pools[key]
+                except KeyError:
+                    pass
+        return len(idle)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._session.close()
+        with self._lock:
+            self._last_used.clear()
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _touch(self, key: Tuple[str, str, int]) -> None:
+        now = time.monotonic()
+        # Sweeping is cheap but not free; do it at most twice per idle window.
+        if self.idle_timeout and now - self._last_sweep > self.idle_timeout / 2:
+            self.evict_idle(now)
+        with self._lock:
+            self._last_used[key] = now
+
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _pool_key(url: str) -> Tuple[str, str, int]:
+    # Lightweight (scheme, host, port) extraction; avoids urlparse on the hot path.
+    scheme, _, rest = url.partition("://")
+    scheme = scheme.lower()
+    netloc = rest.split("/", 1)[0].split("?", 1)[0].rsplit("@", 1)[-1].lower()
+    host, sep, port = netloc.rpartition(":")
+    if not sep or not port.isdigit():
+        return scheme, netloc.strip("[]"), _DEFAULT_PORTS.get(scheme, 0)
+    return scheme, host.strip("[]"), int(port)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from cart.client.http_utils import host_key
+
+WAIT = "wait"
+FAIL_FAST = "fail"
+
+
+class _Bucket:
+    __slots__ = ("rate", "tokens", "updated", "paused_until", "throttled")
+
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.tokens = burst
+        self.updated = now
+        self.paused_until = 0.0
+        self.throttled = 0
+
+
+class RateLimiter:
+    # Client-side token-bucket rate limiter keyed per merchant.
+    #
+    # One limiter can be shared by any number of threads and ApiClients
+    # so they respect one merchant quota together. Buckets are keyed by
+    # host (scheme://host:port) or by the full base URL.
+    #
+    # - `rate` tokens/second refill up to `burst`; each attempt takes one.
+    # - on_limit="wait" queues the caller for up to `max_wait` seconds;
+    #   on_limit="fail" rejects at once. Rejected calls get a local 429.
+    # - adaptive=True applies AIMD: a 429 multiplies the rate by
+    #   `decrease` (never below `min_rate`) and pauses the bucket for any
+    #   Retry-After; every success adds about `increase` req/s per second
+    #   back, up to `max_rate` (default: the configured rate).
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        on_limit: str = WAIT,
+        max_wait: float = 5.0,
+        adaptive: bool = False,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        key: str = "host",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if on_limit not in (WAIT, FAIL_FAST):
+            raise ValueError("on_limit must be 'wait' or 'fail'")
+        if key not in ("host", "base_url"):
+            raise ValueError("key must be 'host' or 'base_url'")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self.on_limit = on_limit
+        self.max_wait = max_wait
+        self.adaptive = adaptive
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.increase = increase
+        self.decrease = decrease
+        self.key = key
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def key_for(self, base_url: str) -> str:
+        if self.key == "base_url":
+            return base_url
+        return host_key(base_url)
+
+    def reserve(self, key: str, max_wait: Optional[float] = None) -> Optional[float]:
+        # Takes a token and returns how long the caller must wait before
+        # using it, or None when the call should be rejected instead.
+        limit = self.max_wait if max_wait is None else min(max_wait, self.max_wait)
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(key, now)
+            self._refill(bucket, now)
+
+            wait = max(0.0, bucket.paused_until - now)
+            if bucket.tokens < 1.0:
+                wait = max(wait, (1.0 - bucket.tokens) / bucket.rate)
+
+            if wait > 0 and (self.on_limit == FAIL_FAST or wait > limit):
+                bucket.throttled += 1
+                return None
+
+            bucket.tokens -= 1.0
+            return wait
+
+    def acquire(self, key: str, max_wait: Optional[float] = None) -> bool:
+        wait = self.reserve(key, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            time.sleep(wait)
+        return True
+
+    def release(self, key: str) -> None:
+        # Returns the token of an attempt that never reached the merchant.
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(key, now)
+            self._refill(bucket, now)
+            bucket.tokens = min(self.burst, bucket.tokens + 1.0)
+
+    def on_response(self, key: str, status_code: int, retry_after: Optional[float] = None) -> None:
+        if not self.adaptive:
+            return
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(key, now)
+            self._refill(bucket, now)
+            if status_code == 429:
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                bucket.tokens = min(bucket.tokens, 0.0)
+                if retry_after:
+                    bucket.paused_until = max(bucket.paused_until, now + retry_after)
+            elif status_code < 500:
+                bucket.rate = min(self.max_rate, bucket.rate + self.increase / max(bucket.rate, 1.0))
+
+    def current_rate(self, key: str) -> float:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            return bucket.rate if bucket is not None else self.rate
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                key: {"rate": b.rate, "tokens": b.tokens, "throttled": b.throttled}
+                for key, b in self._buckets.items()
+            }
+
+    def _bucket(self, key: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(self.rate, self.burst, now)
+        return bucket
+
+    def _refill(self, bucket: _Bucket, now: float) -> None:
+        # No tokens accrue while the merchant asked us to pause.
+        start = max(bucket.updated, bucket.paused_until)
+        if now > start:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - start) * bucket.rate)
+        bucket.updated = max(bucket.updated, now)
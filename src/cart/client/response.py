@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import json as json_lib
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Mapping, MutableMapping, Optional, Tuple
+
+from cart.client.streaming import is_ndjson, iter_json_array, iter_ndjson
+
+if TYPE_CHECKING:
+    from cart.client.deadline import Deadline
+
+
+class Headers(MutableMapping):
+    # Small case-insensitive header mapping that keeps the original
+    # spelling of each name. Avoids pulling in requests or urllib3 just
+    # to build a local response.
+
+    __slots__ = ("_store",)
+
+    def __init__(self, data: Optional[Mapping[str, str]] = None) -> None:
+        self._store: Dict[str, Tuple[str, str]] = {}
+        if data:
+            for name, value in data.items():
+                self[name] = value
+
+    def __getitem__(self, name: str) -> str:
+        return self._store[name.lower()][1]
+
+    def __setitem__(self, name: str, value: str) -> None:
+        self._store[name.lower()] = (name, value)
+
+    def __delitem__(self, name: str) -> None:
+        del self._store[name.lower()]
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name, _ in self._store.values())
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self._store
+
+    def copy(self) -> "Headers":
+        clone = Headers()
+        clone._store = dict(self._store)
+        return clone
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+_UNSET = object()
+
+
+class ApiResponse:
+    # Compact response returned by ApiClient and AsyncApiClient.
+    #
+    # Keeps the surface callers use on a requests.Response (status_code,
+    # headers, content, text, json(), ok, raise_for_status()) with less
+    # per-object overhead:
+    # - __slots__ instead of a per-instance __dict__
+    # - json() parses the body once and returns the same object after
+    #   that; treat it as read-only or copy it before mutating
+    # - `body` gives zero-copy memoryview access to the raw bytes
+    # - `elapsed` is the time to the response headers (time to first
+    #   byte) in seconds, when the transport measured it
+    # - iter_bytes(), iter_items() and `with` work as on a
+    #   StreamedResponse, so streaming callers also handle the locally
+    #   built 504s
+
+    __slots__ = ("status_code", "headers", "_content", "url", "reason", "_json", "elapsed")
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Optional[MutableMapping[str, str]] = None,
+        content: bytes = b"",
+        url: Optional[str] = None,
+        reason: Optional[str] = None,
+        elapsed: Optional[float] = None,
+    ) -> None:
+        self.status_code = status_code
+        self.headers = headers if headers is not None else Headers()
+        self._content = content
+        self.url = url
+        self.reason = reason
+        self._json: Any = _UNSET
+        self.elapsed = elapsed
+
+    @classmethod
+    def from_requests(cls, resp: Any) -> "ApiResponse":
+        elapsed = getattr(resp, "elapsed", None)
+        return cls(
+            resp.status_code,
+            resp.headers,
+            resp.content,
+            url=resp.url,
+            reason=resp.reason,
+            elapsed=elapsed.total_seconds() if elapsed is not None else None,
+        )
+
+    @property
+    def content(self) -> bytes:
+        return self._content
+
+    @property
+    def body(self) -> memoryview:
+        return memoryview(self._content)
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self._content.decode(self._charset(), errors="replace")
+
+    def json(self, **kwargs: Any) -> Any:
+        if kwargs:
+            return json_lib.loads(self._content, **kwargs)
+        if self._json is _UNSET:
+            self._json = json_lib.loads(self._content)
+        return self._json
+
+    def iter_bytes(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        content = self._content
+        for start in range(0, len(content), chunk_size):
+            yield content[start : start + chunk_size]
+
+    def iter_items(self, key: Optional[str] = None, chunk_size: int = 65536) -> Iterator[Any]:
+        # NDJSON bodies (by Content-Type) yield one record per line; JSON
+        # bodies yield the items of the top-level array, or of the array
+        # under `key`.
+        chunks = self.iter_bytes(chunk_size)
+        if is_ndjson(self.headers.get("Content-Type")):
+            return iter_ndjson(chunks)
+        return iter_json_array(chunks, key)
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise HTTPStatusError(self)
+
+    def copy(self) -> "ApiResponse":
+        # Shares the body bytes; headers and the parsed JSON are not shared.
+        return ApiResponse(
+            self.status_code, self.headers.copy(), self._content, self.url, self.reason, self.elapsed
+        )
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "ApiResponse":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _charset(self) -> str:
+        content_type = self.headers.get("Content-Type") or ""
+        _, _, charset = content_type.partition("charset=")
+        return charset.split(";", 1)[0].strip().strip('"') or "utf-8"
+
+    def __repr__(self) -> str:
+        return f"<ApiResponse [{self.status_code}]>"
+
+
+class StreamedResponse(ApiResponse):
+    # ApiResponse whose body is read on demand; returned by get() and
+    # post() with stream=True. Status and headers are available at once
+    # and the connection stays checked out until the body is consumed or
+    # the response is closed (use it as a context manager when stopping
+    # early).
+    #
+    # - iter_bytes() yields the body as it arrives; iter_items() yields
+    #   JSON array or NDJSON records from it (see cart.client.streaming)
+    # - content, text and json() read what is left into memory
+    # - the body can be consumed once
+    #
+    # A stall or connection error while reading raises StreamInterrupted
+    # carrying the controlled 504 {"error": "timeout"} the buffered path
+    # would have returned; each read is bounded by the attempt timeout.
+    # Past `deadline` (checked between chunks) it carries a 504
+    # {"error": "deadline_exceeded"} instead.
+
+    __slots__ = ("_reader", "_release", "_state", "deadline")
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Optional[MutableMapping[str, str]],
+        reader: Callable[[int], Iterator[bytes]],
+        release: Callable[[], None],
+        url: Optional[str] = None,
+        reason: Optional[str] = None,
+        elapsed: Optional[float] = None,
+    ) -> None:
+        super().__init__(status_code, headers, b"", url, reason, elapsed)
+        self._reader = reader
+        self._release: Optional[Callable[[], None]] = release
+        self._state = "pending"
+        self.deadline: Optional["Deadline"] = None
+
+    @classmethod
+    def buffered(cls, resp: ApiResponse) -> "StreamedResponse":
+        # Wraps an already-read response, for transports that cannot stream.
+        return cls(
+            resp.status_code,
+            resp.headers,
+            resp.iter_bytes,
+            resp.close,
+            url=resp.url,
+            reason=resp.reason,
+            elapsed=resp.elapsed,
+        )
+
+    def iter_bytes(self, chunk_size: int = 65536) -> Iterator[bytes]:
+        if self._state == "loaded":
+            yield from super().iter_bytes(chunk_size)
+            return
+        if self._state != "pending":
+            raise RuntimeError("streamed response body was already consumed")
+        self._state = "reading"
+        deadline = self.deadline
+        try:
+            chunks = self._reader(chunk_size)
+            while True:
+                if deadline is not None and deadline.expired:
+                    raise StreamInterrupted(self, error_response(504, "deadline_exceeded"))
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                except Exception as exc:
+                    raise StreamInterrupted(self, timeout_response()) from exc
+                if chunk:
+                    yield chunk
+        finally:
+            self._state = "consumed"
+            self.close()
+
+    def _load(self) -> bytes:
+        if self._state != "loaded":
+            content = b"".join(self.iter_bytes())
+            self._content = content
+            self._state = "loaded"
+        return self._content
+
+    @property
+    def content(self) -> bytes:
+        return self._load()
+
+    @property
+    def body(self) -> memoryview:
+        return memoryview(self._load())
+
+    @property
+    def text(self) -> str:
+        return self._load().decode(self._charset(), errors="replace")
+
+    def json(self, **kwargs: Any) -> Any:
+        self._load()
+        return super().json(**kwargs)
+
+    def copy(self) -> ApiResponse:
+        self._load()
+        return super().copy()
+
+    def close(self) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __repr__(self) -> str:
+        return f"<StreamedResponse [{self.status_code}]>"
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, response: ApiResponse) -> None:
+        super().__init__(f"HTTP {response.status_code} for {response.url}")
+        self.response = response
+
+
+class StreamInterrupted(HTTPStatusError):
+    # Raised while reading a StreamedResponse body. `response` is the
+    # controlled 504 to handle like any other; `stream` is the response
+    # that was being read.
+
+    def __init__(self, stream: StreamedResponse, response: ApiResponse) -> None:
+        response.url = stream.url
+        super().__init__(response)
+        self.stream = stream
+
+
+# Bodies of locally built responses are encoded once and shared; only
+# the (mutable) headers are created per response.
+_ERROR_BODIES: Dict[str, bytes] = {}
+
+
+def error_response(status_code: int, error: str) -> ApiResponse:
+    # Controlled response built locally instead of raising to the caller.
+    body = _ERROR_BODIES.get(error)
+    if body is None:
+        body = _ERROR_BODIES[error] = json_lib.dumps({"error": error}).encode("utf-8")
+    return ApiResponse(status_code, Headers({"Content-Type": "application/json"}), body)
+
+
+def timeout_response() -> ApiResponse:
+    # Controlled 504 returned instead of propagating network errors.
+    return error_response(504, "timeout")
+
+
+def clone_response(resp: ApiResponse) -> ApiResponse:
+    # Cheap copy for replaying one upstream response to several callers.
+    return resp.copy()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterable, Optional
+
+# Upstream statuses that are worth another attempt.
+RETRYABLE_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+
+class ConstantBackoff:
+    # Fixed pause between attempts (the original ApiClient behaviour).
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay_sec = delay
+
+    def delay(self, attempt: int, previous: float) -> float:
+        return self.delay_sec
+
+
+class ExponentialBackoff:
+    # Exponential backoff with jitter so clients do not retry in lockstep.
+    #
+    # - jitter="full": uniform(0, min(cap, base * multiplier ** attempt))
+    # - jitter="decorrelated": min(cap, uniform(base, previous * 3))
+    # - jitter="none": min(cap, base * multiplier ** attempt)
+
+    JITTER_MODES = ("full", "decorrelated", "none")
+
+    def __init__(
+        self,
+        base: float = 0.1,
+        cap: float = 10.0,
+        multiplier: float = 2.0,
+        jitter: str = "full",
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        if jitter not in self.JITTER_MODES:
+            raise ValueError(f"jitter must be one of {self.JITTER_MODES}")
+        self.base = base
+        self.cap = cap
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._rng = rng or random.Random()
+
+    def delay(self, attempt: int, previous: float) -> float:
+        if self.jitter == "decorrelated":
+            upper = max(self.base, previous * 3)
+            return min(self.cap, self._rng.uniform(self.base, upper))
+
+        ceiling = min(self.cap, self.base * self.multiplier ** attempt)
+        if self.jitter == "full":
+            return self._rng.uniform(0, ceiling)
+        return ceiling
+
+
+class RetryBudget:
+    # Token bucket that caps retries as a fraction of total traffic.
+    #
+    # Every request deposits `ratio` tokens and every retry withdraws one,
+    # so in steady state at most `ratio` retries are sent per request.
+    # `min_tokens` seeds the bucket so low-traffic clients can still retry.
+
+    def __init__(self, ratio: float = 0.1, min_tokens: float = 10.0, max_tokens: float = 100.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max(max_tokens, min_tokens)
+        self._tokens = float(min_tokens)
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class RetryPolicy:
+    # Decides whether and when ApiClient retries an attempt.
+    #
+    # A policy can be shared between clients and threads; counters are
+    # aggregated across everything that uses it.
+    #
+    # Retry-After (seconds or HTTP date) on a retryable response replaces
+    # the backoff delay when respect_retry_after is set. A Retry-After
+    # longer than max_retry_after is not waited out: the response is
+    # returned to the caller instead.
+
+    def __init__(
+        self,
+        retries: int = 0,
+        backoff: Optional[Any] = None,
+        retry_on: Iterable[int] = RETRYABLE_STATUSES,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 30.0,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        self.retries = max(0, int(retries))
+        self.backoff = backoff or ConstantBackoff(0.0)
+        self.retry_on = frozenset(retry_on)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+
+        self._lock = threading.Lock()
+        self.retries_spent = 0
+        self.retries_denied = 0
+
+    def on_request(self) -> None:
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def is_retryable(self, response: Any) -> bool:
+        return response is None or response.status_code in self.retry_on
+
+    def should_retry(self, attempt: int, response: Any = None) -> bool:
+        # `attempt` is the zero-based index of the attempt that just failed;
+        # `response` is None when it raised instead of answering.
+        if attempt >= self.retries or not self.is_retryable(response):
+            return False
+
+        retry_after = self.retry_after(response)
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return False
+
+        if self.budget is not None and not self.budget.withdraw():
+            with self._lock:
+                self.retries_denied += 1
+            return False
+
+        with self._lock:
+            self.retries_spent += 1
+        return True
+
+    def next_delay(self, attempt: int, response: Any = None, previous: float = 0.0) -> float:
+        retry_after = self.retry_after(response)
+        if retry_after is not None:
+            return retry_after
+        return self.backoff.delay(attempt, previous)
+
+    def retry_after(self, response: Any) -> Optional[float]:
+        if not self.respect_retry_after or response is None:
+            return None
+        return parse_retry_after(response.headers.get("Retry-After"))
+
+    def snapshot(self) -> dict:
+        return {"retries_spent": self.retries_spent, "retries_denied": self.retries_denied}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - time.time())
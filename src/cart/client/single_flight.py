@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from cart.client.response import ApiResponse, clone_response
+
+
+class _Call:
+    __slots__ = ("done", "response", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: Optional[ApiResponse] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    # Coalesces identical concurrent GETs into one upstream request.
+    #
+    # The first caller for a key (the leader) performs the request; callers
+    # that arrive while it is in flight wait and receive a copy of the same
+    # result, including failures and the local 504 fallback. Nothing is
+    # kept once the leader finishes, so this is not a cache.
+    #
+    # Requests are identical when method, URL and the relevant headers
+    # match. By default every header is relevant; pass `key_headers` to
+    # compare only some (e.g. Accept and Authorization).
+
+    def __init__(self, key_headers: Optional[Iterable[str]] = None) -> None:
+        self.key_headers = frozenset(h.lower() for h in key_headers) if key_headers is not None else None
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, ...], _Call] = {}
+
+        self.leaders = 0
+        self.shared = 0
+
+    def key_for(self, method: str, url: str, headers: Optional[Dict[str, str]]) -> Tuple[str, ...]:
+        items = sorted(
+            (name.lower(), value)
+            for name, value in (headers or {}).items()
+            if self.key_headers is None or name.lower() in self.key_headers
+        )
+        return (method, url, *(f"{name}:{value}" for name, value in items))
+
+    def execute(
+        self,
+        key: Tuple[str, ...],
+        send: Callable[[], ApiResponse],
+        timeout: Optional[float] = None,
+    ) -> Optional[ApiResponse]:
+        # Returns None only when a waiting caller gives up after `timeout`.
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            if not call.done.wait(timeout):
+                return None
+            if call.error is not None:
+                raise call.error
+            return clone_response(call.response)
+
+        try:
+            call.response = send()
+            return call.response
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        return len(self._calls)
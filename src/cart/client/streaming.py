@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import codecs
+import json as json_lib
+from typing import Any, Iterable, Iterator, List, Optional
+
+# Incremental item iterators for streamed merchant responses.
+#
+# Both take an iterable of byte chunks (StreamedResponse.iter_bytes())
+# and yield one decoded record at a time, so memory is bounded by the
+# largest record plus a chunk or two rather than by the whole export:
+#
+#     with client.get("/merchant/data", stream=True) as resp:
+#         for tx in resp.iter_items(key="transactions"):
+#             ...
+#
+# - iter_ndjson: one JSON value per line (application/x-ndjson,
+#   application/jsonl); blank lines are skipped.
+# - iter_json_array: the items of a top-level JSON array, or of the
+#   array under `key` in a top-level object ({"transactions": [...]});
+#   the other members of that object are skipped.
+#
+# Malformed input raises ValueError once the parser reaches it; records
+# before that point have already been yielded.
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",:]}"
+
+
+def is_ndjson(content_type: Optional[str]) -> bool:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return media_type in NDJSON_TYPES
+
+
+def iter_ndjson(chunks: Iterable[bytes]) -> Iterator[Any]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending: List[str] = []
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if "\n" not in text:
+            pending.append(text)
+            continue
+        pending.append(text)
+        lines = "".join(pending).split("\n")
+        pending = [lines.pop()]
+        for line in lines:
+            if line.strip():
+                yield json_lib.loads(line)
+    pending.append(decoder.decode(b"", final=True))
+    tail = "".join(pending)
+    if tail.strip():
+        yield json_lib.loads(tail)
+
+
+def iter_json_array(chunks: Iterable[bytes], key: Optional[str] = None) -> Iterator[Any]:
+    reader = _Reader(chunks)
+    if key is not None:
+        reader.expect("{")
+        while True:
+            if reader.peek() == "}":
+                raise ValueError(f"response object has no {key!r} member")
+            name = reader.value()
+            reader.expect(":")
+            if name == key:
+                break
+            reader.value()
+            if reader.peek() == ",":
+                reader.pos += 1
+
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        char = reader.peek()
+        if char == ",":
+            reader.pos += 1
+        elif char == "]":
+            return
+        else:
+            raise ValueError(f"expected ',' or ']' in JSON array, got {char or 'end of body'!r}")
+
+
+class _Reader:
+    # Text buffer over a chunk iterator. Consumed text is dropped whenever
+    # more is read, so the buffer only holds the value being decoded.
+
+    __slots__ = ("_chunks", "_decoder", "buffer", "pos", "eof")
+
+    _json = json_lib.JSONDecoder()
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, min_size: int = 1) -> bool:
+        # Reads until at least `min_size` new characters are buffered.
+        # Returns False at the end of the body.
+        if self.eof:
+            return False
+        parts = [self.buffer[self.pos :]]
+        added = 0
+        while added < min_size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                parts.append(self._decoder.decode(b"", final=True))
+                self.eof = True
+                break
+            text = self._decoder.decode(chunk)
+            parts.append(text)
+            added += len(text)
+        self.buffer = "".join(parts)
+        self.pos = 0
+        return added > 0 or bool(parts[-1])
+
+    def peek(self) -> str:
+        # Next non-whitespace character, without consuming it ("" at EOF).
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected {char!r} in JSON body, got {found or 'end of body'!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        if not self.peek():
+            raise ValueError("unexpected end of JSON body")
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if self.eof:
+                    raise
+                end = -1
+            # A value not yet followed by a delimiter may be cut short
+            # ("12" of "1234", "3." of "3.5"): read more before trusting
+            # it. Growing by the buffered size keeps re-decoding of large
+            # values linear.
+            if end != -1 and (self.eof or (end < len(self.buffer) and self.buffer[end] in _DELIMITERS)):
+                self.pos = end
+                return value
+            self._fill(max(1, len(self.buffer) - self.pos))
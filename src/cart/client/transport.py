@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, Iterator, Optional
+
+from cart.client.http_utils import host_key
+from cart.client.response import ApiResponse, StreamedResponse
+
+if TYPE_CHECKING:
+    from cart.client.pool import ConnectionPool
+
+# Transports import their HTTP library on construction, not at module
+# import, so `import cart.client.api_client` stays cheap for short-lived
+# probe workers.
+
+
+class FatalTransportError(Exception):
+    # Raised by a transport for problems that are not merchant or network
+    # behaviour (e.g. a replay cassette with no recording for the
+    # request). ApiClient lets these reach the caller instead of turning
+    # them into a controlled 504.
+    pass
+
+
+class Transport:
+    # Sends one HTTP exchange. Retries, timeouts-to-504, breakers and the
+    # rest of the resilience logic stay in ApiClient.
+    #
+    # send() raises on network errors and returns an ApiResponse.
+    # stream() returns once the headers are in; its body is read through
+    # StreamedResponse, with `timeout` bounding each read.
+
+    name = "base"
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[bytes],
+        timeout: float,
+    ) -> ApiResponse:
+        raise NotImplementedError
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[bytes],
+        timeout: float,
+    ) -> StreamedResponse:
+        # Fallback for transports that cannot stream (cassettes, counting
+        # wrappers): the body is read by send() and handed out in chunks.
+        return StreamedResponse.buffered(self.send(method, url, headers, body, timeout))
+
+    def close(self) -> None:
+        pass
+
+
+class RequestsTransport(Transport):
+    # Default backend: requests.Session over a keep-alive ConnectionPool.
+    # Works with requests_mock, which the test suite relies on.
+
+    name = "requests"
+
+    def __init__(self, pool: Optional["ConnectionPool"] = None, **pool_options: Any) -> None:
+        from cart.client.pool import ConnectionPool
+
+        self._owns_pool = pool is None
+        self.pool = pool or ConnectionPool(**pool_options)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[bytes],
+        timeout: float,
+    ) -> ApiResponse:
+        resp = self.pool.request(method=method, url=url, headers=headers, data=body, timeout=timeout)
+        return ApiResponse.from_requests(resp)
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[bytes],
+        timeout: float,
+    ) -> StreamedResponse:
+        resp = self.pool.request(method=method, url=url, headers=headers, data=body, timeout=timeout, stream=True)
+        elapsed = getattr(resp, "elapsed", None)
+        # Response.close() drops a half-read connection instead of reusing it.
+        return StreamedResponse(
+            resp.status_code,
+            resp.headers,
+            resp.iter_content,
+            resp.close,
+            url=resp.url,
+            reason=resp.reason,
+            elapsed=elapsed.total_seconds() if elapsed is not None else None,
+        )
+
+    def close(self) -> None:
+        if self._owns_pool:
+            self.pool.close()
+
+
+class Urllib3Transport(Transport):
+    # Lean backend: urllib3.PoolManager directly, without the requests
+    # session, adapter and hook layers. Returns ApiResponse.
+    #
+    # Redirects are not followed and urllib3's own retries are disabled;
+    # ApiClient owns retry decisions.
+    #
+    # Pool options mean the same as on ConnectionPool: `max_connections`
+    # caps exchanges in flight across hosts and `idle_timeout` closes the
+    # pools of hosts left unused that long. A ConnectionPool wraps a
+    # requests session, so passing one here is a TypeError.
+
+    name = "urllib3"
+
+    def __init__(
+        self,
+        pool: Optional["ConnectionPool"] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        max_connections: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> None:
+        if pool is not None:
+            raise TypeError("a ConnectionPool can only be used with the 'requests' transport")
+        import urllib3
+
+        self._urllib3 = urllib3
+        self._manager = urllib3.PoolManager(
+            num_pools=pool_connections,
+            maxsize=pool_maxsize,
+            block=pool_block,
+            retries=False,
+        )
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self._slots: ContextManager[Any] = (
+            threading.BoundedSemaphore(max_connections) if max_connections else nullcontext()
+        )
+        self._lock = threading.Lock()
+        self._last_used: Dict[str, float] = {}
+        self._last_sweep = time.monotonic()
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[bytes],
+        timeout: float,
+    ) -> ApiResponse:
+        if self.idle_timeout:
+            self._touch(url)
+        with self._slots:
+            started = time.perf_counter()
+            raw = self._manager.request(
+                method,
+                url,
+                body=body,
+                headers=headers,
+                timeout=timeout,
+                redirect=False,
+                preload_content=False,
+            )
+            elapsed = time.perf_counter() - started
+            try:
+                content = raw.read()
+            finally:
+                raw.release_conn()
+        return ApiResponse(raw.status, raw.headers, content, url=url, reason=raw.reason, elapsed=elapsed)
+
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[bytes],
+        timeout: float,
+    ) -> StreamedResponse:
+        if self.idle_timeout:
+            self._touch(url)
+        # As with requests' stream=True, the slot covers the exchange up
+        # to the headers; the body is read outside it.
+        with self._slots:
+            started = time.perf_counter()
+            raw = self._manager.request(
+                method,
+                url,
+                body=body,
+                headers=headers,
+                timeout=timeout,
+                redirect=False,
+                preload_content=False,
+            )
+        elapsed = time.perf_counter() - started
+        finished = False
+
+        def reader(chunk_size: int) -> Iterator[bytes]:
+            nonlocal finished
+            yield from raw.stream(chunk_size, decode_content=True)
+            finished = True
+
+        def release() -> None:
+            if not finished:
+                # Half-read: the connection cannot be reused.
+                raw.close()
+            raw.release_conn()
+
+        return StreamedResponse(raw.status, raw.headers, reader, release, url=url, reason=raw.reason, elapsed=elapsed)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        # Closes the pools of hosts idle for longer than idle_timeout.
+        # Returns the number of hosts evicted.
+        if not self.idle_timeout:
+            return 0
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._last_sweep = now
+            idle = [host for host, ts in self._last_used.items() if now - ts > self.idle_timeout]
+            for host in idle:
+                del self._last_used[host]
+
+        if not idle:
+            return 0
+
+        parse_url = self._urllib3.util.parse_url
+        targets = set()
+        for host in idle:
+            parsed = parse_url(host)
+            targets.add((parsed.scheme, parsed.host, parsed.port or _DEFAULT_PORTS.get(parsed.scheme or "", 80)))
+        # Removing a pool from the manager's container closes its sockets.
+        pools = self._manager.pools
+        for key in list(pools.keys()):
+            if (key.key_scheme, key.key_host, key.key_port) in targets:
+                try:
+                    del pools[key]
+                except KeyError:
+                    pass
+        return len(idle)
+
+    def close(self) -> None:
+        self._manager.clear()
+
+    def _touch(self, url: str) -> None:
+        now = time.monotonic()
+        # Sweeping is cheap but not free; do it at most twice per idle window.
+        if now - self._last_sweep > self.idle_timeout / 2:
+            self.evict_idle(now)
+        with self._lock:
+            self._last_used[host_key(url)] = now
+
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+TRANSPORTS = {
+    RequestsTransport.name: RequestsTransport,
+    Urllib3Transport.name: Urllib3Transport,
+}
+
+
+def create_transport(name: str, **options: Any) -> Transport:
+    try:
+        factory = TRANSPORTS[name]
+    except KeyError:
+        raise ValueError(f"unknown transport {name!r}; expected one of {sorted(TRANSPORTS)}") from None
+    return factory(**options)
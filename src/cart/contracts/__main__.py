@@ -0,0 +1,62 @@
+"""Streaming schema drift detector for recorded merchant responses.
+
+    python -m cart.contracts capture.jsonl.gz --save-profile base.json
+    python -m cart.contracts today.jsonl --baseline base.json --json
+
+Inputs are JSONL captures, one response record per line, optionally
+gzipped, or - for stdin. Fields that are new, missing or retyped are
+reported per endpoint and X-API-Version, against a reference version or
+a baseline saved by an earlier run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from cart.contracts.drift import DriftDetector, open_lines, render_text
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cart.contracts", description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="JSONL capture files (.gz ok) or - for stdin")
+    parser.add_argument("--baseline", help="profile JSON saved by an earlier run")
+    parser.add_argument("--save-profile", help="write the inferred profiles to this JSON file")
+    parser.add_argument("--reference-version", help="X-API-Version to compare other versions against")
+    parser.add_argument("--presence-drop", type=float, default=0.2)
+    parser.add_argument("--max-fields", type=int, default=256)
+    parser.add_argument("--json", action="store_true", help="print drifts as JSON")
+    parser.add_argument("--fail-on-drift", action="store_true", help="exit with status 1 when drift is found")
+    args = parser.parse_args(argv)
+
+    detector = DriftDetector(max_fields=args.max_fields)
+    for path in args.inputs:
+        detector.feed(open_lines(path))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = DriftDetector.from_snapshot(json.load(fh))
+
+    if args.save_profile:
+        with open(args.save_profile, "w", encoding="utf-8") as fh:
+            json.dump(detector.snapshot(), fh)
+
+    drifts = detector.drifts(
+        baseline=baseline,
+        reference_version=args.reference_version,
+        presence_drop=args.presence_drop,
+    )
+    if args.json:
+        json.dump({"records": detector.records, "drifts": [d._asdict() for d in drifts]}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        render_text(drifts, detector, sys.stdout)
+
+    return 1 if drifts and args.fail_on_drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
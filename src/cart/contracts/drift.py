@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import io
+import json
+import math
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, TextIO, Tuple
+
+from cart.client.instrumentation import endpoint_template
+
+# Streaming schema drift detection over recorded merchant responses.
+#
+# Captured responses arrive as JSONL records (see `python -m
+# cart.contracts` for the CLI):
+#
+#     {"method": "GET", "path": "/merchant/profile", "status": 200,
+#      "headers": {"X-API-Version": "v2"}, "body": {...}}
+#
+# (`url` may be given instead of `path`.) For every endpoint and
+# X-API-Version value the detector learns field presence rates, type
+# distributions and value cardinality in one pass, then reports fields
+# that are new, missing or retyped compared to a reference version, or
+# to a saved baseline.
+#
+# Memory is bounded whatever the input size: max_profiles * max_fields
+# field counters (each with at most max_values exact values), plus at
+# most max_profiles * max_sketches 1KB cardinality sketches (32MB at the
+# defaults).
+
+UNVERSIONED = "unversioned"
+
+# JSON value kinds tracked per field.
+KINDS = ("object", "array", "string", "integer", "number", "boolean", "null")
+
+
+def kind_of(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "boolean"
+    if isinstance(value, int):
+        return "integer"
+    if isinstance(value, float):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, list):
+        return "array"
+    return "object"
+
+
+def endpoint_of(record: Dict[str, Any]) -> str:
+    # "GET /merchant/{id}/profile": the same endpoint template that
+    # metrics and instrumentation group by (host and query dropped).
+    path = record.get("path") or record.get("url") or "/"
+    return f"{str(record.get('method', 'GET')).upper()} {endpoint_template(path)}"
+
+
+def version_of(record: Dict[str, Any]) -> str:
+    for name, value in (record.get("headers") or {}).items():
+        if name.lower() == "x-api-version" and value:
+            return str(value)
+    return UNVERSIONED
+
+
+class HyperLogLog:
+    # Fixed-size cardinality sketch (2 ** p one-byte registers).
+
+    __slots__ = ("p", "registers")
+
+    def __init__(self, p: int = 10, registers: Optional[bytearray] = None) -> None:
+        self.p = p
+        self.registers = registers if registers is not None else bytearray(1 << p)
+
+    def add(self, value: Any) -> None:
+        digest = hashlib.blake2b(repr(value).encode("utf-8"), digest_size=8).digest()
+        h = int.from_bytes(digest, "big")
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"p": self.p, "registers": base64.b64encode(bytes(self.registers)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        return cls(data["p"], bytearray(base64.b64decode(data["registers"])))
+
+
+class FieldStats:
+    # Per-field counters. `values` keeps exact scalar values until it
+    # exceeds max_values; an HLL sketch, when the profile can still afford
+    # one, keeps estimating after that.
+
+    __slots__ = ("present", "kinds", "values", "sketch")
+
+    def __init__(self) -> None:
+        self.present = 0
+        self.kinds: Dict[str, int] = {}
+        self.values: Optional[Set[Any]] = set()
+        self.sketch: Optional[HyperLogLog] = None
+
+    def observe(self, value: Any, kind: str, max_values: int) -> bool:
+        # Returns True when the field has just outgrown its exact values;
+        # the caller then calls drop_values().
+        self.kinds[kind] = self.kinds.get(kind, 0) + 1
+        if kind in ("string", "integer", "boolean"):
+            if self.sketch is not None:
+                self.sketch.add(value)
+            elif self.values is not None:
+                self.values.add(value)
+                return len(self.values) > max_values
+        return False
+
+    def drop_values(self, sketch: bool) -> None:
+        # The exact set holds every distinct value seen so far, so seeding
+        # the sketch from it matches having sketched from the start.
+        if sketch and self.values is not None:
+            self.sketch = HyperLogLog()
+            for value in self.values:
+                self.sketch.add(value)
+        self.values = None
+
+    @property
+    def dominant_kind(self) -> Optional[str]:
+        return max(self.kinds, key=self.kinds.get) if self.kinds else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "present": self.present,
+            "kinds": self.kinds,
+            "values": sorted(self.values, key=repr) if self.values is not None else None,
+            "sketch": self.sketch.to_dict() if self.sketch is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FieldStats":
+        stats = cls()
+        stats.present = data["present"]
+        stats.kinds = dict(data["kinds"])
+        stats.values = set(data["values"]) if data["values"] is not None else None
+        stats.sketch = HyperLogLog.from_dict(data["sketch"]) if data.get("sketch") else None
+        return stats
+
+
+class Profile:
+    # Inferred schema of one (endpoint, version).
+
+    __slots__ = ("records", "fields", "overflow", "sketches")
+
+    def __init__(self) -> None:
+        self.records = 0
+        self.fields: Dict[str, FieldStats] = {}
+        self.overflow = 0
+        self.sketches = 0
+
+    def presence(self, path: str) -> float:
+        stats = self.fields.get(path)
+        return stats.present / self.records if stats and self.records else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "records": self.records,
+            "overflow": self.overflow,
+            "fields": {path: stats.to_dict() for path, stats in self.fields.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Profile":
+        profile = cls()
+        profile.records = data["records"]
+        profile.overflow = data.get("overflow", 0)
+        profile.fields = {p: FieldStats.from_dict(s) for p, s in data["fields"].items()}
+        profile.sketches = sum(s.sketch is not None for s in profile.fields.values())
+        return profile
+
+
+class Drift(NamedTuple):
+    endpoint: str
+    version: str
+    reference: str
+    field: str
+    kind: str
+    detail: str
+
+
+class DriftDetector:
+    # Incremental schema inference over a stream of recorded responses.
+    #
+    # - max_fields: field paths tracked per profile; extra paths are only
+    #   counted in Profile.overflow
+    # - max_profiles: (endpoint, version) pairs tracked in total
+    # - max_depth / max_items: how deep and how many array elements are
+    #   walked per body
+    # - max_values: exact values kept per field before relying on the
+    #   cardinality sketch only
+    # - max_sketches: fields per profile that get a ~1KB cardinality
+    #   sketch once they outgrow max_values; later ones only record that
+    #   they are high-cardinality
+
+    def __init__(
+        self,
+        max_fields: int = 256,
+        max_profiles: int = 1024,
+        max_depth: int = 6,
+        max_items: int = 8,
+        max_values: int = 16,
+        max_sketches: int = 32,
+    ) -> None:
+        self.max_fields = max_fields
+        self.max_profiles = max_profiles
+        self.max_depth = max_depth
+        self.max_items = max_items
+        self.max_values = max_values
+        self.max_sketches = max_sketches
+
+        self.profiles: Dict[Tuple[str, str], Profile] = {}
+        self.first_version: Dict[str, str] = {}
+        self.records = 0
+        self.skipped = 0
+
+    def observe(self, record: Dict[str, Any]) -> None:
+        body = record.get("body")
+        if body is None:
+            self.skipped += 1
+            return
+        endpoint, version = endpoint_of(record), version_of(record)
+        key = (endpoint, version)
+
+        profile = self.profiles.get(key)
+        if profile is None:
+            if len(self.profiles) >= self.max_profiles:
+                self.skipped += 1
+                return
+            profile = self.profiles[key] = Profile()
+            self.first_version.setdefault(endpoint, version)
+
+        self.records += 1
+        profile.records += 1
+        seen: Set[str] = set()
+        self._walk(profile, body, "", 0, seen)
+
+    def feed(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                self.skipped += 1
+                continue
+            if isinstance(record, dict):
+                self.observe(record)
+            else:
+                self.skipped += 1
+
+    def _walk(self, profile: Profile, value: Any, path: str, depth: int, seen: Set[str]) -> None:
+        kind = kind_of(value)
+        if path:
+            stats = profile.fields.get(path)
+            if stats is None:
+                if len(profile.fields) >= self.max_fields:
+                    profile.overflow += 1
+                    return
+                stats = profile.fields[path] = FieldStats()
+            if path not in seen:
+                seen.add(path)
+                stats.present += 1
+            if stats.observe(value, kind, self.max_values):
+                sketch = profile.sketches < self.max_sketches
+                profile.sketches += sketch
+                stats.drop_values(sketch)
+
+        if depth >= self.max_depth:
+            return
+        if kind == "object":
+            for name, child in value.items():
+                self._walk(profile, child, f"{path}.{name}" if path else name, depth + 1, seen)
+        elif kind == "array":
+            for child in value[: self.max_items]:
+                self._walk(profile, child, f"{path}[]", depth + 1, seen)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "profiles": [
+                {"endpoint": e, "version": v, "profile": p.to_dict()}
+                for (e, v), p in self.profiles.items()
+            ],
+            "first_version": self.first_version,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: Dict[str, Any], **options: Any) -> "DriftDetector":
+        detector = cls(**options)
+        for item in data["profiles"]:
+            detector.profiles[(item["endpoint"], item["version"])] = Profile.from_dict(item["profile"])
+        detector.first_version = dict(data.get("first_version", {}))
+        return detector
+
+    def drifts(
+        self,
+        baseline: Optional["DriftDetector"] = None,
+        reference_version: Optional[str] = None,
+        presence_drop: float = 0.2,
+        min_presence: float = 0.05,
+        min_kind_share: float = 0.05,
+    ) -> List[Drift]:
+        # Without a baseline, each version is compared with the endpoint's
+        # reference version (`reference_version` or the first one seen).
+        # With a baseline, each version is compared with the same version
+        # in the baseline, falling back to the baseline's reference.
+        found: List[Drift] = []
+        for (endpoint, version), current in sorted(self.profiles.items()):
+            if baseline is None:
+                ref_version = reference_version or self.first_version.get(endpoint)
+                if ref_version == version:
+                    continue
+                reference = self.profiles.get((endpoint, ref_version))
+            else:
+                ref_version = version
+                reference = baseline.profiles.get((endpoint, version))
+                if reference is None:
+                    ref_version = reference_version or baseline.first_version.get(endpoint)
+                    reference = baseline.profiles.get((endpoint, ref_version))
+            if reference is None or not reference.records or not current.records:
+                continue
+            found.extend(
+                compare(endpoint, version, ref_version, reference, current, presence_drop, min_presence, min_kind_share)
+            )
+        return found
+
+
+def compare(
+    endpoint: str,
+    version: str,
+    ref_version: str,
+    reference: Profile,
+    current: Profile,
+    presence_drop: float = 0.2,
+    min_presence: float = 0.05,
+    min_kind_share: float = 0.05,
+) -> List[Drift]:
+    found: List[Drift] = []
+
+    def add(field: str, kind: str, detail: str) -> None:
+        found.append(Drift(endpoint, version, ref_version, field, kind, detail))
+
+    for path in sorted(set(reference.fields) | set(current.fields)):
+        ref_rate, cur_rate = reference.presence(path), current.presence(path)
+
+        if ref_rate == 0.0 and cur_rate >= min_presence:
+            add(path, "new", f"present in {cur_rate:.0%} of responses")
+            continue
+        if ref_rate - cur_rate >= presence_drop:
+            add(path, "missing", f"presence {ref_rate:.0%} -> {cur_rate:.0%}")
+            continue
+
+        ref_stats, cur_stats = reference.fields.get(path), current.fields.get(path)
+        if ref_stats is None or cur_stats is None:
+            continue
+
+        ref_kind, cur_kind = ref_stats.dominant_kind, cur_stats.dominant_kind
+        total = sum(cur_stats.kinds.values())
+        unseen = [k for k, n in cur_stats.kinds.items() if k not in ref_stats.kinds and n / total >= min_kind_share]
+        if ref_kind != cur_kind or unseen:
+            add(path, "retyped", f"{_kinds(ref_stats)} -> {_kinds(cur_stats)}")
+            continue
+
+        if ref_stats.values is not None and cur_stats.values is not None:
+            new_values = cur_stats.values - ref_stats.values
+            if new_values:
+                add(path, "enum", f"new values {sorted(new_values, key=repr)!r}")
+        elif ref_stats.values is not None and cur_stats.values is None:
+            estimate = f"~{cur_stats.sketch.estimate():.0f}" if cur_stats.sketch is not None else "untracked"
+            add(path, "enum", f"cardinality {len(ref_stats.values)} -> {estimate}")
+
+    return found
+
+
+def _kinds(stats: FieldStats) -> str:
+    total = sum(stats.kinds.values()) or 1
+    return ", ".join(f"{k} {n / total:.0%}" for k, n in sorted(stats.kinds.items(), key=lambda i: -i[1]))
+
+
+def open_lines(path: str) -> Iterator[str]:
+    if path == "-":
+        yield from sys.stdin
+        return
+    if path.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            yield from fh
+        return
+    with io.open(path, "r", encoding="utf-8") as fh:
+        yield from fh
+
+
+def render_text(drifts: List[Drift], detector: DriftDetector, out: TextIO) -> None:
+    out.write(f"records: {detector.records}  skipped: {detector.skipped}  profiles: {len(detector.profiles)}\n")
+    if not drifts:
+        out.write("no drift detected\n")
+        return
+    for d in drifts:
+        out.write(f"{d.endpoint} [{d.version} vs {d.reference}] {d.kind:<8} {d.field}: {d.detail}\n")
@@ -1,7 +1,24 @@
-def validate_health_response(body: dict):
-    # Validate minimal response contract for health endpoint
-    # This protects against breaking API changes
+from typing import List
+
+from cart.contracts.schema import Violation, compile_schema
+
+# Minimal response contract for the health endpoint.
+# This protects against breaking API changes.
+HEALTH_SCHEMA = {
+    "type": "object",
+    "required": ["status"],
+    "properties": {
+        "status": {"enum": ["ok", "healthy"]},
+    },
+}
+
+HEALTH_CONTRACT = compile_schema(HEALTH_SCHEMA, name="health")
 
-    assert isinstance(body, dict)
-    assert "status" in body
-    assert body["status"] in ["ok", "healthy"]
\ No newline at end of file
+
+def health_violations(body: dict) -> List[Violation]:
+    return HEALTH_CONTRACT.validate(body)
+
+
+def validate_health_response(body: dict):
+    # Raises ContractViolation (an AssertionError) listing every problem.
+    HEALTH_CONTRACT.check(body)
@@ -0,0 +1,26 @@
+from typing import List
+
+from cart.contracts.schema import Violation, compile_schema
+
+# Fields our system relies on in merchant profile / data responses.
+# Merchants may add fields freely; removing or retyping these is a
+# breaking change.
+MERCHANT_SCHEMA = {
+    "type": "object",
+    "required": ["merchantId"],
+    "properties": {
+        "merchantId": {"type": "string"},
+        "status": {"type": "string"},
+    },
+}
+
+MERCHANT_CONTRACT = compile_schema(MERCHANT_SCHEMA, name="merchant")
+
+
+def merchant_violations(body: dict) -> List[Violation]:
+    return MERCHANT_CONTRACT.validate(body)
+
+
+def validate_merchant_response(body: dict):
+    # Raises ContractViolation (an AssertionError) listing every problem.
+    MERCHANT_CONTRACT.check(body)
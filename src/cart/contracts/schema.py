@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+# Contract engine: a declarative schema is compiled once into nested
+# closures, so validating a body is a handful of dict lookups and
+# isinstance checks. Every violation is collected, not just the first.
+#
+# Supported keywords (a small JSON Schema subset):
+#   type                  "object" | "array" | "string" | "integer" |
+#                         "number" | "boolean" | "null", or a list of them
+#   enum                  allowed values
+#   required              keys that must be present (objects)
+#   properties            per-key sub-schemas (objects)
+#   additionalProperties  False to reject unknown keys (objects)
+#   items                 sub-schema for every element (arrays)
+
+
+class Violation(NamedTuple):
+    path: str
+    code: str
+    message: str
+
+
+class ContractViolation(AssertionError):
+    # Raised by Contract.check(). Subclasses AssertionError so pytest
+    # reports it like a failed assertion, but unlike `assert` it is not
+    # stripped under `python -O`.
+
+    def __init__(self, name: str, violations: List[Violation]) -> None:
+        details = "; ".join(f"{v.path or '<root>'}: {v.message}" for v in violations)
+        super().__init__(f"{name} contract violated: {details}")
+        self.violations = violations
+
+
+_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+_Check = Callable[[Any, str, List[Violation]], None]
+
+
+def _join(path: str, key: Any) -> str:
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
+
+
+def _compile(schema: Dict[str, Any]) -> _Check:
+    checks: List[_Check] = []
+
+    types = schema.get("type")
+    if types is not None:
+        names = [types] if isinstance(types, str) else list(types)
+        unknown = [n for n in names if n not in _TYPES]
+        if unknown:
+            raise ValueError(f"unknown schema type(s): {unknown}")
+        predicates = tuple(_TYPES[n] for n in names)
+        expected = " or ".join(names)
+
+        def check_type(value: Any, path: str, errors: List[Violation]) -> None:
+            for predicate in predicates:
+                if predicate(value):
+                    return
+            errors.append(Violation(path, "type", f"expected {expected}, got {type(value).__name__}"))
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = list(schema["enum"])
+        try:
+            allowed_set: Optional[frozenset] = frozenset(allowed)
+        except TypeError:
+            allowed_set = None
+
+        def check_enum(value: Any, path: str, errors: List[Violation]) -> None:
+            try:
+                ok = value in allowed_set if allowed_set is not None else value in allowed
+            except TypeError:
+                ok = False
+            if not ok:
+                errors.append(Violation(path, "enum", f"{value!r} is not one of {allowed!r}"))
+
+        checks.append(check_enum)
+
+    required = tuple(schema.get("required", ()))
+    properties = tuple((name, _compile(sub)) for name, sub in schema.get("properties", {}).items())
+    closed = schema.get("additionalProperties", True) is False
+    known = frozenset(schema.get("properties", {}))
+
+    if required or properties or closed:
+
+        def check_object(value: Any, path: str, errors: List[Violation]) -> None:
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value:
+                    errors.append(Violation(_join(path, name), "required", "required field is missing"))
+            for name, sub in properties:
+                if name in value:
+                    sub(value[name], _join(path, name), errors)
+            if closed:
+                for name in value:
+                    if name not in known:
+                        errors.append(Violation(_join(path, name), "additional", "unexpected field"))
+
+        checks.append(check_object)
+
+    if "items" in schema:
+        item_check = _compile(schema["items"])
+
+        def check_items(value: Any, path: str, errors: List[Violation]) -> None:
+            if not isinstance(value, list):
+                return
+            for index, item in enumerate(value):
+                item_check(item, _join(path, index), errors)
+
+        checks.append(check_items)
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value: Any, path: str, errors: List[Violation]) -> None:
+        before = len(errors)
+        for check in checks:
+            check(value, path, errors)
+            # A wrong type makes the remaining checks meaningless noise.
+            if check is checks[0] and types is not None and len(errors) > before:
+                return
+
+    return check_all
+
+
+class Contract:
+    # Compiled validator for one schema. Build once at import time and
+    # reuse; instances are immutable and thread-safe.
+
+    __slots__ = ("name", "schema", "_check")
+
+    def __init__(self, name: str, schema: Dict[str, Any]) -> None:
+        self.name = name
+        self.schema = schema
+        self._check = _compile(schema)
+
+    def validate(self, body: Any) -> List[Violation]:
+        errors: List[Violation] = []
+        self._check(body, "", errors)
+        return errors
+
+    def is_valid(self, body: Any) -> bool:
+        return not self.validate(body)
+
+    def validate_many(self, bodies: Iterable[Any]) -> List[List[Violation]]:
+        check = self._check
+        results = []
+        for body in bodies:
+            errors: List[Violation] = []
+            check(body, "", errors)
+            results.append(errors)
+        return results
+
+    def check(self, body: Any) -> None:
+        errors = self.validate(body)
+        if errors:
+            raise ContractViolation(self.name, errors)
+
+
+def compile_schema(schema: Dict[str, Any], name: str = "response") -> Contract:
+    return Contract(name, schema)
@@ -0,0 +1,87 @@
+"""Open-loop load generator for ApiClient against a merchant endpoint.
+
+    python -m cart.load --target http://127.0.0.1:8080 --scenario card-switch --rate 200 --duration 30
+    python -m cart.load --simulate --error-rate 0.05 --retries 2 --rate 500 --json
+
+--simulate starts a local merchant simulator and targets it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from cart.client.api_client import ApiClient
+from cart.load.runner import LoadRunner, parse_mix, render_text
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cart.load", description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--target", help="base URL of the merchant API")
+    target.add_argument("--simulate", action="store_true", help="run against a local merchant simulator")
+    parser.add_argument("--scenario", default="health", help="e.g. health, or connect:1,card-switch:3")
+    parser.add_argument("--rate", type=float, default=100.0, help="arrivals per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--arrival", choices=("constant", "poisson"), default="constant")
+    parser.add_argument("--workers", type=int, default=64, help="max in-flight requests")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--retries", type=int, default=0)
+    parser.add_argument("--retry-backoff", type=float, default=0.0)
+    parser.add_argument("--transport", default="requests", help="requests or urllib3")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulator latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="simulator 503 share")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    sim = None
+    base_url = args.target
+    if args.simulate:
+        from cart.simulator.server import MerchantSimulator
+
+        sim = MerchantSimulator(seed=args.seed).start()
+        for profile in sim.routes.values():
+            profile.update(
+                latency=args.latency,
+                distribution="lognormal" if args.latency else "fixed",
+                errors={503: args.error_rate} if args.error_rate else {},
+            )
+        base_url = sim.url
+
+    client = ApiClient(
+        base_url,
+        timeout=args.timeout,
+        retries=args.retries,
+        retry_backoff_sec=args.retry_backoff,
+        pool_maxsize=args.workers,
+        transport=args.transport,
+    )
+    try:
+        runner = LoadRunner(
+            client,
+            parse_mix(args.scenario),
+            rate=args.rate,
+            duration=args.duration,
+            workers=args.workers,
+            arrival=args.arrival,
+            seed=args.seed,
+        )
+        report = runner.run()
+    finally:
+        client.close()
+        if sim is not None:
+            sim.stop()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    print(json.dumps(report, indent=2) if args.json else render_text(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
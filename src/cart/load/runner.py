@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from cart.client.api_client import ApiClient
+from cart.client.response import ApiResponse
+from cart.client.transport import Transport
+from cart.metrics.histogram import LatencyHistogram
+
+
+class Scenario(NamedTuple):
+    # One request shape; build(sequence) returns (headers, json body).
+    name: str
+    method: str
+    path: str
+    build: Callable[[int], Tuple[Optional[Dict[str, str]], Optional[Dict[str, Any]]]]
+
+
+def _no_body(_: int) -> Tuple[None, None]:
+    return None, None
+
+
+def _connect(i: int) -> Tuple[None, Dict[str, Any]]:
+    return None, {"merchantId": str(100 + i % 1000)}
+
+
+def _card_switch(i: int) -> Tuple[Dict[str, str], Dict[str, Any]]:
+    # A fresh key per call: every switch is a new operation, retries of
+    # it reuse the key inside ApiClient.
+    return {"Idempotency-Key": str(uuid.uuid4())}, {"cardId": f"{4111000000000000 + i}"}
+
+
+# The flows the suite already covers.
+SCENARIOS: Dict[str, Scenario] = {
+    "health": Scenario("health", "GET", "/health", _no_body),
+    "connect": Scenario("connect", "POST", "/merchant/connect", _connect),
+    "card-switch": Scenario("card-switch", "POST", "/card-switch", _card_switch),
+}
+
+
+def parse_mix(spec: str) -> List[Tuple[Scenario, float]]:
+    # "health" or "health:1,card-switch:3" -> weighted scenarios.
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.strip().partition(":")
+        if name not in SCENARIOS:
+            raise ValueError(f"unknown scenario {name!r}; expected one of {sorted(SCENARIOS)}")
+        mix.append((SCENARIOS[name], float(weight) if weight else 1.0))
+    return mix
+
+
+class CountingTransport(Transport):
+    # Counts attempts that actually reach the transport, so retry
+    # amplification (attempts / logical requests) can be reported.
+
+    name = "counting"
+
+    def __init__(self, inner: Transport) -> None:
+        self.inner = inner
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.errors = 0
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]],
+        body: Optional[bytes],
+        timeout: float,
+    ) -> ApiResponse:
+        with self._lock:
+            self.attempts += 1
+        try:
+            return self.inner.send(method, url, headers, body, timeout)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def outcome(resp: ApiResponse) -> str:
+    # "200", or "504 timeout" / "429 rate_limited" for error bodies.
+    if resp.status_code < 400:
+        return str(resp.status_code)
+    try:
+        body = resp.json()
+    except ValueError:
+        body = None
+    if isinstance(body, dict) and isinstance(body.get("error"), str):
+        return f"{resp.status_code} {body['error']}"
+    return str(resp.status_code)
+
+
+class LoadRunner:
+    # Open-loop load generator.
+    #
+    # Requests are scheduled at a fixed arrival rate (evenly spaced, or
+    # Poisson) independent of how fast responses come back. Latency is
+    # measured from each request's intended start, so time spent queued
+    # behind a slow merchant is counted (coordinated-omission corrected);
+    # service time from the actual send is reported alongside.
+
+    def __init__(
+        self,
+        client: ApiClient,
+        mix: List[Tuple[Scenario, float]],
+        rate: float,
+        duration: float,
+        workers: int = 64,
+        arrival: str = "constant",
+        seed: Optional[int] = None,
+    ) -> None:
+        if rate <= 0 or duration <= 0:
+            raise ValueError("rate and duration must be positive")
+        if arrival not in ("constant", "poisson"):
+            raise ValueError("arrival must be 'constant' or 'poisson'")
+        self.client = client
+        self.mix = mix
+        self.rate = rate
+        self.duration = duration
+        self.workers = workers
+        self.arrival = arrival
+        self._rng = random.Random(seed)
+
+        self.transport = CountingTransport(client.transport)
+        client.transport = self.transport
+
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.outcomes: Dict[str, int] = {}
+        self.max_lag = 0.0
+        self._lock = threading.Lock()
+
+    def _schedule(self) -> List[float]:
+        if self.arrival == "constant":
+            return [i / self.rate for i in range(int(round(self.rate * self.duration)))]
+        offsets = []
+        t = 0.0
+        while t < self.duration:
+            offsets.append(t)
+            t += self._rng.expovariate(self.rate)
+        return offsets
+
+    def _pick(self) -> Scenario:
+        scenarios, weights = zip(*self.mix)
+        return self._rng.choices(scenarios, weights)[0]
+
+    def _call(self, scenario: Scenario, sequence: int, intended: float) -> None:
+        started = time.perf_counter()
+        headers, body = scenario.build(sequence)
+        if scenario.method == "GET":
+            resp = self.client.get(scenario.path, headers=headers)
+        else:
+            resp = self.client.post(scenario.path, headers=headers, json=body)
+        done = time.perf_counter()
+
+        self.latency.record(done - intended)
+        self.service_time.record(done - started)
+        key = outcome(resp)
+        with self._lock:
+            self.outcomes[key] = self.outcomes.get(key, 0) + 1
+
+    def run(self) -> Dict[str, Any]:
+        offsets = self._schedule()
+        plan = [(self._pick(), i) for i in range(len(offsets))]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            start = time.perf_counter()
+            for offset, (scenario, sequence) in zip(offsets, plan):
+                intended = start + offset
+                wait = intended - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+                else:
+                    self.max_lag = max(self.max_lag, -wait)
+                pool.submit(self._call, scenario, sequence, intended)
+        elapsed = time.perf_counter() - start
+
+        return self.report(len(offsets), elapsed)
+
+    def report(self, requests: int, elapsed: float) -> Dict[str, Any]:
+        completed = self.latency.count
+        ok = sum(n for key, n in self.outcomes.items() if int(key.split(" ", 1)[0]) < 400)
+        return {
+            "scenario": ",".join(f"{s.name}:{w:g}" for s, w in self.mix),
+            "target_rate": self.rate,
+            "duration_sec": round(elapsed, 3),
+            "requests": requests,
+            "completed": completed,
+            "throughput": round(completed / elapsed, 2) if elapsed else 0.0,
+            "success_rate": round(ok / completed, 4) if completed else 0.0,
+            "attempts": self.transport.attempts,
+            "retry_amplification": round(self.transport.attempts / completed, 3) if completed else 0.0,
+            "transport_errors": self.transport.errors,
+            "outcomes": dict(sorted(self.outcomes.items())),
+            "latency_ms": _millis(self.latency.snapshot()),
+            "service_time_ms": _millis(self.service_time.snapshot()),
+            "max_schedule_lag_ms": round(self.max_lag * 1000, 3),
+        }
+
+
+def _millis(snapshot: Dict[str, float]) -> Dict[str, float]:
+    return {k: (v if k == "count" else round(v * 1000, 3)) for k, v in snapshot.items()}
+
+
+def render_text(report: Dict[str, Any]) -> str:
+    lines = [
+        f"scenario        {report['scenario']}",
+        f"target rate     {report['target_rate']:g} req/s for {report['duration_sec']}s",
+        f"completed       {report['completed']}/{report['requests']}  "
+        f"throughput {report['throughput']} req/s  success {report['success_rate']:.2%}",
+        f"attempts        {report['attempts']}  retry amplification x{report['retry_amplification']}  "
+        f"transport errors {report['transport_errors']}",
+    ]
+    for label, key in (("latency ms", "latency_ms"), ("service ms", "service_time_ms")):
+        stats = report[key]
+        lines.append(
+            f"{label:<15} p50 {stats['p50']}  p99 {stats['p99']}  p99.9 {stats['p99.9']}  max {stats['max']}"
+        )
+    lines.append("outcomes        " + "  ".join(f"{k}: {n}" for k, n in report["outcomes"].items()))
+    lines.append(f"max sched lag   {report['max_schedule_lag_ms']} ms")
+    return "\n".join(lines)
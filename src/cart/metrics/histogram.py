@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import math
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Percentiles reported by snapshot().
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    # HDR-style latency histogram: fixed memory, constant-time record and
+    # a bounded relative error (`significant_digits`) at every magnitude.
+    #
+    # Values are seconds, stored as integer microseconds in log-linear
+    # buckets: each power-of-two range is split into the same number of
+    # linear sub-buckets, as in HdrHistogram. Values above
+    # `max_value` seconds are clamped to it everywhere (buckets, min, max,
+    # mean), so no statistic reports more than the configured range.
+    #
+    # record_corrected() back-fills the samples a closed-loop caller
+    # would have missed while stalled (coordinated omission); open-loop
+    # callers should instead measure from each request's intended start.
+
+    def __init__(self, significant_digits: int = 3, max_value: float = 3600.0) -> None:
+        if not 1 <= significant_digits <= 5:
+            raise ValueError("significant_digits must be between 1 and 5")
+        self.significant_digits = significant_digits
+        self.max_value = max_value
+
+        self._sub_bits = max(1, math.ceil(math.log2(2 * 10**significant_digits)))
+        self._half = 1 << (self._sub_bits - 1)
+        self._mask = (1 << self._sub_bits) - 1
+        self._max_us = max(1, int(max_value * 1e6))
+        buckets = max(1, self._max_us.bit_length() - self._sub_bits + 1)
+        self._counts: List[int] = [0] * ((buckets + 1) * self._half)
+        self._lock = threading.Lock()
+
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, us: int) -> int:
+        bucket = (us | self._mask).bit_length() - self._sub_bits
+        sub = us >> bucket
+        return ((bucket + 1) << (self._sub_bits - 1)) + sub - self._half
+
+    def _value_at(self, index: int) -> int:
+        # Highest value that maps to the bucket at `index`.
+        bucket = (index >> (self._sub_bits - 1)) - 1
+        sub = (index & (self._half - 1)) + self._half
+        if bucket < 0:
+            sub -= self._half
+            bucket = 0
+        return ((sub + 1) << bucket) - 1
+
+    def record(self, value: float, count: int = 1) -> None:
+        value = min(self.max_value, max(0.0, value))
+        us = min(self._max_us, int(value * 1e6))
+        index = self._index(us)
+        with self._lock:
+            self._counts[index] += count
+            self.count += count
+            self.total += value * count
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def record_corrected(self, value: float, expected_interval: float) -> None:
+        self.record(value)
+        if expected_interval <= 0:
+            return
+        missed = value - expected_interval
+        while missed >= expected_interval:
+            self.record(missed)
+            missed -= expected_interval
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if len(other._counts) != len(self._counts) or other._sub_bits != self._sub_bits:
+            raise ValueError("histograms have different layouts")
+        with other._lock:
+            counts = list(other._counts)
+            count, total, lo, hi = other.count, other.total, other.min, other.max
+        with self._lock:
+            for i, n in enumerate(counts):
+                if n:
+                    self._counts[i] += n
+            self.count += count
+            self.total += total
+            if lo is not None and (self.min is None or lo < self.min):
+                self.min = lo
+            if hi is not None and (self.max is None or hi > self.max):
+                self.max = hi
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts = [0] * len(self._counts)
+            self.count = 0
+            self.total = 0.0
+            self.min = None
+            self.max = None
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        # Value (seconds) at or below which `percentile` % of samples fall.
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = max(1, math.ceil(self.count * percentile / 100.0))
+            seen = 0
+            for index, n in enumerate(self._counts):
+                if n:
+                    seen += n
+                    if seen >= target:
+                        return min(self._value_at(index) / 1e6, self.max or 0.0)
+        return self.max or 0.0
+
+    def percentiles(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        return {_label(p): self.percentile(p) for p in percentiles}
+
+    def snapshot(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, float]:
+        data: Dict[str, float] = {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.min or 0.0,
+            "max": self.max or 0.0,
+        }
+        data.update(self.percentiles(percentiles))
+        return data
+
+
+def _label(percentile: float) -> str:
+    # 50 -> "p50", 99.9 -> "p99.9"
+    return f"p{percentile:g}"
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+import pytest
+
+from cart.client.instrumentation import ATTEMPT, DEFAULT_INSTRUMENTATION, RETRY, RequestEvent
+
+# Performance regression gate, registered from src/conftest.py via
+# `pytest_plugins`.
+#
+# For every test it records wall time, HTTP attempts sent through
+# ApiClient and time spent sleeping between retries, and compares them
+# with the committed baseline (perf-baseline.json next to pytest.ini):
+#
+#   pytest --perf-gate=fail          fail tests that regressed
+#   pytest --perf-gate=warn          report regressions only (default)
+#   pytest --perf-update             refresh the baseline from this run
+#
+# An update keeps baseline entries of tests outside the run (so a subset
+# can be refreshed on its own) but drops entries whose test file no longer
+# exists or no longer contains the test.
+#
+# Reruns of one test add up, so a flaky test that only passes on its
+# second run also shows twice the attempts. Tests can declare absolute
+# budgets, enforced in every gate mode:
+#
+#   @pytest.mark.perf(attempts=2, retry_sleep=0.0, wall=1.0)
+
+BASELINE_VERSION = 1
+GATE_MODES = ("off", "warn", "fail")
+METRICS = ("wall", "attempts", "retry_sleep")
+
+# Allowed growth over the baseline: value <= baseline * (1 + ratio) + slack.
+# Wall time is noisy across machines; attempts and retry sleeps are not.
+DEFAULT_TOLERANCES = {
+    "wall": (1.0, 0.25),
+    "attempts": (0.25, 1.0),
+    "retry_sleep": (0.5, 0.05),
+}
+
+
+class _Counters:
+    # Listener on the default instrumentation bus; clients may call from
+    # worker threads, so updates are locked.
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.retry_sleep = 0.0
+
+    def __call__(self, event: RequestEvent) -> None:
+        with self._lock:
+            if event.name == ATTEMPT:
+                self.attempts += 1
+            else:
+                self.retry_sleep += event.delay
+
+    def read(self) -> Dict[str, float]:
+        with self._lock:
+            return {"attempts": self.attempts, "retry_sleep": self.retry_sleep}
+
+
+class PerfGate:
+    def __init__(
+        self,
+        baseline_path: Path,
+        mode: str = "warn",
+        update: bool = False,
+        wall_tolerance: Optional[float] = None,
+        root: Optional[Path] = None,
+    ) -> None:
+        self.baseline_path = baseline_path
+        self.root = root if root is not None else baseline_path.parent
+        self.mode = mode
+        self.update = update
+        self.tolerances = dict(DEFAULT_TOLERANCES)
+        if wall_tolerance is not None:
+            self.tolerances["wall"] = (wall_tolerance, DEFAULT_TOLERANCES["wall"][1])
+        self.baseline = load_baseline(baseline_path)
+        self.results: Dict[str, Dict[str, float]] = {}
+        self.regressions: Dict[str, List[str]] = {}
+        self.collected: Set[str] = set()
+        self._counters = _Counters()
+
+    def start(self) -> None:
+        DEFAULT_INSTRUMENTATION.subscribe(self._counters, (ATTEMPT, RETRY))
+
+    def stop(self) -> None:
+        DEFAULT_INSTRUMENTATION.unsubscribe(self._counters)
+
+    def check(self, nodeid: str, measured: Dict[str, float], budget: Dict[str, float]) -> List[str]:
+        problems = []
+        for metric, limit in budget.items():
+            if metric in measured and measured[metric] > limit:
+                problems.append(f"{metric} {_fmt(measured[metric])} exceeds budget {_fmt(limit)}")
+        if self.mode == "off" or self.update:
+            return problems
+
+        regressions = []
+        expected = self.baseline.get(nodeid, {})
+        for metric in METRICS:
+            if metric not in expected:
+                continue
+            ratio, slack = self.tolerances[metric]
+            if measured[metric] > expected[metric] * (1 + ratio) + slack:
+                regressions.append(f"{metric} {_fmt(measured[metric])} vs baseline {_fmt(expected[metric])}")
+        if regressions:
+            self.regressions[nodeid] = regressions
+        else:
+            self.regressions.pop(nodeid, None)
+        if self.mode == "fail":
+            problems.extend(regressions)
+        return problems
+
+    def write_baseline(self) -> None:
+        files = {nodeid.split("::", 1)[0] for nodeid in self.collected}
+        tests = {nodeid: values for nodeid, values in self.baseline.items() if not self._stale(nodeid, files)}
+        tests.update(self.results)
+        data = {
+            "version": BASELINE_VERSION,
+            "tests": {
+                nodeid: {
+                    "wall": round(values["wall"], 4),
+                    "attempts": int(values["attempts"]),
+                    "retry_sleep": round(values["retry_sleep"], 4),
+                }
+                for nodeid, values in sorted(tests.items())
+            },
+        }
+        self.baseline_path.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+
+    def _stale(self, nodeid: str, collected_files: Set[str]) -> bool:
+        # Renamed or deleted: its file was collected without it, or is gone.
+        path = nodeid.split("::", 1)[0]
+        if path in collected_files:
+            return nodeid not in self.collected
+        return not (self.root / path).exists()
+
+    # Runs before -k/-m deselection, which must not count as a removal.
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_collection_modifyitems(self, items: List[pytest.Item]) -> None:
+        self.collected.update(item.nodeid for item in items)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item: pytest.Item) -> Iterator[None]:
+        before = self._counters.read()
+        started = time.perf_counter()
+        yield
+        wall = time.perf_counter() - started
+        after = self._counters.read()
+
+        # Reruns of the same test accumulate.
+        totals = self.results.setdefault(item.nodeid, {"wall": 0.0, "attempts": 0, "retry_sleep": 0.0})
+        totals["wall"] += wall
+        totals["attempts"] += after["attempts"] - before["attempts"]
+        totals["retry_sleep"] += after["retry_sleep"] - before["retry_sleep"]
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item: pytest.Item, call: pytest.CallInfo) -> Iterator[None]:
+        outcome = yield
+        report = outcome.get_result()
+        if report.when != "call" or item.nodeid not in self.results:
+            return
+
+        measured = self.results[item.nodeid]
+        report.user_properties.extend((f"perf_{metric}", measured[metric]) for metric in METRICS)
+        marker = item.get_closest_marker("perf")
+        budget = {k: float(v) for k, v in marker.kwargs.items()} if marker else {}
+        problems = self.check(item.nodeid, measured, budget)
+        if problems and report.passed:
+            report.outcome = "failed"
+            report.longrepr = "performance regression: " + "; ".join(problems)
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        self.stop()
+        if self.update and session.testsfailed == 0:
+            self.write_baseline()
+
+    def pytest_terminal_summary(self, terminalreporter: Any) -> None:
+        if self.update:
+            terminalreporter.write_line(f"perf baseline: {len(self.results)} tests -> {self.baseline_path}")
+            return
+        if not self.regressions:
+            return
+        terminalreporter.section("performance regressions")
+        for nodeid, problems in sorted(self.regressions.items()):
+            terminalreporter.write_line(f"{nodeid}: {'; '.join(problems)}")
+
+
+def load_baseline(path: Path) -> Dict[str, Dict[str, float]]:
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if data.get("version") != BASELINE_VERSION:
+        raise pytest.UsageError(f"{path}: unsupported perf baseline version {data.get('version')!r}")
+    return data.get("tests", {})
+
+
+def _fmt(value: float) -> str:
+    return f"{value:g}" if float(value).is_integer() else f"{value:.3f}"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("perf", "performance regression gate")
+    group.addoption(
+        "--perf-gate",
+        choices=GATE_MODES,
+        default=None,
+        help="compare wall time, HTTP attempts and retry sleeps with the baseline (default: warn)",
+    )
+    group.addoption("--perf-update", action="store_true", help="rewrite the perf baseline from this run")
+    group.addoption("--perf-baseline", default=None, help="baseline file (default: perf-baseline.json)")
+    group.addoption(
+        "--perf-wall-tolerance",
+        type=float,
+        default=None,
+        help="allowed relative wall-time growth over the baseline (default: 1.0)",
+    )
+    parser.addini("perf_gate", "default --perf-gate mode", default="warn")
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    mode = config.getoption("--perf-gate") or config.getini("perf_gate")
+    if mode not in GATE_MODES:
+        raise pytest.UsageError(f"perf_gate must be one of {GATE_MODES}")
+    baseline = config.getoption("--perf-baseline") or "perf-baseline.json"
+    gate = PerfGate(
+        Path(config.rootpath, baseline),
+        mode=mode,
+        update=config.getoption("--perf-update"),
+        wall_tolerance=config.getoption("--perf-wall-tolerance"),
+        root=config.rootpath,
+    )
+    gate.start()
+    config.pluginmanager.register(gate, "cart-perf-gate")
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Tuple
+
+from cart.client.instrumentation import ATTEMPT, FALLBACK, RESPONSE, RETRY, RequestEvent
+from cart.metrics.histogram import DEFAULT_PERCENTILES, LatencyHistogram
+
+if TYPE_CHECKING:
+    from cart.client.instrumentation import Instrumentation
+
+
+class _EndpointStats:
+    __slots__ = (
+        "requests",
+        "attempts",
+        "attempt_errors",
+        "retries",
+        "backoff_seconds",
+        "statuses",
+        "fallbacks",
+        "latency",
+        "ttfb",
+    )
+
+    def __init__(self, significant_digits: int) -> None:
+        self.requests = 0
+        self.attempts = 0
+        self.attempt_errors = 0
+        self.retries = 0
+        self.backoff_seconds = 0.0
+        self.statuses: Dict[int, int] = {}
+        self.fallbacks: Dict[str, int] = {}
+        self.latency = LatencyHistogram(significant_digits)
+        self.ttfb = LatencyHistogram(significant_digits)
+
+
+class RequestMetrics:
+    # Per-endpoint counters and latency histograms built from ApiClient
+    # instrumentation events. Attach it to an Instrumentation bus:
+    #
+    #     metrics = RequestMetrics().attach(instrumentation)
+    #
+    # Endpoints are keyed by (method, path template). `latency` covers a
+    # whole call including retries and backoff; `ttfb` covers single
+    # attempts that reached the merchant. Export with snapshot() (a dict)
+    # or to_prometheus() (text exposition format).
+
+    def __init__(self, significant_digits: int = 2) -> None:
+        self.significant_digits = significant_digits
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], _EndpointStats] = {}
+
+    def attach(self, instrumentation: "Instrumentation") -> "RequestMetrics":
+        instrumentation.subscribe(self, (ATTEMPT, RETRY, FALLBACK, RESPONSE))
+        return self
+
+    def detach(self, instrumentation: "Instrumentation") -> None:
+        instrumentation.unsubscribe(self)
+
+    def _stats(self, method: str, endpoint: str) -> _EndpointStats:
+        key = (method, endpoint)
+        stats = self._endpoints.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._endpoints.setdefault(key, _EndpointStats(self.significant_digits))
+        return stats
+
+    def __call__(self, event: RequestEvent) -> None:
+        stats = self._stats(event.method, event.endpoint)
+        name = event.name
+        if name == ATTEMPT:
+            if event.ttfb is not None:
+                stats.ttfb.record(event.ttfb)
+            with self._lock:
+                stats.attempts += 1
+                if not event.status_code:
+                    stats.attempt_errors += 1
+        elif name == RETRY:
+            with self._lock:
+                stats.retries += 1
+                stats.backoff_seconds += event.delay
+        elif name == FALLBACK:
+            with self._lock:
+                stats.fallbacks[event.reason or ""] = stats.fallbacks.get(event.reason or "", 0) + 1
+        elif name == RESPONSE:
+            if event.elapsed is not None:
+                stats.latency.record(event.elapsed)
+            with self._lock:
+                stats.requests += 1
+                stats.statuses[event.status_code] = stats.statuses.get(event.status_code, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def _items(self) -> List[Tuple[Tuple[str, str], _EndpointStats]]:
+        with self._lock:
+            return sorted(self._endpoints.items())
+
+    def snapshot(self, percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict[str, Dict[str, Any]]:
+        # {"GET /health": {"requests": 3, ..., "latency": {...}, "ttfb": {...}}}
+        percentiles = tuple(percentiles)
+        data: Dict[str, Dict[str, Any]] = {}
+        for (method, endpoint), stats in self._items():
+            with self._lock:
+                entry: Dict[str, Any] = {
+                    "requests": stats.requests,
+                    "attempts": stats.attempts,
+                    "attempt_errors": stats.attempt_errors,
+                    "retries": stats.retries,
+                    "backoff_seconds": stats.backoff_seconds,
+                    "statuses": dict(stats.statuses),
+                    "fallbacks": dict(stats.fallbacks),
+                }
+            entry["latency"] = stats.latency.snapshot(percentiles)
+            entry["ttfb"] = stats.ttfb.snapshot(percentiles)
+            data[f"{method} {endpoint}"] = entry
+        return data
+
+    def to_prometheus(self, prefix: str = "cart_client", percentiles: Iterable[float] = (50.0, 90.0, 99.0)) -> str:
+        percentiles = tuple(percentiles)
+        items = self._items()
+        lines: List[str] = []
+
+        def counter(name: str, help_text: str, rows: Iterable[Tuple[str, Any]]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for labels, value in rows:
+                lines.append(f"{prefix}_{name}{{{labels}}} {_number(value)}")
+
+        def summary(name: str, help_text: str, attr: str) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} summary")
+            for (method, endpoint), stats in items:
+                histogram: LatencyHistogram = getattr(stats, attr)
+                labels = _labels(method, endpoint)
+                for p in percentiles:
+                    value = histogram.percentile(p)
+                    lines.append(f'{prefix}_{name}{{{labels},quantile="{p / 100:g}"}} {_number(value)}')
+                lines.append(f"{prefix}_{name}_sum{{{labels}}} {_number(histogram.total)}")
+                lines.append(f"{prefix}_{name}_count{{{labels}}} {histogram.count}")
+
+        counter(
+            "requests_total",
+            "Calls returned to the caller, by final status.",
+            (
+                (f'{_labels(method, endpoint)},status="{status}"', n)
+                for (method, endpoint), stats in items
+                for status, n in sorted(stats.statuses.items())
+            ),
+        )
+        counter(
+            "attempts_total",
+            "Transport attempts sent upstream.",
+            ((_labels(method, endpoint), stats.attempts) for (method, endpoint), stats in items),
+        )
+        counter(
+            "attempt_errors_total",
+            "Transport attempts that raised instead of answering.",
+            ((_labels(method, endpoint), stats.attempt_errors) for (method, endpoint), stats in items),
+        )
+        counter(
+            "retries_total",
+            "Retries started after a failed attempt.",
+            ((_labels(method, endpoint), stats.retries) for (method, endpoint), stats in items),
+        )
+        counter(
+            "backoff_seconds_total",
+            "Seconds spent in retry backoff.",
+            ((_labels(method, endpoint), stats.backoff_seconds) for (method, endpoint), stats in items),
+        )
+        counter(
+            "fallbacks_total",
+            "Controlled responses synthesized locally, by reason.",
+            (
+                (f'{_labels(method, endpoint)},reason="{reason}"', n)
+                for (method, endpoint), stats in items
+                for reason, n in sorted(stats.fallbacks.items())
+            ),
+        )
+        summary("request_duration_seconds", "Whole-call latency including retries.", "latency")
+        summary("ttfb_seconds", "Per-attempt time to response headers.", "ttfb")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, endpoint: str) -> str:
+    endpoint = endpoint.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",endpoint="{endpoint}"'
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
@@ -0,0 +1,93 @@
+"""Scheduled live merchant checks with results streamed to rotating JSONL.
+
+    python -m cart.probes inventory.json --output probes/results.jsonl --duration 3600
+    python -m cart.probes --simulate --merchants 500 --interval 5 --duration 30
+
+inventory.json lists merchants and endpoints, e.g.
+{"defaults": {"interval": 60, "endpoints": [{"path": "/health", "contract": "health"}]},
+ "merchants": [{"name": "acme", "base_url": "https://api.acme.example"}]}
+
+--simulate starts a local merchant simulator and probes it as N merchants.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import signal
+import sys
+from typing import List, Optional
+
+from cart.probes.scheduler import ProbeScheduler, RotatingJsonlWriter, load_inventory
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cart.probes", description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("inventory", nargs="?", help="JSON merchant and endpoint inventory")
+    target.add_argument("--simulate", action="store_true", help="probe a local merchant simulator")
+    parser.add_argument("--merchants", type=int, default=100, help="simulated merchants (with --simulate)")
+    parser.add_argument("--interval", type=float, default=10.0, help="probe interval (with --simulate)")
+    parser.add_argument("--output", default="probes.jsonl", help="JSONL results file")
+    parser.add_argument("--max-bytes", type=int, default=50 * 1024 * 1024, help="rotate after this size")
+    parser.add_argument("--backups", type=int, default=5, help="rotated files to keep")
+    parser.add_argument("--duration", type=float, help="seconds to run (default: until interrupted)")
+    parser.add_argument("--rounds", type=int, help="probe every target this many times, then stop")
+    parser.add_argument("--concurrency", type=int, default=64, help="max probes in flight")
+    parser.add_argument("--per-host", type=int, default=4, help="max probes in flight per merchant host")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--retries", type=int, default=0)
+    parser.add_argument("--jitter", type=float, default=0.1, help="interval jitter as a fraction")
+    parser.add_argument("--transport", default="requests", help="requests or urllib3")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    sim = None
+    if args.simulate:
+        from cart.simulator.server import MerchantSimulator
+
+        sim = MerchantSimulator(seed=args.seed).start()
+        inventory = {
+            "defaults": {
+                "interval": args.interval,
+                "endpoints": [
+                    {"path": "/health", "contract": "health"},
+                    {"path": "/merchant/profile", "contract": "merchant"},
+                ],
+            },
+            # Simulated merchants share one host, so --per-host bounds the run.
+            "merchants": [{"name": f"sim-{i}", "base_url": sim.url} for i in range(args.merchants)],
+        }
+    else:
+        with open(args.inventory, encoding="utf-8") as fh:
+            inventory = json.load(fh)
+
+    writer = RotatingJsonlWriter(args.output, max_bytes=args.max_bytes, backups=args.backups)
+    scheduler = ProbeScheduler(
+        load_inventory(inventory),
+        writer,
+        concurrency=args.concurrency,
+        per_host=args.per_host,
+        timeout=args.timeout,
+        retries=args.retries,
+        jitter=args.jitter,
+        transport=args.transport,
+        seed=args.seed,
+    )
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    try:
+        summary = scheduler.run(duration=args.duration, rounds=args.rounds)
+    except KeyboardInterrupt:
+        scheduler.stop()
+        summary = scheduler.snapshot()
+    finally:
+        writer.close()
+        if sim is not None:
+            sim.stop()
+
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
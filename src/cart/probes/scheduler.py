@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from cart.client.api_client import ApiClient
+from cart.client.http_utils import host_key
+from cart.client.response import ApiResponse
+from cart.contracts.health_contract import HEALTH_CONTRACT
+from cart.contracts.merchant_contract import MERCHANT_CONTRACT
+from cart.contracts.schema import Contract
+
+# Contracts a probe target can be checked against, by inventory name.
+CONTRACTS: Dict[str, Contract] = {
+    "health": HEALTH_CONTRACT,
+    "merchant": MERCHANT_CONTRACT,
+}
+
+
+class ProbeTarget:
+    # One merchant endpoint checked every `interval` seconds.
+
+    __slots__ = ("merchant", "base_url", "method", "path", "interval", "contract", "body", "in_flight", "host")
+
+    def __init__(
+        self,
+        merchant: str,
+        base_url: str,
+        path: str,
+        method: str = "GET",
+        interval: float = 60.0,
+        contract: Optional[str] = None,
+        body: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if contract is not None and contract not in CONTRACTS:
+            raise ValueError(f"unknown contract {contract!r}; expected one of {sorted(CONTRACTS)}")
+        self.merchant = merchant
+        self.base_url = base_url.rstrip("/")
+        self.method = method.upper()
+        self.path = path
+        self.interval = interval
+        self.contract = contract
+        self.body = body
+        self.in_flight = False
+        self.host = host_key(self.base_url)
+
+    @property
+    def key(self) -> str:
+        return f"{self.merchant} {self.method} {self.path}"
+
+
+def load_inventory(data: Dict[str, Any]) -> List[ProbeTarget]:
+    # {"defaults": {"interval": 60, "endpoints": [{"path": "/health", "contract": "health"}]},
+    #  "merchants": [{"name": "acme", "base_url": "https://...", "interval": 30,
+    #                 "endpoints": [{"path": "/merchant/profile", "contract": "merchant"}]}]}
+    defaults = data.get("defaults", {})
+    targets = []
+    for merchant in data.get("merchants", []):
+        name = merchant.get("name") or merchant["base_url"]
+        interval = float(merchant.get("interval", defaults.get("interval", 60.0)))
+        for endpoint in merchant.get("endpoints", defaults.get("endpoints", [])):
+            targets.append(
+                ProbeTarget(
+                    name,
+                    merchant["base_url"],
+                    endpoint["path"],
+                    method=endpoint.get("method", "GET"),
+                    interval=float(endpoint.get("interval", interval)),
+                    contract=endpoint.get("contract"),
+                    body=endpoint.get("json"),
+                )
+            )
+    return targets
+
+
+class RotatingJsonlWriter:
+    # Appends one JSON object per line and flushes it, so results can be
+    # tailed while a run is in progress. When the file would grow past
+    # `max_bytes` it is rotated to path.1, path.2, ... keeping `backups`
+    # old files, so disk use stays bounded on long runs.
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backups: int = 5) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fh = open(path, "ab")
+        self._size = self._fh.tell()
+        self.written = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self._lock:
+            if self._size and self._size + len(line) > self.max_bytes:
+                self._rotate()
+            self._fh.write(line)
+            self._fh.flush()
+            self._size += len(line)
+            self.written += 1
+
+    def _rotate(self) -> None:
+        self._fh.close()
+        if self.backups > 0:
+            for i in range(self.backups - 1, 0, -1):
+                source = f"{self.path}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._fh = open(self.path, "wb")
+        self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._fh.close()
+
+
+def probe_once(client: ApiClient, target: ProbeTarget) -> Dict[str, Any]:
+    # One check of one target, as a JSONL-ready record.
+    started = time.perf_counter()
+    if target.method == "GET":
+        resp = client.get(target.path)
+    else:
+        resp = client.post(target.path, json=target.body)
+    latency = time.perf_counter() - started
+
+    record: Dict[str, Any] = {
+        "ts": round(time.time(), 3),
+        "merchant": target.merchant,
+        "method": target.method,
+        "path": target.path,
+        "status": resp.status_code,
+        "latency_ms": round(latency * 1000, 3),
+        "ttfb_ms": round(resp.elapsed * 1000, 3) if resp.elapsed is not None else None,
+        "version": resp.headers.get("X-API-Version"),
+    }
+    record.update(_verdict(target, resp))
+    return record
+
+
+def _verdict(target: ProbeTarget, resp: ApiResponse) -> Dict[str, Any]:
+    # pass / fail (contract violated) / error (no usable response) / skip
+    # (no contract configured for this target).
+    if resp.status_code >= 400:
+        error = None
+        try:
+            body = resp.json()
+            if isinstance(body, dict):
+                error = body.get("error")
+        except ValueError:
+            pass
+        return {"verdict": "error", "error": error or f"http_{resp.status_code}"}
+    if target.contract is None:
+        return {"verdict": "skip"}
+    try:
+        body = resp.json()
+    except ValueError:
+        return {"verdict": "fail", "violations": ["<root>: body is not JSON"]}
+    violations = CONTRACTS[target.contract].validate(body)
+    if violations:
+        return {"verdict": "fail", "violations": [f"{v.path or '<root>'}: {v.message}" for v in violations]}
+    return {"verdict": "pass"}
+
+
+class ProbeScheduler:
+    # Runs live merchant checks on a schedule with bounded concurrency.
+    #
+    # - Each target first fires at a stable pseudo-random phase within its
+    #   interval (crc32 of its key), then every `interval` seconds with
+    #   +/- `jitter` of the interval, so thousands of targets with the same
+    #   interval spread out instead of firing in bursts.
+    # - At most `concurrency` probes run at once and at most `per_host`
+    #   against one merchant host; a due probe whose host is saturated is
+    #   pushed back from now by 0.5-1.5x `host_backoff` seconds, so probes
+    #   waiting on one host do not retry in lockstep.
+    # - A target whose previous probe is still running is skipped for that
+    #   round (counted in `overlaps`), so a hung merchant cannot pile up
+    #   probes.
+    # - Memory is O(targets): one heap entry per target, one ApiClient per
+    #   merchant base URL, and no result is kept after it is written.
+
+    def __init__(
+        self,
+        targets: Iterable[ProbeTarget],
+        writer: RotatingJsonlWriter,
+        concurrency: int = 64,
+        per_host: int = 4,
+        timeout: float = 5.0,
+        retries: int = 0,
+        jitter: float = 0.1,
+        host_backoff: float = 0.05,
+        transport: Optional[str] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.targets = list(targets)
+        self.writer = writer
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.jitter = jitter
+        self.host_backoff = host_backoff
+        self.transport = transport
+        self._rng = random.Random(seed)
+
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(concurrency)
+        self._host_in_flight: Dict[str, int] = {}
+        self._clients: Dict[str, ApiClient] = {}
+        self._stop = threading.Event()
+
+        self.probes = 0
+        self.overlaps = 0
+        self.verdicts: Dict[str, int] = {}
+
+    def _client(self, target: ProbeTarget) -> ApiClient:
+        client = self._clients.get(target.base_url)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(target.base_url)
+                if client is None:
+                    client = self._clients[target.base_url] = ApiClient(
+                        target.base_url,
+                        timeout=self.timeout,
+                        retries=self.retries,
+                        pool_connections=1,
+                        pool_maxsize=self.per_host,
+                        transport=self.transport,
+                    )
+        return client
+
+    def _phase(self, target: ProbeTarget) -> float:
+        return target.interval * (zlib.crc32(target.key.encode("utf-8")) % 10000) / 10000
+
+    def _next(self, due: float, interval: float) -> float:
+        following = due + interval * (1 + self._rng.uniform(-self.jitter, self.jitter))
+        now = time.monotonic()
+        if following < now:
+            # Fell more than an interval behind: skip the missed rounds
+            # rather than firing them back to back.
+            following += interval * ((now - following) // interval + 1)
+        return following
+
+    def _backoff(self, due: float) -> float:
+        # From now, not from `due`: a probe far behind schedule would
+        # otherwise be popped again at once and spin on a busy host.
+        return max(due, time.monotonic()) + self.host_backoff * self._rng.uniform(0.5, 1.5)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self, duration: Optional[float] = None, rounds: Optional[int] = None) -> Dict[str, Any]:
+        # Runs until stop(), `duration` seconds, or every target has been
+        # probed `rounds` times, then waits for in-flight probes.
+        start = time.monotonic()
+        end = start + duration if duration is not None else None
+        heap: List[Tuple[float, int, int, ProbeTarget]] = [
+            (start + self._phase(target), i, 0, target) for i, target in enumerate(self.targets)
+        ]
+        heapq.heapify(heap)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="probe") as pool:
+            while heap and not self._stop.is_set():
+                due, order, done, target = heap[0]
+                if end is not None and due >= end:
+                    break
+                wait = due - time.monotonic()
+                if wait > 0:
+                    if self._stop.wait(wait):
+                        break
+                    continue
+
+                heapq.heappop(heap)
+                if target.in_flight:
+                    with self._lock:
+                        self.overlaps += 1
+                    self._reschedule(heap, due, order, done + 1, target, rounds)
+                    continue
+
+                with self._lock:
+                    busy = self._host_in_flight.get(target.host, 0) >= self.per_host
+                    if not busy:
+                        self._host_in_flight[target.host] = self._host_in_flight.get(target.host, 0) + 1
+                        target.in_flight = True
+                if busy:
+                    heapq.heappush(heap, (self._backoff(due), order, done, target))
+                    continue
+
+                # Blocks the scheduler, not the heap, when every slot is busy.
+                self._slots.acquire()
+                pool.submit(self._probe, target)
+                self._reschedule(heap, due, order, done + 1, target, rounds)
+
+        for client in self._clients.values():
+            client.close()
+        self._clients.clear()
+        return self.snapshot()
+
+    def _reschedule(
+        self,
+        heap: List[Tuple[float, int, int, ProbeTarget]],
+        due: float,
+        order: int,
+        done: int,
+        target: ProbeTarget,
+        rounds: Optional[int],
+    ) -> None:
+        if rounds is None or done < rounds:
+            heapq.heappush(heap, (self._next(due, target.interval), order, done, target))
+
+    def _probe(self, target: ProbeTarget) -> None:
+        try:
+            try:
+                record = probe_once(self._client(target), target)
+            except Exception as exc:  # never let one target kill the worker
+                record = {
+                    "ts": round(time.time(), 3),
+                    "merchant": target.merchant,
+                    "method": target.method,
+                    "path": target.path,
+                    "verdict": "error",
+                    "error": type(exc).__name__,
+                }
+            self.writer.write(record)
+            with self._lock:
+                self.probes += 1
+                self.verdicts[record["verdict"]] = self.verdicts.get(record["verdict"], 0) + 1
+        finally:
+            with self._lock:
+                self._host_in_flight[target.host] -= 1
+                target.in_flight = False
+            self._slots.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "targets": len(self.targets),
+                "probes": self.probes,
+                "overlaps": self.overlaps,
+                "verdicts": dict(sorted(self.verdicts.items())),
+            }
@@ -0,0 +1,68 @@
+"""Run the merchant simulator as a standalone localhost server.
+
+    python -m cart.simulator --port 8080 --latency 0.02 --distribution lognormal
+    python -m cart.simulator --config routes.json
+
+routes.json maps a path to RouteProfile options, e.g.
+{"/merchant/status": {"errors": {"503": 0.1}, "retry_after": 1}}.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+from typing import List, Optional
+
+from cart.simulator.server import DISTRIBUTIONS, MerchantSimulator, RouteProfile
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cart.simulator", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--config", help="JSON file mapping route paths to RouteProfile options")
+    parser.add_argument("--latency", type=float, default=0.0, help="latency in seconds for every route")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="fixed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 503 replies on every route")
+    parser.add_argument("--retry-after", type=float, help="Retry-After seconds on 429/503")
+    parser.add_argument("--api-version", default="v1")
+    args = parser.parse_args(argv)
+
+    sim = MerchantSimulator(host=args.host, port=args.port, seed=args.seed)
+    for profile in sim.routes.values():
+        profile.update(
+            latency=args.latency,
+            distribution=args.distribution,
+            errors={503: args.error_rate} if args.error_rate else {},
+            retry_after=args.retry_after,
+            api_version=args.api_version,
+        )
+
+    if args.config:
+        with open(args.config, encoding="utf-8") as fh:
+            config = json.load(fh)
+        for path, options in config.items():
+            if "errors" in options:
+                options["errors"] = {int(s): rate for s, rate in options["errors"].items()}
+            if path in sim.routes:
+                sim.route(path).update(**options)
+            else:
+                sim.add_route(path, RouteProfile(**options))
+
+    sim.start()
+    print(f"merchant simulator listening on {sim.url}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sim.stop()
+        print(json.dumps(sim.snapshot(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+
+from cart.simulator.server import MerchantSimulator
+
+# Registered from src/conftest.py via `pytest_plugins`, so every test can
+# request a running simulator:
+#
+#   def test_retry(merchant_simulator):
+#       merchant_simulator.route("/merchant/status").update(script=[503])
+#       ApiClient(merchant_simulator.url, retries=1).get("/merchant/status")
+
+
+@pytest.fixture
+def merchant_simulator() -> Iterator[MerchantSimulator]:
+    # Fresh routes per test; seeded so injected error mixes are repeatable.
+    with MerchantSimulator(seed=0) as sim:
+        yield sim
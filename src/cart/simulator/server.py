@@ -0,0 +1,472 @@
+from __future__ import annotations
+
+import gzip
+import json
+import math
+import random
+import socket
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from cart.client.compression import available_encodings, decompress, encodings_from
+from cart.client.idempotency import IDEMPOTENCY_HEADER, body_fingerprint
+
+Body = Union[Dict[str, Any], List[Any], Callable[[Dict[str, Any]], Any]]
+
+DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+class RouteProfile:
+    # Programmable behaviour of one simulated merchant route.
+    #
+    # - status / body: the normal reply; body may be a callable taking the
+    #   parsed JSON request (or {}) and returning the payload
+    # - latency + distribution: per-request delay in seconds; "fixed",
+    #   "uniform" (0..2x latency), "exponential" (mean latency) or
+    #   "lognormal" (median latency, spread latency_sigma)
+    # - errors: injected status mix, e.g. {429: 0.05, 503: 0.02}
+    # - script: statuses served in order for the first calls, before the
+    #   random mix applies (deterministic fault sequences for tests)
+    # - delays: extra seconds added to the first calls, in order
+    #   (deterministic slow calls for tests)
+    # - timeout_rate: share of requests that hang for `hang` seconds and
+    #   then drop the connection without replying
+    # - slow_body: seconds over which the body is trickled out
+    # - retry_after: Retry-After seconds sent with 429 and 503 (rounded up)
+    # - api_version: X-API-Version header value (None omits it)
+    # - idempotent: replay stored replies for a repeated Idempotency-Key and
+    #   reject the key with a different body (422 idempotency_key_reused)
+    # - reject_compressed: answer 415 to request bodies with a
+    #   Content-Encoding (gzip, or zstd/br when installed, is accepted
+    #   otherwise)
+    # - compress_responses: gzip bodies of 256+ bytes for clients that
+    #   send Accept-Encoding: gzip
+
+    def __init__(
+        self,
+        methods: Tuple[str, ...] = ("GET",),
+        status: int = 200,
+        body: Body = None,
+        latency: float = 0.0,
+        distribution: str = "fixed",
+        latency_sigma: float = 0.5,
+        errors: Optional[Dict[int, float]] = None,
+        script: Optional[List[int]] = None,
+        delays: Optional[List[float]] = None,
+        timeout_rate: float = 0.0,
+        hang: float = 5.0,
+        slow_body: float = 0.0,
+        retry_after: Optional[float] = None,
+        api_version: Optional[str] = "v1",
+        idempotent: bool = False,
+        headers: Optional[Dict[str, str]] = None,
+        reject_compressed: bool = False,
+        compress_responses: bool = False,
+    ) -> None:
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"distribution must be one of {DISTRIBUTIONS}")
+        self.methods = tuple(m.upper() for m in methods)
+        self.status = status
+        self.body = body if body is not None else {}
+        self.latency = latency
+        self.distribution = distribution
+        self.latency_sigma = latency_sigma
+        self.errors = dict(errors or {})
+        self.script = list(script or [])
+        self.delays = list(delays or [])
+        self.timeout_rate = timeout_rate
+        self.hang = hang
+        self.slow_body = slow_body
+        self.retry_after = retry_after
+        self.api_version = api_version
+        self.idempotent = idempotent
+        self.headers = dict(headers or {})
+        self.reject_compressed = reject_compressed
+        self.compress_responses = compress_responses
+
+    def update(self, **changes: Any) -> "RouteProfile":
+        for name, value in changes.items():
+            if not hasattr(self, name):
+                raise AttributeError(f"unknown route option {name!r}")
+            setattr(self, name, value)
+        return self
+
+    def delay(self, rng: random.Random) -> float:
+        if self.latency <= 0:
+            return 0.0
+        if self.distribution == "uniform":
+            return rng.uniform(0.0, 2 * self.latency)
+        if self.distribution == "exponential":
+            return rng.expovariate(1.0 / self.latency)
+        if self.distribution == "lognormal":
+            return rng.lognormvariate(0.0, self.latency_sigma) * self.latency
+        return self.latency
+
+    def pick_error(self, rng: random.Random) -> Optional[int]:
+        roll = rng.random()
+        for status, rate in self.errors.items():
+            if roll < rate:
+                return int(status)
+            roll -= rate
+        return None
+
+
+def default_routes() -> Dict[str, RouteProfile]:
+    # The merchant endpoints the suite already talks to.
+    def connect(request: Dict[str, Any]) -> Dict[str, Any]:
+        return {"status": "connected", "merchantId": request.get("merchantId", "123")}
+
+    def switch(request: Dict[str, Any]) -> Dict[str, Any]:
+        return {"switchId": f"sw-{random.getrandbits(48):012x}", "status": "completed"}
+
+    # Per-item replay store for the bulk route, so an item resent in a
+    # later batch under the same key is not switched twice. Handler
+    # threads share it, hence the lock.
+    switched: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+    switched_lock = threading.Lock()
+
+    def bulk_switch(request: Dict[str, Any]) -> Dict[str, Any]:
+        results = []
+        for item in request.get("items", []):
+            key = item.get("idempotencyKey")
+            if not item.get("cardId"):
+                results.append({"idempotencyKey": key, "status": 422, "body": {"error": "invalid_card"}})
+                continue
+            with switched_lock:
+                body = switched.get(key)
+                if body is None:
+                    body = switched[key] = switch(item)
+                    while len(switched) > 10000:
+                        switched.popitem(last=False)
+            results.append({"idempotencyKey": key, "status": 200, "body": body})
+        return {"results": results}
+
+    return {
+        "/health": RouteProfile(body={"status": "ok"}),
+        "/merchant/connect": RouteProfile(methods=("POST",), body=connect, idempotent=True),
+        "/merchant/status": RouteProfile(body={"status": "ok"}),
+        "/merchant/profile": RouteProfile(body={"merchantId": "123", "name": "Test Merchant", "status": "active"}),
+        "/merchant/data": RouteProfile(body={"merchantId": "123", "status": "active"}),
+        "/card-switch": RouteProfile(methods=("POST",), body=switch, idempotent=True),
+        "/card-switch/bulk": RouteProfile(methods=("POST",), body=bulk_switch, idempotent=True),
+    }
+
+
+class _RouteStats:
+    __slots__ = ("requests", "statuses", "timeouts", "replays", "last_headers")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.statuses: Dict[int, int] = {}
+        self.timeouts = 0
+        self.replays = 0
+        self.last_headers: Dict[str, str] = {}
+
+
+class MerchantSimulator:
+    # Threaded HTTP/1.1 stand-in merchant bound to localhost.
+    #
+    # Unlike requests_mock it exercises real sockets, keep-alive pooling,
+    # client timeouts and concurrency, so tests and load runs
+    # (`python -m cart.simulator`) share one programmable merchant:
+    #
+    #   with MerchantSimulator(seed=1) as sim:
+    #       sim.route("/merchant/status").update(errors={503: 0.2}, retry_after=1)
+    #       ApiClient(sim.url).get("/merchant/status")
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        routes: Optional[Dict[str, RouteProfile]] = None,
+        seed: Optional[int] = None,
+        max_idempotency_keys: int = 10000,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.routes = routes if routes is not None else default_routes()
+        self.max_idempotency_keys = max_idempotency_keys
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._stats: Dict[str, _RouteStats] = {}
+        self._calls: Dict[str, int] = {}
+        self._idempotency: "OrderedDict[Tuple[str, str], Tuple[str, int, bytes]]" = OrderedDict()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        # Accepted TCP connections; keep-alive reuse keeps this low.
+        self.connections = 0
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("simulator is not running")
+        return f"http://{self.host}:{self._server.server_address[1]}"
+
+    def route(self, path: str) -> RouteProfile:
+        return self.routes[path]
+
+    def add_route(self, path: str, profile: RouteProfile) -> RouteProfile:
+        self.routes[path] = profile
+        return profile
+
+    def start(self) -> "MerchantSimulator":
+        handler = type("_BoundHandler", (_SimulatorHandler,), {"simulator": self})
+        server = ThreadingHTTPServer((self.host, self.port), handler, bind_and_activate=False)
+        server.daemon_threads = True
+        server.request_queue_size = 256
+        server.server_bind()
+        server.server_activate()
+        self._server = server
+        self._stopping.clear()
+        self._thread = threading.Thread(target=server.serve_forever, name="merchant-simulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> "MerchantSimulator":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def reset(self) -> None:
+        # Restore default routes and forget stats and idempotency keys.
+        with self._lock:
+            self.routes = default_routes()
+            self._stats.clear()
+            self._calls.clear()
+            self._idempotency.clear()
+            self.connections = 0
+
+    def requests(self, path: str) -> int:
+        stats = self._stats.get(path)
+        return stats.requests if stats else 0
+
+    def last_headers(self, path: str) -> Dict[str, str]:
+        # Request headers of the latest call to `path` ({} if none).
+        stats = self._stats.get(path)
+        return dict(stats.last_headers) if stats else {}
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                path: {
+                    "requests": s.requests,
+                    "statuses": dict(s.statuses),
+                    "timeouts": s.timeouts,
+                    "replays": s.replays,
+                }
+                for path, s in self._stats.items()
+            }
+
+    def _plan(
+        self, path: str, profile: RouteProfile, headers: Dict[str, str]
+    ) -> Tuple[float, Optional[int], bool, bool]:
+        # Decide delay, injected status, hang and slow body for one call.
+        with self._lock:
+            stats = self._stats.setdefault(path, _RouteStats())
+            stats.requests += 1
+            stats.last_headers = headers
+            call = self._calls.get(path, 0)
+            self._calls[path] = call + 1
+            delay = profile.delay(self._rng)
+            if call < len(profile.delays):
+                delay += profile.delays[call]
+            if call < len(profile.script):
+                injected: Optional[int] = profile.script[call]
+                hang = False
+            else:
+                hang = self._rng.random() < profile.timeout_rate
+                injected = None if hang else profile.pick_error(self._rng)
+            if hang:
+                stats.timeouts += 1
+            slow = profile.slow_body > 0
+        return delay, injected, hang, slow
+
+    def _record_status(self, path: str, status: int, replay: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(path, _RouteStats())
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            if replay:
+                stats.replays += 1
+
+    def _idempotent_lookup(self, path: str, key: str, fingerprint: str) -> Optional[Tuple[int, bytes]]:
+        with self._lock:
+            stored = self._idempotency.get((path, key))
+            if stored is None:
+                return None
+            if stored[0] != fingerprint:
+                return 422, json.dumps({"error": "idempotency_key_reused"}).encode("utf-8")
+            return stored[1], stored[2]
+
+    def _idempotent_store(self, path: str, key: str, fingerprint: str, status: int, body: bytes) -> None:
+        if status >= 500 or status == 429:
+            return
+        with self._lock:
+            self._idempotency[(path, key)] = (fingerprint, status, body)
+            while len(self._idempotency) > self.max_idempotency_keys:
+                self._idempotency.popitem(last=False)
+
+
+class _SimulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    simulator: MerchantSimulator
+
+    def setup(self) -> None:
+        super().setup()
+        with self.simulator._lock:
+            self.simulator.connections += 1
+        # Headers and body go out in separate writes; avoid delayed-ACK stalls.
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def do_PUT(self) -> None:
+        self._handle()
+
+    def do_DELETE(self) -> None:
+        self._handle()
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def _handle(self) -> None:
+        sim = self.simulator
+        path = self.path.split("?", 1)[0]
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        profile = sim.routes.get(path)
+        if profile is None:
+            return self._reply(path, None, 404, {"error": "not_found"})
+        if self.command not in profile.methods:
+            return self._reply(path, profile, 405, {"error": "method_not_allowed"})
+
+        delay, injected, hang, slow = sim._plan(path, profile, dict(self.headers.items()))
+        if delay:
+            sim._stopping.wait(delay)
+        if hang:
+            sim._stopping.wait(profile.hang)
+            self.close_connection = True
+            return
+
+        encoding = (self.headers.get("Content-Encoding") or "").strip().lower()
+        if encoding and encoding != "identity":
+            if profile.reject_compressed or encoding not in available_encodings():
+                return self._reply(path, profile, 415, {"error": "unsupported_content_encoding"}, slow)
+            try:
+                raw = decompress(raw, encoding)
+            except Exception:
+                return self._reply(path, profile, 400, {"error": "Invalid payload"}, slow)
+
+        try:
+            request = json.loads(raw) if raw else {}
+        except ValueError:
+            return self._reply(path, profile, 400, {"error": "Invalid payload"}, slow)
+
+        key = self.headers.get(IDEMPOTENCY_HEADER)
+        fingerprint = ""
+        if profile.idempotent and key:
+            fingerprint = body_fingerprint(self.command, request)
+            stored = sim._idempotent_lookup(path, key, fingerprint)
+            if stored is not None:
+                status, body = stored
+                return self._send(path, profile, status, body, slow, replay=status != 422)
+
+        if injected is not None:
+            return self._reply(path, profile, injected, {"error": _ERRORS.get(injected, "injected")}, slow)
+        if self.command == "POST" and not request:
+            return self._reply(path, profile, 400, {"error": "Invalid payload"}, slow)
+
+        payload = profile.body(request) if callable(profile.body) else profile.body
+        body = json.dumps(payload).encode("utf-8")
+        if profile.idempotent and key:
+            sim._idempotent_store(path, key, fingerprint, profile.status, body)
+        self._send(path, profile, profile.status, body, slow)
+
+    def _reply(
+        self,
+        path: str,
+        profile: Optional[RouteProfile],
+        status: int,
+        payload: Any,
+        slow: bool = False,
+    ) -> None:
+        self._send(path, profile, status, json.dumps(payload).encode("utf-8"), slow)
+
+    def _send(
+        self,
+        path: str,
+        profile: Optional[RouteProfile],
+        status: int,
+        body: bytes,
+        slow: bool = False,
+        replay: bool = False,
+    ) -> None:
+        self.simulator._record_status(path, status, replay)
+        compressed = (
+            profile is not None
+            and profile.compress_responses
+            and len(body) >= 256
+            and "gzip" in encodings_from(self.headers.get("Accept-Encoding"))
+        )
+        if compressed:
+            body = gzip.compress(body, compresslevel=6, mtime=0)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        if profile is not None:
+            if profile.api_version:
+                self.send_header("X-API-Version", profile.api_version)
+            if profile.retry_after is not None and status in (429, 503):
+                self.send_header("Retry-After", _format_seconds(profile.retry_after))
+            for name, value in profile.headers.items():
+                self.send_header(name, value)
+        if replay:
+            self.send_header("Idempotent-Replayed", "true")
+        self.end_headers()
+
+        if not slow or profile is None or len(body) < 2:
+            self.wfile.write(body)
+            return
+        # Trickle the body out in a few pieces over `slow_body` seconds.
+        pieces = min(8, len(body))
+        step = -(-len(body) // pieces)
+        for start in range(0, len(body), step):
+            self.wfile.write(body[start : start + step])
+            self.wfile.flush()
+            if self.simulator._stopping.wait(profile.slow_body / pieces):
+                return
+
+
+_ERRORS = {
+    429: "rate_limited",
+    500: "internal_error",
+    502: "bad_gateway",
+    503: "unavailable",
+    504: "gateway_timeout",
+}
+
+
+def _format_seconds(value: float) -> str:
+    # Retry-After takes whole delta-seconds (RFC 9110); a fractional
+    # value would be ignored by clients, so round up.
+    return str(max(0, math.ceil(value)))
+
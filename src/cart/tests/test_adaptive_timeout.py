@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from cart.client.adaptive_timeout import AdaptiveTimeout
+from cart.client.api_client import ApiClient
+
+# RESILIENCE TEST: Adaptive per-endpoint timeouts
+#
+# Purpose:
+# Validate that attempt timeouts follow each endpoint's observed latency:
+# a hung fast endpoint is abandoned quickly, a slow-but-healthy endpoint
+# is not cut off, and the static timeout applies during warm-up.
+#
+# Context for Knot:
+# /health answers in milliseconds while /card-switch takes seconds; one
+# static timeout is either too long for the first or too short for the
+# second.
+#
+# CI behavior:
+# - Local merchant simulator only; latencies are tens of milliseconds
+
+pytestmark = pytest.mark.integration
+
+
+def test_static_timeout_applies_during_warm_up():
+    adaptive = AdaptiveTimeout(min_samples=5)
+    key = adaptive.key_for("GET", "https://cart.local/health")
+
+    for _ in range(4):
+        adaptive.record(key, 0.01)
+    assert adaptive.timeout_for(key, 5.0) == 5.0
+
+    adaptive.record(key, 0.01)
+    assert adaptive.timeout_for(key, 5.0) == pytest.approx(0.05, rel=0.1)
+
+
+def test_timeout_is_clamped_and_keyed_by_path_template():
+    adaptive = AdaptiveTimeout(min_samples=1, floor=0.1, ceiling=2.0)
+    fast = adaptive.key_for("GET", "https://cart.local/merchant/1/status")
+    slow = adaptive.key_for("POST", "https://cart.local/card-switch")
+
+    adaptive.record(fast, 0.001)
+    adaptive.record(slow, 5.0)
+
+    assert fast == adaptive.key_for("GET", "https://cart.local/merchant/2/status?x=1")
+    assert adaptive.timeout_for(fast, 5.0) == 0.1
+    assert adaptive.timeout_for(slow, 5.0) == 2.0
+
+
+def test_hung_fast_endpoint_is_abandoned_quickly(merchant_simulator):
+    # Scenario:
+    # /health normally answers in ~5ms, then starts hanging.
+
+    merchant_simulator.route("/health").update(latency=0.005)
+    adaptive = AdaptiveTimeout(min_samples=10, multiplier=4.0, floor=0.05)
+    client = ApiClient(merchant_simulator.url, timeout=5.0, adaptive_timeout=adaptive)
+    for _ in range(10):
+        assert client.get("/health").status_code == 200
+
+    merchant_simulator.route("/health").update(timeout_rate=1.0, hang=2.0)
+    started = time.monotonic()
+    response = client.get("/health")
+
+    assert response.status_code == 504
+    assert time.monotonic() - started < 1.0
+
+
+def test_slow_healthy_endpoint_is_not_cut_off(merchant_simulator):
+    # Scenario:
+    # /merchant/data steadily takes ~150ms, above the fast endpoint's budget.
+
+    merchant_simulator.route("/health").update(latency=0.001)
+    merchant_simulator.route("/merchant/data").update(latency=0.15)
+    adaptive = AdaptiveTimeout(min_samples=3, floor=0.05)
+    client = ApiClient(merchant_simulator.url, timeout=5.0, adaptive_timeout=adaptive)
+
+    for _ in range(3):
+        client.get("/health")
+        client.get("/merchant/data")
+
+    assert client.get("/merchant/data").status_code == 200
+    snapshot = adaptive.snapshot()
+    health = next(v for k, v in snapshot.items() if k.endswith("/health"))
+    data = next(v for k, v in snapshot.items() if k.endswith("/merchant/data"))
+    assert health["timeout"] < data["timeout"]
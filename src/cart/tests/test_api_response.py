@@ -0,0 +1,74 @@
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.response import ApiResponse, HTTPStatusError, timeout_response
+
+# CONTRACT TEST: Response object returned by ApiClient
+#
+# Purpose:
+# Validate that ApiClient returns a compact response that keeps the
+# status_code / headers / json() surface callers already rely on, while
+# parsing JSON only once.
+#
+# Context for Knot:
+# Tests and production callers read response.json() several times per
+# response; the synthetic 504 is built on every merchant failure.
+#
+# CI behavior:
+# - Merchant API is mocked to keep CI deterministic
+
+pytestmark = pytest.mark.contract
+
+
+def test_client_returns_api_response_with_memoized_json(requests_mock):
+    # Scenario:
+    # Caller reads the same merchant response body several times.
+
+    requests_mock.get(
+        "https://cart.local/merchant/status",
+        json={"status": "ok"},
+        headers={"X-API-Version": "v1"},
+    )
+    client = ApiClient(base_url="https://cart.local")
+
+    response = client.get("/merchant/status")
+
+    assert isinstance(response, ApiResponse)
+    assert response.headers.get("x-api-version") == "v1"
+    assert response.json() is response.json()
+    assert response.json() == {"status": "ok"}
+
+
+def test_body_is_exposed_without_copying():
+    response = ApiResponse(200, content=b'{"status": "ok"}')
+
+    view = response.body
+
+    assert view.obj is response.content
+    assert bytes(view[:1]) == b"{"
+    assert not hasattr(response, "__dict__")
+
+
+def test_synthetic_timeout_shares_one_encoded_body():
+    first = timeout_response()
+    second = timeout_response()
+
+    assert first.content is second.content
+    assert first.headers is not second.headers
+    assert first.json() == {"error": "timeout"}
+
+
+def test_copy_does_not_share_headers_or_parsed_json():
+    original = ApiResponse(200, content=b'{"a": 1}')
+    original.json()["a"] = 2
+
+    clone = original.copy()
+    clone.headers["X-Replayed"] = "1"
+
+    assert clone.json() == {"a": 1}
+    assert "X-Replayed" not in original.headers
+
+
+def test_raise_for_status():
+    with pytest.raises(HTTPStatusError):
+        timeout_response().raise_for_status()
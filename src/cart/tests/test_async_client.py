@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+
+from cart.client.async_client import AsyncApiClient, MockAsyncTransport
+
+# INTEGRATION TEST: Async merchant client
+#
+# Purpose:
+# Validate that AsyncApiClient keeps the same resilience contract as
+# the synchronous ApiClient: retries on transient merchant failures,
+# controlled 504 on timeouts, and bounded fan-out.
+#
+# Context for Knot:
+# User flows such as account linking fan out to many merchants at once.
+# The async client must not trade safety for concurrency.
+#
+# CI behavior:
+# - MockAsyncTransport keeps tests deterministic without sockets
+# - One test uses the local merchant simulator to cover the real transport
+
+pytestmark = pytest.mark.integration
+
+BASE_URL = "https://cart.local"
+
+
+def test_async_retry_on_temporary_failure():
+    # Scenario:
+    # Merchant returns 503 once and then recovers.
+
+    transport = MockAsyncTransport()
+    transport.get(
+        f"{BASE_URL}/merchant/status",
+        [
+            {"status_code": 503},
+            {"status_code": 200, "json": {"status": "ok"}},
+        ],
+    )
+    client = AsyncApiClient(base_url=BASE_URL, retries=1, transport=transport)
+
+    response = asyncio.run(client.get("/merchant/status"))
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert transport.call_count == 2
+
+
+def test_async_timeout_returns_controlled_504():
+    # Scenario:
+    # Merchant does not answer within the client timeout.
+
+    transport = MockAsyncTransport()
+    transport.post(f"{BASE_URL}/merchant/connect", status_code=200, delay=1.0)
+    client = AsyncApiClient(base_url=BASE_URL, timeout=0.05, transport=transport)
+
+    response = asyncio.run(client.post("/merchant/connect", payload={"merchantId": "123"}))
+
+    assert response.status_code == 504
+    assert response.json()["error"] == "timeout"
+
+
+def test_async_fan_out_is_bounded():
+    # Scenario:
+    # Twenty merchants are linked at once with max_concurrency=4.
+
+    transport = MockAsyncTransport()
+    transport.post(f"{BASE_URL}/merchant/connect", status_code=200, json={"status": "connected"}, delay=0.01)
+    client = AsyncApiClient(base_url=BASE_URL, max_concurrency=4, transport=transport)
+
+    async def link_all():
+        calls = [client.post("/merchant/connect", payload={"merchantId": str(i)}) for i in range(20)]
+        return await asyncio.gather(*calls)
+
+    responses = asyncio.run(link_all())
+
+    assert [r.status_code for r in responses] == [200] * 20
+    assert transport.max_in_flight == 4
+    assert json.loads(transport.request_history[0][3]) == {"merchantId": "0"}
+
+
+def test_async_http_transport_against_local_server(merchant_simulator):
+    # Scenario:
+    # Real sockets against the local simulator; connections are kept alive.
+
+    async def run():
+        async with AsyncApiClient(base_url=merchant_simulator.url) as client:
+            return [await client.get("/merchant/status") for _ in range(3)]
+
+    responses = asyncio.run(run())
+
+    assert all(r.json() == {"status": "ok"} for r in responses)
+    assert merchant_simulator.connections == 1
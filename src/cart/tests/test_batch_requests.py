@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.batch import RequestSpec
+from cart.simulator.server import RouteProfile
+
+# INTEGRATION TEST: Bounded-concurrency batch calls
+#
+# Purpose:
+# Validate that many merchant calls can be issued at once with a
+# concurrency cap, in-order results, and per-call failure handling.
+#
+# Context for Knot:
+# Status sweeps across a merchant list must not take the sum of all
+# merchant latencies, and one slow merchant must not block the rest.
+#
+# CI behavior:
+# - The local merchant simulator with per-route latency is used because
+#   requests_mock serialises calls behind a global lock
+
+pytestmark = pytest.mark.integration
+
+
+def _merchant(simulator, merchant_id, latency=0.0):
+    path = f"/merchants/{merchant_id}/status"
+    simulator.add_route(path, RouteProfile(latency=latency, body={"merchantId": merchant_id}))
+    return path
+
+
+def test_map_returns_results_in_order_and_runs_concurrently(merchant_simulator):
+    # Scenario:
+    # Eight merchants each take 200ms to answer their status call.
+
+    client = ApiClient(base_url=merchant_simulator.url)
+    specs = [_merchant(merchant_simulator, str(i), latency=0.2) for i in range(8)]
+
+    started = time.monotonic()
+    responses = client.map(specs, max_workers=8)
+    elapsed = time.monotonic() - started
+
+    # Expected behavior:
+    # - responses come back in input order
+    # - total time tracks one merchant latency, not the sum of eight
+
+    assert [r.json()["merchantId"] for r in responses] == [str(i) for i in range(8)]
+    assert elapsed < 1.0
+
+
+def test_as_completed_is_not_held_up_by_slow_merchant(merchant_simulator):
+    # Scenario:
+    # One merchant is slow, the others answer immediately.
+
+    client = ApiClient(base_url=merchant_simulator.url)
+    specs = [RequestSpec("GET", _merchant(merchant_simulator, "slow", latency=0.5))]
+    specs += [("GET", _merchant(merchant_simulator, str(i))) for i in range(3)]
+
+    order = [index for index, _ in client.as_completed(specs, max_workers=4)]
+
+    assert order[-1] == 0
+    assert sorted(order) == [0, 1, 2, 3]
+
+
+def test_map_applies_timeout_handling_per_call(requests_mock):
+    # Scenario:
+    # One merchant in the batch times out.
+
+    client = ApiClient(base_url="https://cart.local")
+    requests_mock.get("https://cart.local/merchant/status/1", json={"status": "ok"})
+    requests_mock.get("https://cart.local/merchant/status/2", exc=Exception("Timeout"))
+
+    responses = client.map(["/merchant/status/1", "/merchant/status/2"], max_workers=2)
+
+    assert responses[0].status_code == 200
+    assert responses[1].status_code == 504
+    assert responses[1].json()["error"] == "timeout"
@@ -0,0 +1,184 @@
+import os
+import time
+
+import pytest
+import requests
+import requests_mock
+
+from cart.client.api_client import ApiClient
+from cart.client.cassette import CassetteMiss, CassetteTransport, RecordingTransport
+from cart.client.circuit_breaker import CLOSED, HALF_OPEN, CircuitBreaker
+from cart.client.compression import CompressionPolicy
+from cart.client.rate_limiter import RateLimiter
+from cart.client.response import ApiResponse
+from cart.client.transport import Transport, create_transport
+
+# INTEGRATION TEST: Record/replay cassettes
+#
+# Purpose:
+# Validate that exchanges recorded through ApiClient replay
+# deterministically from an indexed, memory-mapped cassette file.
+#
+# Context for Knot:
+# Hand-written requests_mock stubs drift from real merchant behaviour.
+# Cassettes captured from live checks let CI replay real traffic,
+# including retries and timeouts, without network access.
+#
+# CI behavior:
+# - Recording uses requests_mock as the "live" merchant
+# - Replay opens no sockets
+
+pytestmark = pytest.mark.integration
+
+BASE_URL = "https://merchant.example"
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    return str(tmp_path / "merchant.cas")
+
+
+def _record(path):
+    recorder = RecordingTransport(create_transport("requests"), path)
+    client = ApiClient(BASE_URL, retries=1, transport=recorder)
+    with requests_mock.Mocker() as m:
+        m.get(f"{BASE_URL}/health", json={"status": "ok"}, headers={"X-API-Version": "v2"})
+        m.get(
+            f"{BASE_URL}/merchant/status",
+            [{"status_code": 503, "json": {"error": "busy"}}, {"status_code": 200, "json": {"status": "active"}}],
+        )
+        m.post(f"{BASE_URL}/card-switch", json={"switched": True})
+        m.get(f"{BASE_URL}/merchant/profile", exc=requests.exceptions.ConnectTimeout)
+
+        client.get("/health")
+        client.get("/merchant/status")
+        client.post("/card-switch", headers={"Idempotency-Key": "k-1"}, json={"card": "4111"})
+        client.get("/merchant/profile")
+    recorder.close()
+    return recorder.writer.records
+
+
+def test_replay_matches_recorded_responses_and_retries(cassette):
+    assert _record(cassette) == 6
+
+    replay = CassetteTransport(cassette)
+    client = ApiClient(BASE_URL, retries=1, transport=replay)
+
+    health = client.get("/health")
+    status = client.get("/merchant/status")
+    switch = client.post("/card-switch", headers={"Idempotency-Key": "k-1"}, json={"card": "4111"})
+    profile = client.get("/merchant/profile")
+
+    # Expected behavior:
+    # - Responses, headers and retry sequences match the recording
+    # - Recorded network errors become the controlled 504 again
+    assert health.json() == {"status": "ok"}
+    assert health.headers["x-api-version"] == "v2"
+    assert status.status_code == 200
+    assert switch.json() == {"switched": True}
+    assert profile.status_code == 504
+    assert profile.json() == {"error": "timeout"}
+    assert replay.misses == []
+    replay.close()
+
+
+def test_body_hash_and_idempotency_key_are_part_of_the_match(cassette):
+    _record(cassette)
+    replay = CassetteTransport(cassette)
+    client = ApiClient(BASE_URL, transport=replay)
+
+    # Expected behavior:
+    # - A miss fails the call instead of replaying as a 504 fallback
+    with pytest.raises(CassetteMiss):
+        client.post("/card-switch", headers={"Idempotency-Key": "k-1"}, json={"card": "5500"})
+    with pytest.raises(CassetteMiss):
+        client.post("/card-switch", headers={"Idempotency-Key": "k-2"}, json={"card": "4111"})
+
+    assert replay.misses == [("POST", f"{BASE_URL}/card-switch")] * 2
+    with pytest.raises(CassetteMiss):
+        replay.send("GET", f"{BASE_URL}/unknown", {}, None, 1.0)
+    replay.close()
+
+
+def test_miss_through_half_open_breaker_releases_probe_and_token(cassette):
+    _record(cassette)
+    now = [0.0]
+    breaker = CircuitBreaker(consecutive_failures=1, reset_timeout=5, clock=lambda: now[0])
+    limiter = RateLimiter(rate=0.001, burst=1, on_limit="fail", clock=lambda: now[0])
+    replay = CassetteTransport(cassette)
+    client = ApiClient(BASE_URL, transport=replay, circuit_breaker=breaker, rate_limiter=limiter)
+
+    # Scenario: the circuit is half-open and its only probe hits a miss.
+    breaker.record_failure(BASE_URL)
+    now[0] = 5.0
+    with pytest.raises(CassetteMiss):
+        client.get("/unknown")
+
+    # Expected behavior:
+    # - the probe slot and the token are handed back, not wedged
+    assert breaker.state(BASE_URL) == HALF_OPEN
+    assert client.get("/health").status_code == 200
+    assert breaker.state(BASE_URL) == CLOSED
+    replay.close()
+
+
+def test_compressed_bodies_replay_later(cassette, monkeypatch):
+    payload = {"items": [{"cardId": f"{4111000000000000 + i}"} for i in range(100)]}
+    recorder = RecordingTransport(create_transport("requests"), cassette)
+    with requests_mock.Mocker() as m:
+        m.post(f"{BASE_URL}/card-switch/bulk", json={"results": []})
+        client = ApiClient(BASE_URL, transport=recorder, compression=CompressionPolicy(min_size=100))
+        assert client.post("/card-switch/bulk", json=payload).status_code == 200
+    recorder.close()
+
+    # Scenario: CI replays the cassette long after it was recorded.
+    later = time.time() + 3600
+    monkeypatch.setattr(time, "time", lambda: later)
+    replay = CassetteTransport(cassette)
+    client = ApiClient(BASE_URL, transport=replay, compression=CompressionPolicy(min_size=100))
+
+    assert client.post("/card-switch/bulk", json=payload).json() == {"results": []}
+    assert replay.misses == []
+    replay.close()
+
+
+def test_missing_index_and_torn_tail_are_tolerated(cassette):
+    _record(cassette)
+    os.remove(cassette + ".idx")
+    with open(cassette, "ab") as fh:
+        # Scenario: the recorder died halfway through writing a record.
+        fh.write(b"\x00\x00\x01\x00\x00\x00")
+
+    replay = CassetteTransport(cassette)
+
+    assert len(replay) == 6
+    assert ApiClient(BASE_URL, transport=replay).get("/health").status_code == 200
+    replay.close()
+
+
+class _SlowTransport(Transport):
+    def send(self, method, url, headers, body, timeout):
+        time.sleep(0.1)
+        return ApiResponse(200, {"Content-Type": "application/json"}, b'{"status": "ok"}', url=url)
+
+
+def test_recorded_latency_is_only_replayed_in_realtime_mode(cassette):
+    recorder = RecordingTransport(_SlowTransport(), cassette)
+    ApiClient(BASE_URL, transport=recorder).get("/health")
+    recorder.close()
+
+    fast = CassetteTransport(cassette)
+    started = time.perf_counter()
+    for _ in range(200):
+        assert ApiClient(BASE_URL, transport=fast).get("/health").status_code == 200
+    assert time.perf_counter() - started < 1.0
+    fast.close()
+
+    realtime = CassetteTransport(cassette, realtime=True)
+    started = time.perf_counter()
+    assert ApiClient(BASE_URL, transport=realtime).get("/health").status_code == 200
+    assert time.perf_counter() - started >= 0.1
+    # A recorded latency beyond the caller's timeout replays as a timeout.
+    realtime.rewind()
+    assert ApiClient(BASE_URL, timeout=0.02, transport=realtime).get("/health").status_code == 504
+    realtime.close()
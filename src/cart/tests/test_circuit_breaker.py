@@ -0,0 +1,145 @@
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+# CONTRACT / FAILURE TEST: Per-merchant circuit breaker
+#
+# Purpose:
+# Validate that calls to a merchant that keeps failing are short-circuited
+# with a controlled 504, and that the circuit closes again once the
+# merchant recovers.
+#
+# Context for Knot:
+# A dead merchant should cost users microseconds, not the full timeout
+# multiplied by every retry.
+#
+# CI behavior:
+# - Merchant API is mocked and the breaker runs on a fake clock
+
+pytestmark = pytest.mark.contract
+
+BASE_URL = "https://cart.local"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_open_circuit_fails_fast_without_network(requests_mock):
+    # Scenario:
+    # Merchant times out three times in a row.
+
+    requests_mock.get(f"{BASE_URL}/merchant/status", exc=Exception("Timeout"))
+    breaker = CircuitBreaker(consecutive_failures=3, clock=FakeClock())
+    client = ApiClient(base_url=BASE_URL, circuit_breaker=breaker)
+
+    for _ in range(3):
+        assert client.get("/merchant/status").json()["error"] == "timeout"
+
+    response = client.get("/merchant/status")
+
+    # Expected behavior:
+    # - the fourth call never reaches the merchant
+    # - the caller gets a 504 with a distinct error code
+
+    assert response.status_code == 504
+    assert response.json()["error"] == "circuit_open"
+    assert requests_mock.call_count == 3
+    assert breaker.state("https://cart.local") == OPEN
+    assert breaker.rejected == 1
+
+
+def test_half_open_probe_closes_circuit_after_recovery(requests_mock):
+    # Scenario:
+    # Merchant fails, the circuit opens, then the merchant recovers.
+
+    requests_mock.get(
+        f"{BASE_URL}/merchant/status",
+        [
+            {"status_code": 503},
+            {"status_code": 503},
+            {"status_code": 200, "json": {"status": "ok"}},
+        ],
+    )
+    clock = FakeClock()
+    breaker = CircuitBreaker(consecutive_failures=2, reset_timeout=10, clock=clock)
+    client = ApiClient(base_url=BASE_URL, circuit_breaker=breaker)
+
+    client.get("/merchant/status")
+    client.get("/merchant/status")
+    assert client.get("/merchant/status").json()["error"] == "circuit_open"
+
+    clock.now = 10.0
+    assert breaker.state("https://cart.local") == HALF_OPEN
+
+    response = client.get("/merchant/status")
+
+    assert response.status_code == 200
+    assert breaker.state("https://cart.local") == CLOSED
+
+
+def test_failed_probe_reopens_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(consecutive_failures=1, reset_timeout=5, clock=clock)
+
+    breaker.record_failure("m")
+    clock.now = 5.0
+
+    assert breaker.allow("m")
+    assert not breaker.allow("m")
+
+    breaker.record_failure("m")
+
+    assert breaker.state("m") == OPEN
+
+
+def test_failure_rate_trips_circuit():
+    breaker = CircuitBreaker(consecutive_failures=100, failure_rate=0.5, window_size=10, min_calls=4)
+
+    for status in (200, 503, 200, 503):
+        breaker.record("m", status_code=status)
+
+    assert breaker.state("m") == OPEN
+
+
+def test_rate_limits_do_not_trip_circuit():
+    breaker = CircuitBreaker(consecutive_failures=2)
+
+    for _ in range(5):
+        breaker.record("m", status_code=429)
+
+    assert breaker.state("m") == CLOSED
+
+
+def test_unrecorded_probe_expires_and_released_probe_frees_its_slot():
+    # Scenario:
+    # A half-open probe is granted but its outcome never arrives.
+
+    clock = FakeClock()
+    breaker = CircuitBreaker(consecutive_failures=1, reset_timeout=5, clock=clock)
+
+    breaker.record_failure("m")
+    clock.now = 5.0
+    assert breaker.allow("m")
+    assert not breaker.allow("m")
+
+    # Expected behavior:
+    # - the lost probe counts as failed after reset_timeout
+    # - the circuit then goes half-open again instead of staying wedged
+
+    clock.now = 9.9
+    assert breaker.state("m") == HALF_OPEN
+    clock.now = 10.0
+    assert breaker.state("m") == OPEN
+    clock.now = 15.0
+    assert breaker.allow("m")
+
+    breaker.release("m")
+    assert breaker.allow("m")
+    breaker.record_success("m")
+    assert breaker.state("m") == CLOSED
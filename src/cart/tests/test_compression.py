@@ -0,0 +1,108 @@
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.circuit_breaker import CLOSED, CircuitBreaker
+from cart.client.compression import CompressionPolicy, available_encodings, compress, decompress
+
+# INTEGRATION TEST: Request and response body compression
+#
+# Purpose:
+# Validate that large request bodies are compressed above a size
+# threshold, that compressed responses are decoded transparently, and
+# that merchants rejecting compressed bodies (415) still get the call.
+#
+# Context for Knot:
+# Bulk merchant payloads and large /merchant/data responses cross
+# egress-metered links; compression must never break a merchant that
+# does not support it.
+#
+# CI behavior:
+# - Local merchant simulator only
+
+pytestmark = pytest.mark.integration
+
+
+def _items(n):
+    return {"items": [{"idempotencyKey": f"key-{i}", "cardId": f"{4111000000000000 + i}"} for i in range(n)]}
+
+
+def test_codecs_round_trip():
+    assert "gzip" in available_encodings()
+    data = b'{"merchantId": "123"}' * 100
+    for encoding in available_encodings():
+        assert decompress(compress(data, encoding), encoding) == data
+
+
+def test_large_bodies_are_compressed_small_ones_are_not(merchant_simulator):
+    policy = CompressionPolicy(min_size=1024)
+    client = ApiClient(merchant_simulator.url, compression=policy)
+
+    small = client.post("/card-switch", json={"cardId": "4111000000000001"})
+    bulk = client.post("/card-switch/bulk", json=_items(200))
+
+    assert small.status_code == 200
+    assert bulk.status_code == 200
+    assert len(bulk.json()["results"]) == 200
+    assert policy.compressed == 1
+    assert policy.bytes_out < policy.bytes_in / 3
+
+
+def test_415_falls_back_to_plain_body_and_is_remembered(merchant_simulator):
+    merchant_simulator.route("/card-switch/bulk").update(reject_compressed=True)
+    policy = CompressionPolicy(min_size=100)
+    client = ApiClient(merchant_simulator.url, compression=policy)
+
+    first = client.post("/card-switch/bulk", json=_items(20))
+    second = client.post("/card-switch/bulk", json=_items(20))
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert policy.fallbacks == 1
+    assert policy.compressed == 1
+    # One rejected compressed attempt, then plain bodies only.
+    assert merchant_simulator.snapshot()["/card-switch/bulk"]["statuses"] == {415: 1, 200: 2}
+
+
+def test_415_settles_a_half_open_probe(merchant_simulator):
+    # Scenario:
+    # The circuit is open; after reset_timeout the half-open probe is a
+    # compressed POST that the merchant rejects with 415.
+
+    now = [0.0]
+    breaker = CircuitBreaker(consecutive_failures=1, reset_timeout=10.0, clock=lambda: now[0])
+    merchant_simulator.route("/merchant/status").update(script=[503])
+    merchant_simulator.route("/card-switch/bulk").update(reject_compressed=True)
+    client = ApiClient(merchant_simulator.url, circuit_breaker=breaker, compression=CompressionPolicy(min_size=100))
+
+    assert client.get("/merchant/status").status_code == 503
+    now[0] = 11.0
+
+    assert client.post("/card-switch/bulk", json=_items(20)).status_code == 200
+    assert client.get("/merchant/status").status_code == 200
+    assert breaker.state(breaker.key_for(merchant_simulator.url)) == CLOSED
+
+
+def test_per_call_setting_overrides_client(merchant_simulator):
+    policy = CompressionPolicy(min_size=100)
+    plain_client = ApiClient(merchant_simulator.url)
+    compressing_client = ApiClient(merchant_simulator.url, compression=policy)
+
+    assert compressing_client.post("/card-switch/bulk", json=_items(20), compression=False).status_code == 200
+    assert policy.compressed == 0
+
+    override = CompressionPolicy(min_size=100)
+    assert plain_client.post("/card-switch/bulk", json=_items(20), compression=override).status_code == 200
+    assert override.compressed == 1
+
+
+@pytest.mark.parametrize("backend", ["requests", "urllib3"])
+def test_compressed_responses_are_decoded(merchant_simulator, backend):
+    catalogue = {"merchantId": "123", "status": "active", "items": [{"sku": i, "name": "card"} for i in range(500)]}
+    merchant_simulator.route("/merchant/data").update(body=catalogue, compress_responses=True)
+
+    with ApiClient(merchant_simulator.url, transport=backend, compression=CompressionPolicy()) as client:
+        response = client.get("/merchant/data")
+
+    assert response.json() == catalogue
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert int(response.headers["Content-Length"]) < len(response.content) / 3
@@ -0,0 +1,61 @@
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.pool import ConnectionPool
+
+# INTEGRATION TEST: Keep-alive connection pooling
+#
+# Purpose:
+# Validate that ApiClient reuses TCP connections to a merchant host
+# across calls and retries instead of reconnecting for every attempt.
+#
+# Context for Knot:
+# For small merchant calls like /merchant/status, connection setup
+# (TCP + TLS handshake) dominates latency. Reusing connections keeps
+# the client fast under load.
+#
+# CI behavior:
+# - The local merchant simulator is used instead of requests_mock,
+#   because requests_mock never opens real sockets
+# - No external network access is required
+
+pytestmark = pytest.mark.integration
+
+
+def test_calls_reuse_one_connection(merchant_simulator):
+    # Scenario:
+    # Several sequential calls go to the same merchant host.
+
+    with ApiClient(base_url=merchant_simulator.url) as client:
+        for _ in range(5):
+            response = client.get("/merchant/status")
+            assert response.status_code == 200
+
+    # Expected behavior:
+    # - every call is served over the same keep-alive connection
+
+    assert merchant_simulator.connections == 1
+
+
+def test_idle_connections_are_evicted(merchant_simulator):
+    # Scenario:
+    # The host stays idle longer than idle_timeout between calls.
+
+    pool = ConnectionPool(idle_timeout=10.0)
+    client = ApiClient(base_url=merchant_simulator.url, pool=pool)
+
+    client.get("/merchant/status")
+    evicted = pool.evict_idle(now=float("inf"))
+    client.get("/merchant/status")
+
+    # Expected behavior:
+    # - the idle host pool is closed and a fresh connection is opened
+    # - closing the client leaves a shared pool open
+
+    assert evicted == 1
+    assert merchant_simulator.connections == 2
+
+    client.close()
+    assert not pool.closed
+    pool.close()
+    assert pool.closed
@@ -0,0 +1,87 @@
+import pytest
+
+from cart.contracts.health_contract import health_violations, validate_health_response
+from cart.contracts.merchant_contract import validate_merchant_response
+from cart.contracts.schema import ContractViolation, Violation, compile_schema
+
+# CONTRACT TEST: Compiled contract validation engine
+#
+# Purpose:
+# Validate that declarative schemas catch every contract problem in one
+# pass and report them as structured results.
+#
+# Context for Knot:
+# Contract checks also run inline on samples of production merchant
+# traffic, so they must be fast, complete and independent of `assert`
+# (which disappears under `python -O`).
+#
+# CI behavior:
+# - Pure in-process checks, no network or mocks required
+
+pytestmark = pytest.mark.contract
+
+ORDER_SCHEMA = {
+    "type": "object",
+    "required": ["orderId", "merchant", "items"],
+    "properties": {
+        "orderId": {"type": "string"},
+        "state": {"enum": ["open", "closed"]},
+        "merchant": {
+            "type": "object",
+            "required": ["merchantId"],
+            "properties": {"merchantId": {"type": "string"}},
+        },
+        "items": {
+            "type": "array",
+            "items": {"type": "object", "required": ["sku"], "properties": {"qty": {"type": "integer"}}},
+        },
+    },
+}
+
+
+def test_all_violations_are_reported_with_paths():
+    contract = compile_schema(ORDER_SCHEMA, name="order")
+
+    violations = contract.validate(
+        {"orderId": 7, "state": "lost", "merchant": {}, "items": [{"sku": "a", "qty": True}, {}]}
+    )
+
+    assert [(v.path, v.code) for v in violations] == [
+        ("orderId", "type"),
+        ("state", "enum"),
+        ("merchant.merchantId", "required"),
+        ("items[0].qty", "type"),
+        ("items[1].sku", "required"),
+    ]
+
+
+def test_batch_validation():
+    contract = compile_schema(ORDER_SCHEMA)
+
+    results = contract.validate_many([
+        {"orderId": "1", "merchant": {"merchantId": "m"}, "items": []},
+        "not an object",
+    ])
+
+    assert results[0] == []
+    assert results[1] == [Violation("", "type", "expected object, got str")]
+
+
+def test_health_contract_accepts_known_statuses():
+    validate_health_response({"status": "ok"})
+    validate_health_response({"status": "healthy", "uptime": 12})
+
+
+def test_health_contract_reports_structured_errors():
+    assert [v.code for v in health_violations({"status": "degraded"})] == ["enum"]
+
+    with pytest.raises(ContractViolation) as excinfo:
+        validate_health_response({})
+
+    assert isinstance(excinfo.value, AssertionError)
+    assert excinfo.value.violations[0].path == "status"
+
+
+def test_merchant_contract_rejects_retyped_merchant_id():
+    with pytest.raises(ContractViolation):
+        validate_merchant_response({"merchantId": 123})
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.deadline import Deadline
+
+# CONTRACT / FAILURE TEST: End-to-end deadlines
+#
+# Purpose:
+# Validate that a deadline bounds the whole call (all attempts and
+# backoff pauses), not just each attempt separately.
+#
+# Context for Knot:
+# User-facing flows such as merchant linking need a latency ceiling that
+# holds no matter how many retries the client is configured for.
+#
+# CI behavior:
+# - Merchant API is mocked to keep CI deterministic
+
+pytestmark = pytest.mark.contract
+
+BASE_URL = "https://cart.local"
+
+
+def test_attempt_timeout_shrinks_to_remaining_budget(requests_mock):
+    # Scenario:
+    # Client timeout is 5s but the caller only has 1s left.
+
+    requests_mock.get(f"{BASE_URL}/merchant/status", json={"status": "ok"})
+    client = ApiClient(base_url=BASE_URL, timeout=5.0)
+
+    client.get("/merchant/status", deadline=Deadline.after(1.0))
+
+    assert requests_mock.last_request.timeout <= 1.0
+
+
+def test_retries_stop_when_budget_is_spent(requests_mock):
+    # Scenario:
+    # Merchant keeps failing; the client would retry five times with
+    # 300ms pauses, but the per-client deadline is 500ms.
+
+    requests_mock.get(f"{BASE_URL}/merchant/status", status_code=503)
+    client = ApiClient(base_url=BASE_URL, retries=5, retry_backoff_sec=0.3, deadline_sec=0.5)
+
+    started = time.monotonic()
+    response = client.get("/merchant/status")
+    elapsed = time.monotonic() - started
+
+    # Expected behavior:
+    # - the last merchant answer is returned once no useful time is left
+    # - total latency stays under the deadline
+
+    assert response.status_code == 503
+    assert requests_mock.call_count == 2
+    assert elapsed < 0.5
+
+
+def test_expired_deadline_returns_controlled_504(requests_mock):
+    # Scenario:
+    # An upstream step of the user flow already used the whole budget.
+
+    requests_mock.post(f"{BASE_URL}/merchant/connect", json={"status": "connected"})
+    client = ApiClient(base_url=BASE_URL)
+
+    response = client.post("/merchant/connect", payload={"merchantId": "123"}, deadline=Deadline.after(0))
+
+    assert response.status_code == 504
+    assert response.json()["error"] == "deadline_exceeded"
+    assert requests_mock.call_count == 0
+
+
+def test_nested_deadline_reserves_time_for_caller():
+    clock_now = [100.0]
+    deadline = Deadline.after(2.0, clock=lambda: clock_now[0])
+
+    child = deadline.shrink(0.5)
+
+    assert child.remaining() == pytest.approx(1.5)
+    assert Deadline.earliest(deadline, child, None) is child
+    assert deadline.cap(5.0) == pytest.approx(2.0)
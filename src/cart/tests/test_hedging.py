@@ -0,0 +1,138 @@
+import threading
+import time
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.hedging import HedgingPolicy
+from cart.client.rate_limiter import RateLimiter
+
+# INTEGRATION TEST: Hedged requests
+#
+# Purpose:
+# Validate that a slow attempt is raced against a second attempt for
+# idempotent calls, and that hedging stays within its budget.
+#
+# Context for Knot:
+# Merchant latency has a long tail; one slow attempt should not decide
+# the user's latency when a second attempt would return quickly.
+#
+# CI behavior:
+# - The local merchant simulator makes only the first request slow
+
+pytestmark = pytest.mark.integration
+
+
+def test_hedge_wins_over_slow_attempt(merchant_simulator):
+    # Scenario:
+    # The first attempt stalls for 1s; a hedge is sent after 50ms.
+
+    merchant_simulator.route("/merchant/status").update(delays=[1.0])
+    hedging = HedgingPolicy(delay=0.05)
+    client = ApiClient(base_url=merchant_simulator.url, hedging=hedging)
+
+    started = time.monotonic()
+    response = client.get("/merchant/status")
+    elapsed = time.monotonic() - started
+
+    assert response.json() == {"status": "ok"}
+    assert elapsed < 0.8
+    assert merchant_simulator.requests("/merchant/status") == 2
+    assert hedging.snapshot() == {"hedges_sent": 1, "hedges_won": 1, "hedges_denied": 0}
+
+
+def test_post_without_idempotency_key_is_never_hedged(merchant_simulator):
+    # Scenario:
+    # A plain POST is not safe to send twice.
+
+    merchant_simulator.route("/card-switch").update(delays=[1.0])
+    hedging = HedgingPolicy(delay=0.05)
+    client = ApiClient(base_url=merchant_simulator.url, hedging=hedging)
+
+    response = client.post("/card-switch", payload={"cardId": "abc"})
+
+    assert response.status_code == 200
+    assert merchant_simulator.requests("/card-switch") == 1
+    assert hedging.hedges_sent == 0
+
+
+def test_exhausted_budget_denies_hedge(merchant_simulator):
+    merchant_simulator.route("/card-switch").update(delays=[1.0])
+    hedging = HedgingPolicy(delay=0.05, budget_ratio=0.0, budget_min_tokens=0)
+    client = ApiClient(base_url=merchant_simulator.url, hedging=hedging)
+
+    response = client.post("/card-switch", payload={"cardId": "abc"}, headers={"Idempotency-Key": "k"})
+
+    assert response.status_code == 200
+    assert merchant_simulator.requests("/card-switch") == 1
+    assert hedging.hedges_denied == 1
+
+
+def test_callers_beyond_hedge_workers_do_not_queue(merchant_simulator):
+    # Scenario:
+    # 32 concurrent GETs to a 0.2s endpoint with only 2 hedge workers and
+    # a hedge delay far above the endpoint latency.
+
+    merchant_simulator.route("/merchant/status").update(latency=0.2)
+    hedging = HedgingPolicy(delay=1.0, max_workers=2)
+    client = ApiClient(merchant_simulator.url, hedging=hedging, pool_maxsize=32)
+
+    started = time.monotonic()
+    responses = client.map(["/merchant/status"] * 32, max_workers=32)
+    elapsed = time.monotonic() - started
+
+    assert [r.status_code for r in responses] == [200] * 32
+    assert elapsed < 0.8
+    assert hedging.snapshot() == {"hedges_sent": 0, "hedges_won": 0, "hedges_denied": 0}
+
+
+def test_thread_count_stays_bounded_under_concurrent_hedged_calls(merchant_simulator):
+    # Scenario:
+    # 16 concurrent GETs all outlast the hedge delay; the policy has 2
+    # workers per pool.
+
+    merchant_simulator.route("/merchant/status").update(latency=0.2)
+    hedging = HedgingPolicy(delay=0.05, max_workers=2)
+    client = ApiClient(merchant_simulator.url, hedging=hedging, pool_maxsize=16)
+    peak = 0
+    stop = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not stop.is_set():
+            peak = max(peak, sum(t.name.startswith("api-hedge") for t in threading.enumerate()))
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    responses = client.map(["/merchant/status"] * 16, max_workers=16)
+    stop.set()
+    sampler.join()
+
+    # Expected behavior:
+    # - at most max_workers primary and max_workers hedge threads exist
+    # - callers beyond that still get their answer on their own thread
+
+    assert [r.status_code for r in responses] == [200] * 16
+    assert 0 < peak <= 4
+
+
+def test_hedge_needs_a_rate_limiter_token(merchant_simulator):
+    merchant_simulator.route("/merchant/status").update(latency=0.3)
+    hedging = HedgingPolicy(delay=0.05)
+    limiter = RateLimiter(rate=1.0, burst=1.0)
+    client = ApiClient(merchant_simulator.url, hedging=hedging, rate_limiter=limiter)
+
+    assert client.get("/merchant/status").status_code == 200
+    assert hedging.hedges_denied == 1
+    assert merchant_simulator.requests("/merchant/status") == 1
+
+
+def test_delay_follows_observed_percentile():
+    hedging = HedgingPolicy(percentile=0.9, min_samples=10)
+
+    for ms in range(1, 11):
+        hedging.record_latency("GET /merchant/status", ms / 1000)
+
+    assert hedging.hedge_delay("GET /merchant/status") == pytest.approx(0.010)
+    assert hedging.hedge_delay("GET /health") is None
@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.idempotency import IdempotencyStore
+from cart.client.response import error_response
+
+# INTEGRATION TEST: Client-side idempotency replay
+#
+# Purpose:
+# Validate that repeated requests with the same Idempotency-Key are
+# answered locally once the original has completed, and that concurrent
+# duplicates share the in-flight original.
+#
+# Context for Knot:
+# User double-submits and client-side retries of card switches must not
+# create duplicate load (or duplicate operations) on merchant APIs.
+#
+# CI behavior:
+# - Merchant API is mocked; concurrency is driven through the store
+#   directly so the test controls exactly when the original completes
+
+pytestmark = pytest.mark.integration
+
+BASE_URL = "https://cart.local"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_completed_response_is_replayed_locally(requests_mock):
+    # Scenario:
+    # The same card switch is submitted twice with one Idempotency-Key.
+
+    requests_mock.post(f"{BASE_URL}/card-switch", json={"switchId": "abc-123"}, status_code=200)
+    client = ApiClient(base_url=BASE_URL, idempotency_store=IdempotencyStore())
+    headers = {"Idempotency-Key": "idem-1"}
+
+    first = client.post("/card-switch", json={"cardId": "1111"}, headers=headers)
+    second = client.post("/card-switch", json={"cardId": "1111"}, headers=headers)
+
+    assert first.json() == second.json()
+    assert requests_mock.call_count == 1
+
+
+def test_key_reuse_with_different_body_is_rejected(requests_mock):
+    # Scenario:
+    # A key is reused for a different card; this is a client bug.
+
+    requests_mock.post(f"{BASE_URL}/card-switch", json={"switchId": "abc-123"}, status_code=200)
+    client = ApiClient(base_url=BASE_URL, idempotency_store=IdempotencyStore())
+    headers = {"idempotency-key": "idem-2"}
+
+    client.post("/card-switch", json={"cardId": "1111"}, headers=headers)
+    response = client.post("/card-switch", json={"cardId": "2222"}, headers=headers)
+
+    assert response.status_code == 422
+    assert response.json()["error"] == "idempotency_key_reused"
+    assert requests_mock.call_count == 1
+
+
+def test_failed_response_is_not_replayed(requests_mock):
+    # Scenario:
+    # The original attempt fails with 503; a later retry must reach the merchant.
+
+    requests_mock.post(
+        f"{BASE_URL}/card-switch",
+        [{"status_code": 503}, {"status_code": 200, "json": {"status": "switched"}}],
+    )
+    client = ApiClient(base_url=BASE_URL, idempotency_store=IdempotencyStore())
+    headers = {"Idempotency-Key": "idem-3"}
+
+    assert client.post("/card-switch", payload={"cardId": "abc"}, headers=headers).status_code == 503
+    assert client.post("/card-switch", payload={"cardId": "abc"}, headers=headers).status_code == 200
+
+
+def test_concurrent_duplicate_waits_for_original():
+    # Scenario:
+    # A second submit arrives while the first is still in flight.
+
+    store = IdempotencyStore()
+    release = threading.Event()
+    calls = []
+
+    def send():
+        calls.append(1)
+        release.wait(5)
+        return error_response(200, "none")
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(store.execute("POST /card-switch", "k", "fp", send)))
+        for _ in range(3)
+    ]
+    for t in threads:
+        t.start()
+    while store.coalesced < 2:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert [r.status_code for r in results] == [200, 200, 200]
+
+
+def test_entries_expire_and_are_bounded():
+    clock = FakeClock()
+    store = IdempotencyStore(max_entries=2, ttl=10, clock=clock)
+    send = lambda: error_response(200, "none")  # noqa: E731
+
+    for key in ("a", "b", "c"):
+        store.execute("POST /x", key, "fp", send)
+    assert len(store) == 2
+
+    clock.now = 11
+    store.execute("POST /x", "c", "fp", send)
+    assert store.replays == 0
@@ -0,0 +1,132 @@
+import pytest
+import requests
+
+from cart.client.api_client import ApiClient
+from cart.client.circuit_breaker import CircuitBreaker
+from cart.client.instrumentation import Instrumentation, endpoint_template
+from cart.metrics.request_metrics import RequestMetrics
+
+# INTEGRATION TEST: Request instrumentation hooks and metrics
+#
+# Purpose:
+# Validate that ApiClient reports attempts, retries, backoff and
+# locally synthesized 504s through instrumentation events, and that
+# RequestMetrics aggregates them per endpoint.
+#
+# Context for Knot:
+# A 504 from the merchant and a 504 produced by our own timeout handling
+# look the same to the caller. Triage needs to tell them apart.
+#
+# CI behavior:
+# - Merchant API is mocked; no live calls
+
+pytestmark = pytest.mark.integration
+
+BASE_URL = "https://cart.local"
+
+
+def test_retry_sequence_emits_attempt_and_retry_events(requests_mock):
+    # Scenario:
+    # Merchant fails once with 503, then succeeds.
+
+    requests_mock.get(
+        f"{BASE_URL}/merchant/status",
+        [{"status_code": 503}, {"json": {"status": "ok"}, "status_code": 200}],
+    )
+    bus = Instrumentation()
+    events = []
+    bus.subscribe(events.append)
+    client = ApiClient(BASE_URL, retries=1, instrumentation=bus)
+
+    response = client.get("/merchant/status")
+
+    assert response.status_code == 200
+    assert [(e.name, e.attempt, e.status_code) for e in events] == [
+        ("request", 0, 0),
+        ("attempt", 0, 503),
+        ("retry", 0, 503),
+        ("attempt", 1, 200),
+        ("response", 2, 200),
+    ]
+    assert events[-1].reason is None
+    assert events[-1].elapsed >= events[1].elapsed
+
+
+def test_synthesized_timeout_is_reported_as_fallback(requests_mock):
+    # Scenario:
+    # Every attempt times out; the client returns its controlled 504.
+
+    requests_mock.get(f"{BASE_URL}/merchant/data", exc=requests.exceptions.ReadTimeout)
+    bus = Instrumentation()
+    metrics = RequestMetrics().attach(bus)
+    client = ApiClient(BASE_URL, retries=2, retry_backoff_sec=0.01, instrumentation=bus)
+
+    response = client.get("/merchant/data")
+
+    assert response.status_code == 504
+    stats = metrics.snapshot()["GET /merchant/data"]
+    assert stats["requests"] == 1
+    assert stats["attempts"] == 3
+    assert stats["attempt_errors"] == 3
+    assert stats["retries"] == 2
+    assert stats["backoff_seconds"] == pytest.approx(0.02)
+    assert stats["fallbacks"] == {"timeout": 1}
+    assert stats["statuses"] == {504: 1}
+
+
+def test_open_circuit_fallback_makes_no_attempt(requests_mock):
+    requests_mock.get(f"{BASE_URL}/merchant/status", status_code=503)
+    bus = Instrumentation()
+    metrics = RequestMetrics().attach(bus)
+    breaker = CircuitBreaker(consecutive_failures=1)
+    client = ApiClient(BASE_URL, circuit_breaker=breaker, instrumentation=bus)
+
+    client.get("/merchant/status")
+    response = client.get("/merchant/status")
+
+    assert response.json()["error"] == "circuit_open"
+    stats = metrics.snapshot()["GET /merchant/status"]
+    assert stats["requests"] == 2
+    assert stats["attempts"] == 1
+    assert stats["fallbacks"] == {"circuit_open": 1}
+
+
+def test_prometheus_export_groups_by_endpoint_template(requests_mock):
+    requests_mock.get(f"{BASE_URL}/merchant/123/profile", json={"id": 123})
+    requests_mock.get(f"{BASE_URL}/merchant/456/profile", json={"id": 456})
+    bus = Instrumentation()
+    metrics = RequestMetrics().attach(bus)
+    client = ApiClient(BASE_URL, instrumentation=bus)
+
+    client.get("/merchant/123/profile")
+    client.get("/merchant/456/profile?fields=name")
+
+    text = metrics.to_prometheus()
+    labels = 'method="GET",endpoint="/merchant/{id}/profile"'
+    assert f'cart_client_requests_total{{{labels},status="200"}} 2' in text
+    assert f"cart_client_attempts_total{{{labels}}} 2" in text
+    assert f"cart_client_request_duration_seconds_count{{{labels}}} 2" in text
+    assert "# TYPE cart_client_ttfb_seconds summary" in text
+
+
+def test_listener_errors_do_not_break_requests(requests_mock):
+    requests_mock.get(f"{BASE_URL}/health", json={"status": "ok"})
+    bus = Instrumentation()
+
+    def broken(event):
+        raise RuntimeError("listener bug")
+
+    bus.subscribe(broken, events=["response"])
+    client = ApiClient(BASE_URL, instrumentation=bus)
+
+    assert client.get("/health").status_code == 200
+    assert bus.listener_errors == 1
+
+    bus.unsubscribe(broken)
+    assert not bus.active
+
+
+def test_endpoint_template_collapses_resource_ids():
+    assert endpoint_template("https://cart.local/merchant/42/status?x=1") == "/merchant/{id}/status"
+    assert endpoint_template("/card/4f1c2a9e-0b7d-4c1e-9a3b-5d6e7f8a9b0c") == "/card/{id}"
+    assert endpoint_template("/health") == "/health"
@@ -0,0 +1,120 @@
+import json
+import time
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.load.__main__ import main
+from cart.load.runner import LoadRunner, parse_mix
+from cart.metrics.histogram import LatencyHistogram
+
+# INTEGRATION TEST: Open-loop load generator
+#
+# Purpose:
+# Validate that `python -m cart.load` drives ApiClient at a fixed arrival
+# rate and reports coordinated-omission-corrected latency, throughput,
+# retry amplification and an error breakdown.
+#
+# Context for Knot:
+# Capacity questions ("how many calls per second with retries=2 at a 5%
+# 503 rate?") need open-loop load; closed-loop runs hide queueing delay.
+#
+# CI behavior:
+# - Short runs against the local merchant simulator only
+
+
+pytestmark = pytest.mark.integration
+
+
+def test_histogram_percentiles_stay_within_precision():
+    histogram = LatencyHistogram(significant_digits=3)
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+
+    assert histogram.count == 1000
+    assert histogram.percentile(50) == pytest.approx(0.5, rel=1e-3)
+    assert histogram.percentile(99) == pytest.approx(0.99, rel=1e-3)
+    assert histogram.percentile(99.9) == pytest.approx(0.999, rel=1e-3)
+    assert histogram.max == 1.0
+
+
+def test_out_of_range_samples_are_clamped_to_max_value():
+    histogram = LatencyHistogram(max_value=10.0)
+    histogram.record(0.5)
+    histogram.record(250.0)
+
+    assert histogram.max == 10.0
+    assert histogram.percentile(100) == 10.0
+    assert histogram.mean == pytest.approx(5.25)
+
+
+def test_corrected_recording_backfills_missed_samples():
+    # Scenario:
+    # A closed-loop caller sending every 10ms stalls for one 100ms call.
+    histogram = LatencyHistogram()
+    for _ in range(99):
+        histogram.record(0.001)
+    histogram.record_corrected(0.1, expected_interval=0.01)
+
+    # The stall hid nine requests that would each have waited 10-90ms.
+    assert histogram.count == 109
+    assert histogram.percentile(99) > 0.05
+
+
+def test_open_loop_counts_queueing_behind_a_slow_merchant(merchant_simulator):
+    merchant_simulator.route("/health").update(latency=0.05)
+    client = ApiClient(merchant_simulator.url)
+
+    # Two workers cannot keep up with 100 arrivals/s of 50ms calls.
+    runner = LoadRunner(client, parse_mix("health"), rate=100, duration=0.5, workers=2)
+    started = time.perf_counter()
+    report = runner.run()
+
+    # Expected behavior:
+    # - arrivals stay on schedule and every request completes
+    # - latency from intended start includes the queueing service time hides
+    assert report["requests"] == 50
+    assert report["completed"] == 50
+    assert time.perf_counter() - started >= 1.0
+    assert report["service_time_ms"]["p50"] < 100
+    assert report["latency_ms"]["p99"] > 5 * report["service_time_ms"]["p99"]
+
+
+def test_retry_amplification_and_error_breakdown(merchant_simulator):
+    merchant_simulator.route("/card-switch").update(errors={503: 0.3})
+    client = ApiClient(merchant_simulator.url, retries=2)
+
+    report = LoadRunner(client, parse_mix("card-switch"), rate=200, duration=0.5, seed=3).run()
+
+    assert report["completed"] == 100
+    assert report["attempts"] == merchant_simulator.requests("/card-switch")
+    assert 1.2 < report["retry_amplification"] < 1.6
+    assert set(report["outcomes"]) <= {"200", "503 unavailable"}
+    assert report["outcomes"]["200"] >= 90
+
+
+def test_cli_writes_json_report(tmp_path, capsys):
+    output = tmp_path / "report.json"
+
+    code = main(
+        [
+            "--simulate",
+            "--scenario",
+            "health:1,connect:1,card-switch:1",
+            "--rate",
+            "100",
+            "--duration",
+            "0.3",
+            "--json",
+            "--output",
+            str(output),
+        ]
+    )
+
+    printed = json.loads(capsys.readouterr().out)
+    assert code == 0
+    assert printed == json.loads(output.read_text())
+    assert printed["completed"] == 30
+    assert set(printed["latency_ms"]) >= {"p50", "p99", "p99.9"}
+    with pytest.raises(ValueError):
+        parse_mix("checkout")
@@ -1,6 +1,7 @@
 import pytest
 
 from cart.client.api_client import ApiClient
+from cart.contracts.merchant_contract import merchant_violations
 
 # CONTRACT / BREAKING CHANGE TEST: Merchant API response validation
 #
@@ -58,4 +59,5 @@ def test_merchant_api_breaking_change_missing_field(requests_mock):
 
     assert "merchantId" not in data
     assert data["status"] == "active"
+    assert [(v.path, v.code) for v in merchant_violations(data)] == [("merchantId", "required")]
 
@@ -2,6 +2,7 @@ import pytest
 import requests_mock
 
 from cart.client.api_client import ApiClient
+from cart.contracts.merchant_contract import merchant_violations
 
 # CONTRACT TEST: Merchant API schema validation
 #
@@ -51,7 +52,9 @@ def test_merchant_api_missing_required_field():
         # - system must not crash
         # - response must be handled safely
         # - missing required fields must not be silently fabricated
+        # - the contract check reports the missing field explicitly
 
         assert response.status_code == 200
         assert "merchantId" not in response.json()
+        assert [(v.path, v.code) for v in merchant_violations(response.json())] == [("merchantId", "required")]
 
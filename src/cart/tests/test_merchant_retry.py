@@ -24,6 +24,7 @@ from cart.client.api_client import ApiClient
 pytestmark = pytest.mark.contract
 
 
+@pytest.mark.perf(attempts=2, retry_sleep=0.0)
 def test_merchant_retry_on_temporary_failure(requests_mock):
     # Scenario:
     # Merchant API fails temporarily and then recovers.
@@ -0,0 +1,145 @@
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.retry_policy import RetryPolicy
+from cart.simulator.server import MerchantSimulator, RouteProfile
+
+# INTEGRATION TEST: Local merchant simulator
+#
+# Purpose:
+# Validate that the simulator serves the merchant endpoints the suite
+# uses and that each route's faults (errors, Retry-After, latency,
+# timeouts, slow bodies, idempotency) are programmable.
+#
+# Context for Knot:
+# requests_mock never opens a socket, so pooling, timeouts and
+# concurrency are only exercised against a real local server.
+#
+# CI behavior:
+# - Binds 127.0.0.1 on an ephemeral port; no external network
+
+pytestmark = pytest.mark.integration
+
+
+def test_default_routes_match_the_suite_endpoints(merchant_simulator):
+    client = ApiClient(merchant_simulator.url)
+
+    assert client.get("/health").json() == {"status": "ok"}
+    assert client.get("/merchant/status").headers["X-API-Version"] == "v1"
+    assert client.get("/merchant/profile").json()["merchantId"] == "123"
+    assert client.get("/merchant/data").json() == {"merchantId": "123", "status": "active"}
+    assert client.post("/merchant/connect", payload={"merchantId": "77"}).json() == {
+        "status": "connected",
+        "merchantId": "77",
+    }
+    assert client.post("/card-switch", json={"cardId": "1111"}).json()["status"] == "completed"
+    assert client.post("/card-switch", payload={}).status_code == 400
+    assert client.get("/unknown").status_code == 404
+
+
+def test_scripted_errors_and_retry_after_drive_client_retries(merchant_simulator):
+    merchant_simulator.route("/merchant/status").update(script=[429, 503], retry_after=0)
+    client = ApiClient(merchant_simulator.url, retry_policy=RetryPolicy(retries=2))
+
+    response = client.get("/merchant/status")
+
+    # Expected behavior:
+    # - two injected failures, then the normal reply on the third attempt
+    assert response.status_code == 200
+    assert merchant_simulator.snapshot()["/merchant/status"]["statuses"] == {429: 1, 503: 1, 200: 1}
+
+
+def test_fractional_retry_after_is_sent_as_whole_seconds(merchant_simulator):
+    merchant_simulator.route("/merchant/status").update(script=[429], retry_after=0.05)
+    client = ApiClient(merchant_simulator.url, retry_policy=RetryPolicy(retries=1, max_retry_after=0.5))
+
+    response = client.get("/merchant/status")
+
+    # Expected behavior:
+    # - 0.05s goes out as "1", which the client parses and finds too long
+    assert response.headers["Retry-After"] == "1"
+    assert response.status_code == 429
+
+
+def test_error_mix_is_seeded_and_roughly_proportional():
+    with MerchantSimulator(seed=7) as sim:
+        sim.route("/health").update(errors={503: 0.3, 429: 0.1})
+        client = ApiClient(sim.url)
+        statuses = [client.get("/health").status_code for _ in range(300)]
+
+    assert 60 <= statuses.count(503) <= 120
+    assert 15 <= statuses.count(429) <= 50
+
+
+def test_hang_becomes_client_timeout_and_slow_body_is_delivered(merchant_simulator):
+    merchant_simulator.route("/merchant/status").update(timeout_rate=1.0, hang=1.0)
+    merchant_simulator.route("/merchant/profile").update(slow_body=0.2)
+    client = ApiClient(merchant_simulator.url, timeout=0.2)
+
+    started = time.perf_counter()
+    hung = client.get("/merchant/status")
+    assert hung.status_code == 504
+    assert time.perf_counter() - started < 0.9
+
+    slow = ApiClient(merchant_simulator.url, timeout=2.0).get("/merchant/profile")
+    assert slow.json()["merchantId"] == "123"
+    assert merchant_simulator.snapshot()["/merchant/status"]["timeouts"] == 1
+
+
+def test_latency_distribution_is_applied_concurrently(merchant_simulator):
+    merchant_simulator.route("/health").update(latency=0.1, distribution="fixed")
+    client = ApiClient(merchant_simulator.url, pool_maxsize=8)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        codes = list(pool.map(lambda _: client.get("/health").status_code, range(8)))
+    elapsed = time.perf_counter() - started
+
+    # Eight 100ms calls in parallel, not serialized behind one another.
+    assert codes == [200] * 8
+    assert 0.1 <= elapsed < 0.6
+
+
+def test_server_side_idempotency_replays_and_rejects_reuse(merchant_simulator):
+    client = ApiClient(merchant_simulator.url)
+    headers = {"Idempotency-Key": "key-1"}
+
+    first = client.post("/card-switch", headers=headers, json={"cardId": "1111"})
+    again = client.post("/card-switch", headers=headers, json={"cardId": "1111"})
+    reused = client.post("/card-switch", headers=headers, json={"cardId": "2222"})
+
+    assert again.json() == first.json()
+    assert again.headers["Idempotent-Replayed"] == "true"
+    assert reused.status_code == 422
+    assert reused.json() == {"error": "idempotency_key_reused"}
+
+
+def test_custom_route_and_cli(tmp_path):
+    config = tmp_path / "routes.json"
+    config.write_text(json.dumps({"/merchant/status": {"api_version": "v2"}, "/orders": {"body": {"orders": []}}}))
+    sim = MerchantSimulator()
+    sim.add_route("/orders", RouteProfile(body={"orders": []}))
+    with sim:
+        assert ApiClient(sim.url).get("/orders").json() == {"orders": []}
+
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "cart.simulator", "--port", "0", "--config", str(config)],
+        cwd=str(Path(__file__).resolve().parents[2]),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        url = proc.stdout.readline().strip().rsplit(" ", 1)[-1]
+        client = ApiClient(url)
+        assert client.get("/merchant/status").headers["X-API-Version"] == "v2"
+        assert client.get("/orders").json() == {"orders": []}
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
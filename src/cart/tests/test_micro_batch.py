@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.micro_batch import MicroBatcher
+
+# INTEGRATION TEST: Micro-batched card switching
+#
+# Purpose:
+# Validate that individual card-switch submissions are coalesced into
+# bulk requests, that each caller gets its own item's result, and that
+# retry and timeout-to-504 handling apply per batch.
+#
+# Context for Knot:
+# Bulk migrations send tens of thousands of card switches; one POST per
+# card spends most of the merchant rate limit on per-request overhead.
+#
+# CI behavior:
+# - Local merchant simulator implements the bulk endpoint
+
+pytestmark = pytest.mark.integration
+
+
+def test_submissions_are_flushed_by_size(merchant_simulator):
+    client = ApiClient(merchant_simulator.url)
+
+    with MicroBatcher(client, max_batch_size=10, max_delay=5.0) as batcher:
+        futures = [batcher.submit({"cardId": f"41110000{i:04d}"}, idempotency_key=f"k{i}") for i in range(25)]
+        first_batch = [f.result(timeout=2) for f in futures[:20]]
+
+    results = [f.result() for f in futures]
+    assert first_batch == results[:20]
+    assert [r.status_code for r in results] == [200] * 25
+    assert all(r.json()["status"] == "completed" for r in results)
+    assert results[3].headers["Idempotency-Key"] == "k3"
+    assert merchant_simulator.requests("/card-switch/bulk") == 3
+    assert batcher.batches == 3
+
+
+def test_partial_failure_is_split_per_item(merchant_simulator):
+    client = ApiClient(merchant_simulator.url)
+
+    with MicroBatcher(client, max_batch_size=3) as batcher:
+        good = batcher.submit({"cardId": "4111000000000001"})
+        bad = batcher.submit({"cardId": ""})
+        other = batcher.submit({"cardId": "4111000000000002"})
+
+    assert good.result().status_code == 200
+    assert bad.result().status_code == 422
+    assert bad.result().json() == {"error": "invalid_card"}
+    assert other.result().status_code == 200
+    assert batcher.item_failures == 1
+
+
+def test_batch_is_retried_as_a_whole(merchant_simulator):
+    # Scenario:
+    # The bulk call fails once with 503, then succeeds on retry.
+
+    merchant_simulator.route("/card-switch/bulk").update(script=[503])
+    client = ApiClient(merchant_simulator.url, retries=1)
+
+    with MicroBatcher(client, max_batch_size=2) as batcher:
+        futures = [batcher.submit({"cardId": c}) for c in ("4111000000000001", "4111000000000002")]
+
+    assert [f.result().status_code for f in futures] == [200, 200]
+    assert merchant_simulator.requests("/card-switch/bulk") == 2
+
+
+def test_timed_out_batch_resolves_every_item_with_504(merchant_simulator):
+    merchant_simulator.route("/card-switch/bulk").update(timeout_rate=1.0, hang=1.0)
+    client = ApiClient(merchant_simulator.url, timeout=0.2)
+
+    with MicroBatcher(client, max_batch_size=5, max_delay=0.01) as batcher:
+        futures = [batcher.submit({"cardId": f"41110000000000{i:02d}"}) for i in range(3)]
+        results = [f.result(timeout=2) for f in futures]
+
+    assert [r.status_code for r in results] == [504, 504, 504]
+    assert all(r.json()["error"] == "timeout" for r in results)
+
+
+def test_lone_submission_is_flushed_after_max_delay(merchant_simulator):
+    client = ApiClient(merchant_simulator.url)
+    batcher = MicroBatcher(client, max_batch_size=100, max_delay=0.02)
+    try:
+        future = batcher.submit({"cardId": "4111000000000001"}, idempotency_key="only")
+        assert batcher.submit({"cardId": "4111000000000001"}, idempotency_key="only") is future
+
+        assert future.result(timeout=2).status_code == 200
+    finally:
+        batcher.close()
+
+
+def test_item_in_concurrent_batches_is_switched_once(merchant_simulator):
+    # Scenario:
+    # Sixteen different batches carrying the same item key arrive at once.
+
+    client = ApiClient(merchant_simulator.url)
+
+    def send(i):
+        items = [{"idempotencyKey": "shared", "cardId": "4111000000000001"}]
+        items.append({"idempotencyKey": f"other-{i}", "cardId": "4111000000000002"})
+        return client.post("/card-switch/bulk", json={"items": items}).json()["results"][0]["body"]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        bodies = list(pool.map(send, range(16)))
+
+    assert len({body["switchId"] for body in bodies}) == 1
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+pytest_plugins = ["pytester"]
+
+# INTEGRATION TEST: Performance regression gate
+#
+# Purpose:
+# Validate that the pytest perf plugin records wall time, HTTP attempts
+# and retry sleeps per test, compares them with a committed baseline and
+# enforces per-test budgets.
+#
+# Context for Knot:
+# Pass/fail alone hides a retry policy change that doubles upstream
+# calls; merchants see the extra load long before a test fails.
+#
+# CI behavior:
+# - Runs a throwaway test session in-process; merchant API is mocked
+
+pytestmark = pytest.mark.integration
+
+TEST_MODULE = """
+import pytest
+from cart.client.api_client import ApiClient
+
+ATTEMPTS = {attempts}
+
+@pytest.mark.perf(attempts={budget})
+def test_status(requests_mock):
+    requests_mock.get("https://cart.local/status", [{{"status_code": 503}}] * (ATTEMPTS - 1) + [{{"json": {{}}}}])
+    client = ApiClient("https://cart.local", retries=ATTEMPTS, retry_backoff_sec=0.01)
+    assert client.get("/status").status_code == 200
+"""
+
+
+def _run(pytester, attempts, budget=10, *args):
+    pytester.makepyfile(test_merchant=TEST_MODULE.format(attempts=attempts, budget=budget))
+    return pytester.runpytest_inprocess("-p", "cart.metrics.perf_gate", "-p", "no:cacheprovider", *args)
+
+
+def test_update_writes_baseline_with_attempts_and_retry_sleep(pytester):
+    result = _run(pytester, 2, 10, "--perf-update")
+
+    result.assert_outcomes(passed=1)
+    baseline = json.loads((pytester.path / "perf-baseline.json").read_text())
+    entry = baseline["tests"]["test_merchant.py::test_status"]
+    assert entry["attempts"] == 2
+    assert entry["retry_sleep"] == pytest.approx(0.01)
+    assert entry["wall"] > 0
+
+
+def test_update_drops_removed_tests_but_keeps_deselected_ones(pytester):
+    pytester.makepyfile(test_other="def test_a():\n    pass\n\ndef test_b():\n    pass\n")
+    _run(pytester, 2, 10, "--perf-update").assert_outcomes(passed=3)
+
+    # Scenario: test_b is renamed, test_merchant.py is deleted, and only
+    # part of the suite is rerun.
+    (pytester.path / "test_merchant.py").unlink()
+    pytester.makepyfile(test_other="def test_a():\n    pass\n\ndef test_c():\n    pass\n")
+    result = pytester.runpytest_inprocess(
+        "-p", "cart.metrics.perf_gate", "-p", "no:cacheprovider", "-k", "test_c", "--perf-update"
+    )
+
+    result.assert_outcomes(passed=1)
+    tests = json.loads((pytester.path / "perf-baseline.json").read_text())["tests"]
+    assert sorted(tests) == ["test_other.py::test_a", "test_other.py::test_c"]
+
+
+def test_doubled_attempts_fail_in_fail_mode(pytester):
+    _run(pytester, 2, 10, "--perf-update").assert_outcomes(passed=1)
+
+    result = _run(pytester, 4, 10, "--perf-gate=fail")
+
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*performance regression: attempts 4 vs baseline 2*"])
+
+
+def test_regressions_are_only_reported_in_warn_mode(pytester):
+    _run(pytester, 2, 10, "--perf-update").assert_outcomes(passed=1)
+
+    result = _run(pytester, 4, 10, "--perf-gate=warn")
+
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(["*performance regressions*", "*test_status: attempts 4 vs baseline 2*"])
+
+
+def test_marker_budget_fails_without_a_baseline(pytester):
+    result = _run(pytester, 3, 2)
+
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*attempts 3 exceeds budget 2*"])
@@ -0,0 +1,128 @@
+import json
+import time
+
+import pytest
+
+from cart.probes.__main__ import main
+from cart.probes.scheduler import ProbeScheduler, ProbeTarget, RotatingJsonlWriter, load_inventory
+
+# INTEGRATION TEST: Scheduled live merchant probes
+#
+# Purpose:
+# Validate that the probe scheduler checks every inventory target on its
+# interval with bounded concurrency, applies the response contracts and
+# streams one JSONL record per probe to rotating files.
+#
+# Context for Knot:
+# Live merchant checks run outside CI to watch real upstream behaviour;
+# they must cover thousands of merchant endpoints from one box without
+# hammering any single merchant.
+#
+# CI behavior:
+# - Local merchant simulator stands in for the merchants
+
+
+pytestmark = pytest.mark.integration
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_probes_stream_contract_verdicts(merchant_simulator, tmp_path):
+    merchant_simulator.route("/merchant/profile").update(body={"name": "no id"})
+    merchant_simulator.route("/merchant/status").update(status=503)
+    inventory = {
+        "defaults": {"interval": 0.2},
+        "merchants": [
+            {
+                "name": "acme",
+                "base_url": merchant_simulator.url,
+                "endpoints": [
+                    {"path": "/health", "contract": "health"},
+                    {"path": "/merchant/profile", "contract": "merchant"},
+                    {"path": "/merchant/status"},
+                ],
+            }
+        ],
+    }
+    writer = RotatingJsonlWriter(str(tmp_path / "probes.jsonl"))
+
+    summary = ProbeScheduler(load_inventory(inventory), writer).run(rounds=2)
+    writer.close()
+
+    assert summary["probes"] == 6
+    records = _records(tmp_path / "probes.jsonl")
+    by_path = {r["path"]: r for r in records}
+    assert by_path["/health"]["verdict"] == "pass"
+    assert by_path["/health"]["version"] == "v1"
+    assert by_path["/health"]["latency_ms"] >= 0
+    assert by_path["/merchant/profile"]["verdict"] == "fail"
+    assert by_path["/merchant/profile"]["violations"] == ["merchantId: required field is missing"]
+    assert by_path["/merchant/status"]["status"] == 503
+    assert by_path["/merchant/status"]["verdict"] == "error"
+
+
+def test_per_host_concurrency_is_bounded(merchant_simulator, tmp_path):
+    # Scenario:
+    # Eight targets on one host, 100ms each, at most two in flight.
+
+    merchant_simulator.route("/health").update(latency=0.1)
+    targets = [ProbeTarget(f"m{i}", merchant_simulator.url, "/health", interval=0.01) for i in range(8)]
+    writer = RotatingJsonlWriter(str(tmp_path / "probes.jsonl"))
+
+    started = time.monotonic()
+    summary = ProbeScheduler(targets, writer, concurrency=8, per_host=2).run(rounds=1)
+    writer.close()
+
+    assert summary["probes"] == 8
+    assert time.monotonic() - started >= 0.4
+
+
+def test_first_probes_are_spread_across_the_interval():
+    targets = [ProbeTarget(f"merchant-{i}", "https://cart.local", "/health", interval=60) for i in range(1000)]
+    scheduler = ProbeScheduler(targets, writer=None)
+
+    phases = sorted(scheduler._phase(t) for t in targets)
+
+    assert 0 <= phases[0] and phases[-1] < 60
+    # No second of the interval gets more than a few times its fair share.
+    per_second = [0] * 60
+    for phase in phases:
+        per_second[int(phase)] += 1
+    assert max(per_second) < 4 * len(targets) / 60
+
+
+def test_busy_host_backoff_is_jittered_and_starts_from_now():
+    scheduler = ProbeScheduler([], writer=None, host_backoff=0.05, seed=1)
+    now = time.monotonic()
+
+    # A probe an hour behind schedule is still pushed into the future.
+    retries = [scheduler._backoff(now - 3600) - now for _ in range(50)]
+
+    assert all(0.025 <= r <= 0.075 + 0.05 for r in retries)
+    assert len({round(r, 4) for r in retries}) > 40
+
+
+def test_writer_rotates_and_keeps_bounded_backups(tmp_path):
+    path = tmp_path / "probes.jsonl"
+    writer = RotatingJsonlWriter(str(path), max_bytes=200, backups=2)
+    for i in range(50):
+        writer.write({"merchant": f"m{i}", "verdict": "pass"})
+    writer.close()
+
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert files == ["probes.jsonl", "probes.jsonl.1", "probes.jsonl.2"]
+    assert all(p.stat().st_size <= 200 for p in tmp_path.iterdir())
+    assert writer.written == 50
+
+
+def test_cli_probes_simulated_merchants(tmp_path, capsys):
+    output = tmp_path / "probes.jsonl"
+
+    assert main(["--simulate", "--merchants", "20", "--interval", "0.2", "--rounds", "1", "--output", str(output)]) == 0
+
+    summary = json.loads(capsys.readouterr().out)
+    assert summary["probes"] == 40
+    assert summary["verdicts"] == {"pass": 40}
+    assert len(_records(output)) == 40
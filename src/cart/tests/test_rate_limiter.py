@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.rate_limiter import RateLimiter
+
+# CONTRACT / RESILIENCE TEST: Per-merchant client-side rate limiting
+#
+# Purpose:
+# Validate that calls stay within a merchant quota shared by all clients,
+# and that the limiter backs off when the merchant answers 429.
+#
+# Context for Knot:
+# Retrying rate-limited merchants at a fixed interval wastes quota on
+# rejections. Pacing calls client-side maximises successful throughput.
+#
+# CI behavior:
+# - Merchant API is mocked; AIMD behaviour runs on a fake clock
+
+pytestmark = pytest.mark.contract
+
+BASE_URL = "https://cart.local"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fail_fast_rejects_over_quota_without_network(requests_mock):
+    # Scenario:
+    # Two clients share a quota of one call; the second call is over quota.
+
+    requests_mock.get(f"{BASE_URL}/merchant/status", json={"status": "ok"})
+    limiter = RateLimiter(rate=1, burst=1, on_limit="fail", clock=FakeClock())
+    first_client = ApiClient(base_url=BASE_URL, rate_limiter=limiter)
+    second_client = ApiClient(base_url=BASE_URL, rate_limiter=limiter)
+
+    assert first_client.get("/merchant/status").status_code == 200
+    response = second_client.get("/merchant/status")
+
+    assert response.status_code == 429
+    assert response.json()["error"] == "rate_limited"
+    assert requests_mock.call_count == 1
+
+
+def test_wait_mode_paces_calls(requests_mock):
+    # Scenario:
+    # Quota is 20 calls/second with no burst; three calls are queued.
+
+    requests_mock.get(f"{BASE_URL}/merchant/status", json={"status": "ok"})
+    client = ApiClient(base_url=BASE_URL, rate_limiter=RateLimiter(rate=20, burst=1))
+
+    started = time.monotonic()
+    statuses = [client.get("/merchant/status").status_code for _ in range(3)]
+
+    assert statuses == [200, 200, 200]
+    assert time.monotonic() - started >= 0.09
+
+
+def test_adaptive_mode_backs_off_on_429_and_recovers():
+    # Scenario:
+    # Merchant rejects with 429 and Retry-After, then accepts again.
+
+    clock = FakeClock()
+    limiter = RateLimiter(rate=10, burst=10, adaptive=True, on_limit="fail", clock=clock)
+    key = limiter.key_for(BASE_URL)
+
+    limiter.on_response(key, 429, retry_after=2.0)
+
+    assert limiter.current_rate(key) == 5
+    assert limiter.reserve(key) is None
+
+    clock.now = 2.5
+    assert limiter.reserve(key) == 0.0
+
+    for _ in range(200):
+        limiter.on_response(key, 200)
+    assert limiter.current_rate(key) == 10
+
+
+def test_merchant_429_feeds_adaptive_limiter(requests_mock):
+    requests_mock.get(f"{BASE_URL}/merchant/status", status_code=429, headers={"Retry-After": "1"})
+    limiter = RateLimiter(rate=8, adaptive=True, on_limit="fail")
+    client = ApiClient(base_url=BASE_URL, rate_limiter=limiter)
+
+    assert client.get("/merchant/status").status_code == 429
+    assert client.get("/merchant/status").json()["error"] == "rate_limited"
+    assert requests_mock.call_count == 1
+    assert limiter.current_rate(limiter.key_for(BASE_URL)) == 4
@@ -0,0 +1,197 @@
+import time
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.cache import ResponseCache
+from cart.client.deadline import Deadline
+from cart.client.response import ApiResponse
+
+# INTEGRATION TEST: HTTP response cache for GETs
+#
+# Purpose:
+# Validate that read-mostly merchant endpoints are served from a local
+# cache while fresh, revalidated cheaply when stale, and used as a
+# fallback when the merchant fails.
+#
+# Context for Knot:
+# /health, /merchant/profile and /merchant/status are read far more often
+# than they change. Serving them locally cuts merchant load and latency.
+#
+# CI behavior:
+# - Merchant API is mocked and the cache runs on a fake clock
+
+pytestmark = pytest.mark.integration
+
+BASE_URL = "https://cart.local"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _wait_for(condition):
+    for _ in range(100):
+        if condition():
+            break
+        time.sleep(0.01)
+    time.sleep(0.01)
+
+
+def test_fresh_response_is_served_without_network(requests_mock):
+    # Scenario:
+    # Merchant profile may be cached for 60 seconds.
+
+    requests_mock.get(
+        f"{BASE_URL}/merchant/profile",
+        json={"merchantId": "123"},
+        headers={"Cache-Control": "max-age=60"},
+    )
+    cache = ResponseCache(clock=FakeClock())
+    client = ApiClient(base_url=BASE_URL, response_cache=cache)
+
+    first = client.get("/merchant/profile")
+    second = client.get("/merchant/profile")
+
+    assert first.json() == second.json() == {"merchantId": "123"}
+    assert requests_mock.call_count == 1
+    assert cache.snapshot()["hits"] == 1
+    assert cache.snapshot()["misses"] == 1
+
+
+def test_stale_response_is_revalidated_with_etag(requests_mock):
+    # Scenario:
+    # Cached status expires; merchant confirms it is unchanged with 304.
+
+    requests_mock.get(
+        f"{BASE_URL}/merchant/status",
+        [
+            {"status_code": 200, "json": {"status": "ok"}, "headers": {"ETag": '"v1"', "Cache-Control": "max-age=5"}},
+            {"status_code": 304, "headers": {"ETag": '"v1"', "Cache-Control": "max-age=5"}},
+        ],
+    )
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    client = ApiClient(base_url=BASE_URL, response_cache=cache)
+
+    client.get("/merchant/status")
+    clock.now = 10
+    response = client.get("/merchant/status")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
+    assert requests_mock.last_request.headers["If-None-Match"] == '"v1"'
+    assert cache.revalidations == 1
+
+    client.get("/merchant/status")
+    assert requests_mock.call_count == 2
+
+
+def test_stale_if_error_replaces_timeout_fallback(requests_mock):
+    # Scenario:
+    # Merchant times out after the cached value went stale.
+
+    requests_mock.get(
+        f"{BASE_URL}/health",
+        [
+            {"status_code": 200, "json": {"status": "ok"}, "headers": {"Cache-Control": "max-age=1, stale-if-error=300"}},
+            {"exc": Exception("Timeout")},
+        ],
+    )
+    clock = FakeClock()
+    client = ApiClient(base_url=BASE_URL, response_cache=ResponseCache(clock=clock))
+
+    client.get("/health")
+    clock.now = 30
+    response = client.get("/health")
+
+    # Expected behavior:
+    # - the stale cached value is served instead of the 504 fallback
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+
+def test_stale_while_revalidate_serves_stale_and_refreshes(requests_mock):
+    requests_mock.get(
+        f"{BASE_URL}/merchant/status",
+        [
+            {"status_code": 200, "json": {"v": 1}, "headers": {"Cache-Control": "max-age=1, stale-while-revalidate=60"}},
+            {"status_code": 200, "json": {"v": 2}, "headers": {"Cache-Control": "max-age=100"}},
+        ],
+    )
+    clock = FakeClock()
+    client = ApiClient(base_url=BASE_URL, response_cache=ResponseCache(clock=clock))
+
+    client.get("/merchant/status")
+    clock.now = 5
+    assert client.get("/merchant/status").json() == {"v": 1}
+
+    _wait_for(lambda: requests_mock.call_count == 2)
+
+    assert client.get("/merchant/status").json() == {"v": 2}
+
+
+def test_background_refresh_gets_its_own_deadline(requests_mock):
+    # Scenario:
+    # The caller's deadline is nearly spent when the stale entry is served.
+
+    requests_mock.get(
+        f"{BASE_URL}/merchant/status",
+        [
+            {"status_code": 200, "json": {"v": 1}, "headers": {"Cache-Control": "max-age=1, stale-while-revalidate=60"}},
+            {"status_code": 200, "json": {"v": 2}, "headers": {"Cache-Control": "max-age=100"}},
+        ],
+    )
+    clock = FakeClock()
+    client = ApiClient(base_url=BASE_URL, response_cache=ResponseCache(clock=clock))
+
+    client.get("/merchant/status")
+    clock.now = 5
+    assert client.get("/merchant/status", deadline=Deadline.after(0.01)).json() == {"v": 1}
+    _wait_for(lambda: requests_mock.call_count == 2)
+
+    # Expected behavior:
+    # - the refresh still reaches the merchant instead of ending in a 504
+    assert client.get("/merchant/status").json() == {"v": 2}
+
+
+def test_failed_background_refresh_keeps_stale_entry_and_retries_later():
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    calls = []
+    fresh = ApiResponse(
+        200, {"Cache-Control": "max-age=1, stale-while-revalidate=60"}, b'{"v": 1}', url=f"{BASE_URL}/x"
+    )
+
+    def send(headers):
+        calls.append(headers)
+        if len(calls) > 1:
+            raise RuntimeError("transport blew up")
+        return fresh
+
+    cache.execute(f"{BASE_URL}/x", None, send)
+    clock.now = 5
+    assert cache.execute(f"{BASE_URL}/x", None, send).json() == {"v": 1}
+    _wait_for(lambda: cache.refresh_errors == 1)
+    assert cache.execute(f"{BASE_URL}/x", None, send).json() == {"v": 1}
+    _wait_for(lambda: cache.refresh_errors == 2)
+
+    assert len(calls) == 3
+
+
+def test_cache_is_bounded_by_bytes(requests_mock):
+    for i in range(5):
+        requests_mock.get(f"{BASE_URL}/merchant/data/{i}", text="x" * 400, headers={"Cache-Control": "max-age=60"})
+    cache = ResponseCache(max_bytes=1000)
+    client = ApiClient(base_url=BASE_URL, response_cache=cache)
+
+    for i in range(5):
+        client.get(f"/merchant/data/{i}")
+
+    assert len(cache) == 2
+    assert cache.size_bytes <= 1000
@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from cart.client import api_client
+from cart.client.api_client import ApiClient
+from cart.client.retry_policy import ExponentialBackoff, RetryBudget, RetryPolicy, parse_retry_after
+
+# CONTRACT / RESILIENCE TEST: Retry policy
+#
+# Purpose:
+# Validate that retries back off with jitter, honour merchant
+# Retry-After hints, and stay within a global retry budget.
+#
+# Context for Knot:
+# When a merchant degrades, lockstep retries from every client make the
+# outage worse. Retries must spread out and be capped as a share of
+# total traffic.
+#
+# CI behavior:
+# - Merchant API is mocked and sleeps are recorded instead of waited out
+
+pytestmark = pytest.mark.contract
+
+BASE_URL = "https://cart.local"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(api_client.time, "sleep", recorded.append)
+    return recorded
+
+
+def test_retry_after_header_replaces_backoff(requests_mock, sleeps):
+    # Scenario:
+    # Merchant rate-limits the first call and asks to wait 2 seconds.
+
+    requests_mock.get(
+        f"{BASE_URL}/merchant/status",
+        [
+            {"status_code": 429, "headers": {"Retry-After": "2"}},
+            {"status_code": 200, "json": {"status": "ok"}},
+        ],
+    )
+    policy = RetryPolicy(retries=2, backoff=ExponentialBackoff(base=0.1))
+    client = ApiClient(base_url=BASE_URL, retry_policy=policy)
+
+    response = client.get("/merchant/status")
+
+    assert response.status_code == 200
+    assert sleeps == [2.0]
+    assert policy.retries_spent == 1
+
+
+def test_retry_after_beyond_limit_is_not_waited_out(requests_mock, sleeps):
+    # Scenario:
+    # Merchant asks for a wait longer than the policy allows.
+
+    requests_mock.get(f"{BASE_URL}/merchant/status", status_code=503, headers={"Retry-After": "120"})
+    client = ApiClient(base_url=BASE_URL, retry_policy=RetryPolicy(retries=3, max_retry_after=5))
+
+    response = client.get("/merchant/status")
+
+    assert response.status_code == 503
+    assert sleeps == []
+    assert requests_mock.call_count == 1
+
+
+def test_retry_budget_denies_retries_once_exhausted(requests_mock, sleeps):
+    # Scenario:
+    # Merchant is down; the budget allows only two retries in total.
+
+    requests_mock.get(f"{BASE_URL}/merchant/status", status_code=503)
+    policy = RetryPolicy(retries=1, budget=RetryBudget(ratio=0.0, min_tokens=2))
+    client = ApiClient(base_url=BASE_URL, retry_policy=policy)
+
+    for _ in range(4):
+        assert client.get("/merchant/status").status_code == 503
+
+    # Expected behavior:
+    # - 4 calls + 2 budgeted retries reach the merchant, not 8 attempts
+
+    assert requests_mock.call_count == 6
+    assert policy.snapshot() == {"retries_spent": 2, "retries_denied": 2}
+
+
+@pytest.mark.parametrize("jitter", ["full", "decorrelated"])
+def test_jittered_backoff_stays_within_bounds(jitter):
+    backoff = ExponentialBackoff(base=0.1, cap=1.0, jitter=jitter, rng=random.Random(7))
+
+    previous = 0.0
+    delays = []
+    for attempt in range(10):
+        previous = backoff.delay(attempt, previous)
+        delays.append(previous)
+
+    assert all(0.0 <= d <= 1.0 for d in delays)
+    assert len(set(delays)) == len(delays)
+
+
+def test_parse_retry_after_formats():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
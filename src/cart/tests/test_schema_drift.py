@@ -0,0 +1,133 @@
+import gzip
+import json
+
+import pytest
+
+from cart.contracts.__main__ import main
+from cart.contracts.drift import DriftDetector, HyperLogLog, endpoint_of
+
+# CONTRACT TEST: Streaming schema drift detection
+#
+# Purpose:
+# Validate that the drift detector infers endpoint schemas from captured
+# responses and flags new, missing and retyped fields per X-API-Version.
+#
+# Context for Knot:
+# Hand-written contract tests only catch drift someone predicted. The
+# detector runs over large merchant captures in one pass, so its memory
+# must stay bounded regardless of input size.
+#
+# CI behavior:
+# - Pure in-process checks and temp files, no network or mocks required
+
+pytestmark = pytest.mark.contract
+
+
+def _record(version, body, path="/merchant/profile"):
+    return {"method": "GET", "path": path, "status": 200, "headers": {"X-API-Version": version}, "body": body}
+
+
+def _capture(n=50):
+    records = []
+    for i in range(n):
+        records.append(_record("v1", {"merchantId": f"m{i}", "status": "active", "limits": {"daily": 100}}))
+    for i in range(n):
+        # v2: merchantId dropped, limits.daily became a string, new field.
+        records.append(_record("v2", {"id": f"m{i}", "status": "active", "limits": {"daily": "100"}}))
+    return records
+
+
+def test_flags_new_missing_and_retyped_fields_between_versions():
+    detector = DriftDetector()
+    for record in _capture():
+        detector.observe(record)
+
+    drifts = {(d.field, d.kind) for d in detector.drifts()}
+
+    # Expected behavior:
+    # - v2 is compared with v1 (first version seen for the endpoint)
+    assert drifts == {("merchantId", "missing"), ("id", "new"), ("limits.daily", "retyped")}
+    assert all(d.version == "v2" and d.reference == "v1" for d in detector.drifts())
+
+
+def test_new_enum_values_are_reported():
+    detector = DriftDetector()
+    for i in range(20):
+        detector.observe(_record("v1", {"merchantId": "m", "status": ["active", "paused"][i % 2]}))
+        detector.observe(_record("v2", {"merchantId": "m", "status": ["active", "suspended"][i % 2]}))
+
+    drifts = detector.drifts()
+
+    assert [(d.field, d.kind) for d in drifts] == [("status", "enum")]
+    assert "suspended" in drifts[0].detail
+
+
+def test_memory_stays_bounded_on_unbounded_field_names():
+    # Scenario:
+    # A merchant returns a map keyed by ids, so every response brings new
+    # field paths.
+    detector = DriftDetector(max_fields=32)
+    for i in range(5000):
+        detector.observe(_record("v1", {"merchantId": f"m{i}", "balances": {f"acct{i}": i}}))
+
+    profile = detector.profiles[("GET /merchant/profile", "v1")]
+    assert len(profile.fields) == 32
+    assert profile.overflow > 0
+    # Exact values are dropped once a field turns out to be high-cardinality.
+    assert profile.fields["merchantId"].values is None
+    assert 4500 < profile.fields["merchantId"].sketch.estimate() < 5500
+
+
+def test_only_high_cardinality_fields_get_capped_sketches():
+    detector = DriftDetector(max_values=4, max_sketches=2)
+    for i in range(100):
+        detector.observe(_record("v1", {"status": "active", "a": i, "b": i, "c": i}))
+
+    profile = detector.profiles[("GET /merchant/profile", "v1")]
+    assert profile.fields["status"].sketch is None
+    assert profile.fields["status"].values == {"active"}
+    assert profile.fields["a"].sketch is not None and profile.fields["b"].sketch is not None
+    assert profile.fields["c"].sketch is None and profile.fields["c"].values is None
+    assert 90 < profile.fields["a"].sketch.estimate() < 110
+
+    restored = DriftDetector.from_snapshot(detector.snapshot())
+    assert restored.profiles[("GET /merchant/profile", "v1")].sketches == 2
+
+
+def test_hyperloglog_estimate_is_close():
+    sketch = HyperLogLog()
+    for i in range(20000):
+        sketch.add(i)
+        sketch.add(i)
+    assert abs(sketch.estimate() - 20000) / 20000 < 0.1
+
+
+def test_endpoint_normalizes_hosts_queries_and_ids():
+    record = {"method": "get", "url": "https://m.example/merchant/12345/status?verbose=1"}
+    assert endpoint_of(record) == "GET /merchant/{id}/status"
+
+
+def test_cli_compares_gzip_capture_with_saved_baseline(tmp_path, capsys):
+    baseline_file = tmp_path / "base.jsonl"
+    baseline_file.write_text("\n".join(json.dumps(r) for r in _capture()[:50]) + "\n")
+    profile = tmp_path / "profile.json"
+    assert main([str(baseline_file), "--save-profile", str(profile)]) == 0
+    capsys.readouterr()
+
+    # Scenario:
+    # Today's capture has the same version header but the payload changed.
+    today = tmp_path / "today.jsonl.gz"
+    with gzip.open(today, "wt") as fh:
+        for i in range(50):
+            fh.write(json.dumps(_record("v1", {"merchantId": f"m{i}", "status": "active"})) + "\n")
+        fh.write("not json\n")
+
+    code = main([str(today), "--baseline", str(profile), "--json", "--fail-on-drift"])
+    report = json.loads(capsys.readouterr().out)
+
+    assert code == 1
+    assert report["records"] == 50
+    assert [(d["field"], d["kind"]) for d in report["drifts"]] == [
+        ("limits", "missing"),
+        ("limits.daily", "missing"),
+    ]
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.single_flight import SingleFlight
+
+# INTEGRATION TEST: Request coalescing for concurrent GETs
+#
+# Purpose:
+# Validate that a burst of identical GETs reaches the merchant once and
+# that every caller receives the same result, including failures.
+#
+# Context for Knot:
+# After a deploy, many workers check /merchant/status at the same moment.
+# Fragile merchant APIs must not see that thundering herd.
+#
+# CI behavior:
+# - The local merchant simulator is used because requests_mock
+#   serialises calls and would hide the concurrency being tested
+
+pytestmark = pytest.mark.integration
+
+
+def _burst(client, path, n=10):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.get(path))) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_identical_concurrent_gets_share_one_request(merchant_simulator):
+    # Scenario:
+    # Ten workers check the same merchant status at once.
+
+    merchant_simulator.route("/merchant/status").update(latency=0.3)
+    flight = SingleFlight()
+    client = ApiClient(base_url=merchant_simulator.url, single_flight=flight)
+
+    results = _burst(client, "/merchant/status")
+
+    assert [r.json()["status"] for r in results] == ["ok"] * 10
+    assert merchant_simulator.requests("/merchant/status") == 1
+    assert flight.shared == 9
+    assert flight.in_flight() == 0
+
+
+def test_failures_are_shared_too(merchant_simulator):
+    # Scenario:
+    # The merchant is down; the burst must not multiply the failing calls.
+
+    merchant_simulator.route("/merchant/status").update(latency=0.3, errors={503: 1.0})
+    client = ApiClient(base_url=merchant_simulator.url, single_flight=SingleFlight())
+
+    results = _burst(client, "/merchant/status")
+
+    assert [r.status_code for r in results] == [503] * 10
+    assert merchant_simulator.requests("/merchant/status") == 1
+
+
+def test_relevant_headers_distinguish_requests():
+    flight = SingleFlight(key_headers=["Authorization"])
+
+    a = flight.key_for("GET", "https://cart.local/x", {"Authorization": "a", "X-Trace": "1"})
+    b = flight.key_for("GET", "https://cart.local/x", {"authorization": "a", "X-Trace": "2"})
+    c = flight.key_for("GET", "https://cart.local/x", {"Authorization": "c"})
+
+    assert a == b
+    assert a != c
@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.deadline import Deadline
+from cart.client.response import StreamedResponse, StreamInterrupted
+from cart.client.streaming import iter_json_array, iter_ndjson
+
+# INTEGRATION TEST: Streaming merchant responses
+#
+# Purpose:
+# Validate that stream=True hands out the body as it arrives, that JSON
+# array and NDJSON records are parsed incrementally across any chunk
+# boundaries, and that a stall mid-stream still ends in the controlled
+# 504 rather than a raw network error.
+#
+# Context for Knot:
+# Merchant catalogue and transaction exports run to many megabytes;
+# buffering and parsing them whole multiplies peak memory.
+#
+# CI behavior:
+# - Local merchant simulator only
+
+pytestmark = pytest.mark.integration
+
+
+def _catalogue(records):
+    return {
+        "merchantId": "123",
+        "meta": {"pages": [1, 2], "note": "a ] , { tricky \" string"},
+        "transactions": [{"id": f"tx-{i:06d}", "amount": i * 1.5, "tags": ["ü", None]} for i in range(records)],
+        "status": "active",
+    }
+
+
+def _chunks(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_json_array_items_survive_any_chunk_boundary(size):
+    catalogue = _catalogue(50)
+    raw = json.dumps(catalogue, ensure_ascii=False).encode("utf-8")
+
+    assert list(iter_json_array(_chunks(raw, size), key="transactions")) == catalogue["transactions"]
+    assert list(iter_json_array(_chunks(b" [12, 3.5e2 ,true,null] ", size))) == [12, 350.0, True, None]
+    assert list(iter_json_array(_chunks(b"[]", size))) == []
+
+
+def test_ndjson_records_and_malformed_input():
+    records = [{"id": i, "name": "café"} for i in range(20)]
+    raw = "\n".join(json.dumps(r, ensure_ascii=False) for r in records).encode("utf-8") + b"\n\n"
+
+    assert list(iter_ndjson(_chunks(raw, 5))) == records
+
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"merchantId": "123"}'], key="transactions"))
+    items = iter_json_array([b'[{"id": 1}, {"id": 2} {"id": 3}]'])
+    assert next(items) == {"id": 1}
+    assert next(items) == {"id": 2}
+    with pytest.raises(ValueError):
+        next(items)
+
+
+@pytest.mark.parametrize("backend", ["requests", "urllib3"])
+def test_streamed_items_match_buffered_body(merchant_simulator, backend):
+    catalogue = _catalogue(2000)
+    merchant_simulator.route("/merchant/data").update(body=catalogue)
+
+    with ApiClient(merchant_simulator.url, transport=backend) as client:
+        with client.get("/merchant/data", stream=True) as resp:
+            assert isinstance(resp, StreamedResponse)
+            assert resp.status_code == 200
+            items = list(resp.iter_items(key="transactions", chunk_size=1024))
+        buffered = client.get("/merchant/data")
+
+    assert items == buffered.json()["transactions"]
+    with pytest.raises(RuntimeError):
+        resp.content
+
+
+@pytest.mark.parametrize("backend", ["requests", "urllib3"])
+def test_stall_mid_stream_raises_controlled_504(merchant_simulator, backend):
+    # Scenario:
+    # Headers and the first part of the body arrive, then the merchant
+    # stalls for longer than the attempt timeout.
+
+    merchant_simulator.route("/merchant/data").update(body=_catalogue(2000), slow_body=4.0)
+    received = 0
+
+    with ApiClient(merchant_simulator.url, transport=backend, timeout=0.2) as client:
+        resp = client.get("/merchant/data", stream=True)
+        assert resp.status_code == 200
+        with pytest.raises(StreamInterrupted) as excinfo:
+            for chunk in resp.iter_bytes(1024):
+                received += len(chunk)
+
+    assert 0 < received < int(resp.headers["Content-Length"])
+    assert excinfo.value.response.status_code == 504
+    assert excinfo.value.response.json() == {"error": "timeout"}
+
+
+def test_deadline_is_checked_between_chunks(merchant_simulator):
+    merchant_simulator.route("/merchant/data").update(body=_catalogue(2000), slow_body=1.6)
+    client = ApiClient(merchant_simulator.url, timeout=1.0)
+
+    resp = client.get("/merchant/data", stream=True, deadline=Deadline.after(0.3))
+    with pytest.raises(StreamInterrupted) as excinfo:
+        for _ in resp.iter_items(key="transactions", chunk_size=1024):
+            pass
+
+    assert excinfo.value.response.json() == {"error": "deadline_exceeded"}
+
+
+def test_failures_before_headers_keep_retry_and_504_handling(merchant_simulator):
+    merchant_simulator.route("/merchant/status").update(script=[503])
+    merchant_simulator.route("/merchant/data").update(timeout_rate=1.0, hang=1.0)
+    client = ApiClient(merchant_simulator.url, retries=1, timeout=0.2)
+
+    retried = client.get("/merchant/status", stream=True)
+    with client.get("/merchant/data", stream=True) as hung:
+        chunks = list(hung.iter_bytes())
+
+    assert retried.status_code == 200
+    assert retried.json()["status"] == "ok"
+    assert merchant_simulator.requests("/merchant/status") == 2
+    assert hung.status_code == 504
+    assert json.loads(b"".join(chunks)) == {"error": "timeout"}
+
+
+def test_streamed_post(merchant_simulator):
+    client = ApiClient(merchant_simulator.url)
+
+    with client.post("/card-switch", json={"cardId": "4111000000000001"}, stream=True) as resp:
+        body = b"".join(resp.iter_bytes())
+
+    assert resp.status_code == 200
+    assert json.loads(body)["status"] == "completed"
@@ -0,0 +1,85 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from cart.client.api_client import ApiClient
+from cart.client.pool import ConnectionPool
+from cart.client.transport import create_transport
+from cart.simulator.server import RouteProfile
+
+# INTEGRATION TEST: Pluggable HTTP transports
+#
+# Purpose:
+# Validate that the lean urllib3 transport keeps the same client
+# behaviour as the default requests transport, and that HTTP libraries
+# are only imported when a transport is created.
+#
+# Context for Knot:
+# Short-lived probe workers and high-QPS callers pay for import time and
+# per-call overhead; the resilience contract must not depend on backend.
+#
+# CI behavior:
+# - The local merchant simulator is used; requests_mock does not cover urllib3
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.mark.parametrize("backend", ["requests", "urllib3"])
+def test_backends_behave_the_same(merchant_simulator, backend):
+    merchant_simulator.route("/merchant/status").update(script=[503])
+    merchant_simulator.route("/merchant/data").update(latency=0.5)
+    merchant_simulator.add_route("/echo", RouteProfile(methods=("POST",), body=lambda request: {"echo": request}))
+
+    with ApiClient(base_url=merchant_simulator.url, transport=backend, retries=1, timeout=0.2) as client:
+        status = client.get("/merchant/status")
+        echo = client.post("/echo", json={"cardId": "abc"})
+        slow = client.get("/merchant/data")
+
+    assert status.status_code == 200
+    assert status.headers.get("x-api-version") == "v1"
+    assert status.elapsed is not None and 0 <= status.elapsed < 0.2
+    assert echo.json() == {"echo": {"cardId": "abc"}}
+    assert merchant_simulator.last_headers("/echo")["Content-Type"] == "application/json"
+    assert slow.status_code == 504
+    assert slow.json()["error"] == "timeout"
+
+
+def test_urllib3_honors_pool_options(merchant_simulator):
+    # Scenario:
+    # A client switches to the urllib3 backend but keeps its pool settings.
+
+    merchant_simulator.route("/merchant/status").update(latency=0.2)
+
+    with ApiClient(merchant_simulator.url, transport="urllib3", max_connections=1, idle_timeout=10.0) as client:
+        responses = client.map(["/merchant/status"] * 3, max_workers=3)
+        evicted = client.transport.evict_idle(now=float("inf"))
+        client.get("/health")
+
+    # Expected behavior:
+    # - max_connections=1 serialises the calls over one connection
+    # - the idle host pool is closed and a fresh connection is opened
+    # - a requests ConnectionPool is rejected, not silently ignored
+
+    assert [r.status_code for r in responses] == [200] * 3
+    assert evicted == 1
+    assert merchant_simulator.connections == 2
+    with ConnectionPool() as pool, pytest.raises(TypeError):
+        ApiClient(merchant_simulator.url, transport="urllib3", pool=pool)
+
+
+def test_http_libraries_are_imported_lazily():
+    # Scenario:
+    # A probe worker imports the client module but has not built a client yet.
+
+    code = "import sys, cart.client.api_client; print('requests' in sys.modules, 'urllib3' in sys.modules)"
+    src = Path(__file__).resolve().parents[2]
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env={"PYTHONPATH": str(src)})
+
+    assert out.stdout.strip() == "False False"
+
+
+def test_unknown_transport_is_rejected():
+    with pytest.raises(ValueError):
+        create_transport("curl")
@@ -10,3 +10,7 @@ SRC_PATH = PROJECT_ROOT / "src"
 
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
+
+# Shared fixtures (local merchant simulator) used across test modules,
+# and the performance regression gate (see cart/metrics/perf_gate.py).
+pytest_plugins = ["cart.simulator.fixtures", "cart.metrics.perf_gate"]